@@ -0,0 +1,113 @@
+# ============================
+# 🧮 Agregações do Painel — tabelas de contingência pré-computadas
+# ============================
+
+import numpy as np
+import pandas as pd
+
+# 📋 Colunas desenhadas como countplot (feature × nível de obesidade)
+COLUNAS_CONTAGEM = [
+    'genero', 'historico_familiar',
+    'alimentacao_entre_refeicoes', 'monitora_calorias', 'consome_alta_calorias_frequente',
+    'fuma', 'freq_consumo_alcool', 'meio_transporte_contumaz'
+]
+
+COLUNA_NIVEL = 'Obesity_Label'
+
+
+def _categorias_em_ordem(serie):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return list(serie.cat.categories)
+    return list(pd.unique(serie.dropna()))
+
+
+class TabelasContingencia:
+    """Contagens (feature, nível) de todas as colunas do painel, mantidas incrementalmente.
+
+    Os gráficos leem tabelas com no máximo (nº de categorias × 7) linhas, de modo que o
+    custo de desenho não depende mais do tamanho da base.
+    """
+
+    def __init__(self, df, colunas=COLUNAS_CONTAGEM, coluna_nivel=COLUNA_NIVEL):
+        self.colunas = list(colunas)
+        self.coluna_nivel = coluna_nivel
+        self.niveis = _categorias_em_ordem(df[coluna_nivel])
+        self.categorias = {col: _categorias_em_ordem(df[col]) for col in self.colunas}
+        self._contagens = {
+            col: np.zeros((len(self.categorias[col]), len(self.niveis)), dtype='int64')
+            for col in self.colunas
+        }
+        self._por_nivel = np.zeros(len(self.niveis), dtype='int64')
+        self.total_linhas = 0
+        self.adicionar(df)
+
+    # ============================
+    # ➕ Ingestão
+    # ============================
+    def _codigos(self, serie, conhecidas):
+        # Categorias novas são anexadas ao final, preservando a ordem já exibida.
+        novas = [c for c in _categorias_em_ordem(serie) if c not in conhecidas]
+        conhecidas.extend(novas)
+        return pd.Categorical(serie, categories=conhecidas).codes.astype('int64'), len(novas)
+
+    def adicionar(self, df_novo):
+        """Soma as contagens de novas linhas em uma única passada de bincount.
+
+        Monta listas e arrays novos e só os troca no fim: quem desenha durante a ingestão
+        vê as contagens anteriores ou as novas, nunca parte de cada.
+        """
+        if len(df_novo) == 0:
+            return
+
+        niveis = list(self.niveis)
+        codigos_nivel, novos_niveis = self._codigos(df_novo[self.coluna_nivel], niveis)
+        n_niveis = len(niveis)
+        por_nivel = np.pad(self._por_nivel, (0, novos_niveis))
+        por_nivel += np.bincount(codigos_nivel[codigos_nivel >= 0], minlength=n_niveis)
+
+        categorias, contagens = {}, {}
+        indices, tamanhos = [], []
+        deslocamento = 0
+        for col in self.colunas:
+            categorias[col] = list(self.categorias[col])
+            codigos, novas = self._codigos(df_novo[col], categorias[col])
+            contagens[col] = np.pad(self._contagens[col], ((0, novas), (0, novos_niveis)))
+            validos = (codigos >= 0) & (codigos_nivel >= 0)
+            indices.append(deslocamento + codigos[validos] * n_niveis + codigos_nivel[validos])
+            tamanho = len(categorias[col]) * n_niveis
+            tamanhos.append(tamanho)
+            deslocamento += tamanho
+
+        somadas = np.bincount(np.concatenate(indices), minlength=deslocamento)
+        inicio = 0
+        for col, tamanho in zip(self.colunas, tamanhos):
+            contagens[col] += somadas[inicio:inicio + tamanho].reshape(-1, n_niveis)
+            inicio += tamanho
+
+        # 🔄 Rótulos antes das contagens: eles só crescem no fim, e as consultas recortam
+        # os rótulos pelo formato das contagens que leram
+        self.niveis, self.categorias = niveis, categorias
+        self._contagens, self._por_nivel = contagens, por_nivel
+        self.total_linhas += len(df_novo)
+
+    # ============================
+    # 📤 Consultas
+    # ============================
+    def tabela(self, col):
+        """Tabela longa (col, nível, quantidade) pronta para `sns.barplot`."""
+        contagens = self._contagens[col]
+        n_categorias, n_niveis = contagens.shape
+        return pd.DataFrame({
+            col: pd.Categorical.from_codes(
+                np.repeat(np.arange(n_categorias), n_niveis), self.categorias[col][:n_categorias]
+            ),
+            self.coluna_nivel: pd.Categorical.from_codes(
+                np.tile(np.arange(n_niveis), n_categorias), self.niveis[:n_niveis]
+            ),
+            'quantidade': contagens.ravel()
+        })
+
+    def contagem_niveis(self):
+        """Quantidade de registros por nível de obesidade."""
+        por_nivel = self._por_nivel
+        return pd.Series(por_nivel, index=self.niveis[:len(por_nivel)], name='count')
@@ -0,0 +1,133 @@
+# ============================
+# 🧺 Agrupador de Predições — junta requisições concorrentes em uma só inferência em lote
+# ============================
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# ⏱️ Janela de coleta (ms) e tamanho máximo do lote; com janela 0 só junta o que já está na fila
+JANELA_MS_PADRAO = float(os.environ.get('OBESIDADE_JANELA_MS', '3'))
+MAX_LOTE_PADRAO = int(os.environ.get('OBESIDADE_MAX_LOTE', '64'))
+
+_FIM = object()
+
+
+class AgrupadorPredicoes:
+    """Coleta registros por até `janela_ms` (ou até `max_lote`) e os pontua de uma vez.
+
+    `funcao_lote(registros)` recebe a lista de registros e devolve uma sequência com um
+    resultado por registro, na mesma ordem. Cada chamador recebe o seu via `Future`.
+    Se o lote falhar, os registros são reprocessados um a um, para que só o registro
+    inválido receba a exceção. Uma thread própria executa os lotes.
+    """
+
+    def __init__(self, funcao_lote, janela_ms=JANELA_MS_PADRAO, max_lote=MAX_LOTE_PADRAO):
+        self.funcao_lote = funcao_lote
+        self.janela = janela_ms / 1000
+        self.max_lote = max_lote
+        self._fila = queue.SimpleQueue()
+        self._trava = threading.Lock()
+        self.lotes = 0
+        self.registros = 0
+        self._thread = threading.Thread(target=self._laco, name='agrupador-predicoes', daemon=True)
+        self._thread.start()
+
+    # ============================
+    # 📨 Submissão
+    # ============================
+    def submeter(self, registro):
+        """Enfileira um registro e devolve um `concurrent.futures.Future` com o resultado."""
+        futuro = Future()
+        self._fila.put((registro, futuro))
+        return futuro
+
+    def prever(self, registro, timeout=None):
+        """Versão bloqueante de `submeter`."""
+        return self.submeter(registro).result(timeout)
+
+    async def prever_async(self, registro):
+        """Versão para asyncio: aguarda o resultado sem bloquear o event loop."""
+        return await asyncio.wrap_future(self.submeter(registro))
+
+    def fechar(self):
+        """Processa o que já foi enfileirado e encerra a thread."""
+        self._fila.put(_FIM)
+        self._thread.join()
+
+    def estatisticas(self):
+        with self._trava:
+            return {
+                'lotes': self.lotes,
+                'registros': self.registros,
+                'tamanho_medio_lote': self.registros / self.lotes if self.lotes else 0.0
+            }
+
+    # ============================
+    # 🔁 Laço de Lotes
+    # ============================
+    def _coletar(self, primeiro):
+        pendentes = [primeiro]
+        limite = time.monotonic() + self.janela
+        while len(pendentes) < self.max_lote:
+            restante = limite - time.monotonic()
+            try:
+                item = self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait()
+            except queue.Empty:
+                break
+            if item is _FIM:
+                return pendentes, True
+            pendentes.append(item)
+        return pendentes, False
+
+    def _executar(self, pendentes):
+        pendentes = [(r, f) for r, f in pendentes if f.set_running_or_notify_cancel()]
+        if not pendentes:
+            return
+        try:
+            resultados = list(self.funcao_lote([registro for registro, _ in pendentes]))
+            if len(resultados) != len(pendentes):
+                raise ValueError(f'funcao_lote devolveu {len(resultados)} resultados para {len(pendentes)} registros')
+        except Exception:
+            # 🛟 Um registro inválido não derruba os demais do lote
+            for registro, futuro in pendentes:
+                try:
+                    futuro.set_result(self.funcao_lote([registro])[0])
+                except Exception as erro:
+                    futuro.set_exception(erro)
+        else:
+            for (_, futuro), resultado in zip(pendentes, resultados):
+                futuro.set_result(resultado)
+        with self._trava:
+            self.lotes += 1
+            self.registros += len(pendentes)
+
+    def _laco(self):
+        while True:
+            primeiro = self._fila.get()
+            if primeiro is _FIM:
+                return
+            pendentes, encerrar = self._coletar(primeiro)
+            self._executar(pendentes)
+            if encerrar:
+                return
+
+
+def explicar_por_registro(preditor, registros):
+    """`prever_explicado` em lote, separado em (rótulo, probabilidades, contribuições) por registro.
+
+    Modelos sem árvores de explicação caem em `prever_com_proba`, com contribuições None.
+    """
+    from preditor import ORDEM_CLASSES, ErroExplicacao
+    try:
+        rotulos, probabilidades, contribuicoes = preditor.prever_explicado(registros)
+    except ErroExplicacao:
+        rotulos, probabilidades = preditor.prever_com_proba(registros)
+        return [(rotulos[i], probabilidades.iloc[[i]][ORDEM_CLASSES], None) for i in range(len(rotulos))]
+    return [
+        (rotulos[i], probabilidades.iloc[[i]], contribuicoes.iloc[[i]])
+        for i in range(len(rotulos))
+    ]
@@ -3,12 +3,11 @@
 # ============================
 
 import streamlit as st
-import pandas as pd
-import joblib
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.patches import Patch
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metricas import metricas
 
 # ============================
 # 🎨 Configuração da Página
@@ -16,63 +15,114 @@ import os
 st.set_page_config(page_title='Preditor de Obesidade', layout='wide')
 
 # ============================
-# 📂 Carregar Artefatos
+# 📂 Carregar Artefatos em Segundo Plano (uma vez por processo)
 # ============================
-modelo = joblib.load('modelo_obesidade.joblib')
-scaler = joblib.load('scaler.joblib')
-label_encoders = joblib.load('labelencoders.joblib')
-label_encoder_target = joblib.load('labelencoder_target.joblib')
-features = joblib.load('features.joblib')
+def _carregar_registro():
+    # sklearn e joblib só são importados aqui, fora do caminho do primeiro render
+    from registro_modelos import registro
+    registro.ativa  # 🔄 força a carga inicial
+    return registro
 
-# ============================
-# 📊 Carregar Dados para o Painel Analítico
-# ============================
-df_graficos = pd.read_csv('Obesity.csv')
-
-df_graficos.rename(columns={
-    'Gender':'genero',
-    'Age':'idade',
-    'Height':'altura',
-    'Weight':'peso',
-    'family_history':'historico_familiar',
-    'FAVC':'consome_alta_calorias_frequente',
-    'FCVC':'consumo_vegetais',
-    'NCP':'qtde_refeicoes_principais',
-    'CAEC':'alimentacao_entre_refeicoes',
-    'SMOKE':'fuma',
-    'CH2O':'qtde_agua_diaria',
-    'SCC':'monitora_calorias',
-    'FAF':'freq_atividade_fisica',
-    'TUE':'tempo_uso_dispositivos',
-    'CALC':'freq_consumo_alcool',
-    'MTRANS':'meio_transporte_contumaz',
-    'Obesity':'nivel_obesidade'
-}, inplace=True)
+
+@st.cache_resource
+def iniciar_carga_artefatos():
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='carga-artefatos')
+    carga = executor.submit(_carregar_registro)
+    executor.shutdown(wait=False)
+    return carga
+
+
+carga_artefatos = iniciar_carga_artefatos()
+
+
+@st.cache_resource
+def carregar_agrupador():
+    # 🧺 Submissões simultâneas de várias sessões viram uma só inferência em lote
+    from agrupador_predicoes import AgrupadorPredicoes, explicar_por_registro
+    agrupador = AgrupadorPredicoes(lambda registros: explicar_por_registro(carga_artefatos.result().preditor, registros))
+    metricas.registrar_estatisticas('agrupador', agrupador.estatisticas, 'Micro-lotes de predição do app')
+    return agrupador
 
 # ============================
-# 🔠 Mapeamento de Labels
+# 📊 Estatísticas e Cache de Figuras (só quando o painel é aberto)
 # ============================
-ordem_obesidade = [
-    'Insufficient_Weight', 'Normal_Weight', 'Overweight_Level_I',
-    'Overweight_Level_II', 'Obesity_Type_I', 'Obesity_Type_II', 'Obesity_Type_III'
+SUBABAS = [
+    '🎯 Distribuição Geral', '🔍 Perfil Demográfico', '🥦 Estilo de Vida',
+    '🔧 Comportamento e Hábitos', '🚬 Consumo e Transporte'
 ]
 
-mapeamento_obesidade = {
-    'Insufficient_Weight': 'Abaixo do Peso',
-    'Normal_Weight': 'Peso Normal',
-    'Overweight_Level_I': 'Sobrepeso I',
-    'Overweight_Level_II': 'Sobrepeso II',
-    'Obesity_Type_I': 'Obesidade I',
-    'Obesity_Type_II': 'Obesidade II',
-    'Obesity_Type_III': 'Obesidade III'
-}
 
-df_graficos['Obesity_Label'] = df_graficos['nivel_obesidade'].map(mapeamento_obesidade)
+@st.cache_resource
+def carregar_estatisticas():
+    # 📐 Contagens, histogramas e quantis montados uma vez; depois só as linhas novas do CSV
+    from cache_compartilhado import espaco_padrao
+    from estatisticas_painel import EstatisticasPainel
+    return EstatisticasPainel.de_csv(compartilhado=espaco_padrao('estatisticas'))
+
+
+def estatisticas_atualizadas():
+    from cache_compartilhado import espaco_padrao
+    estatisticas = carregar_estatisticas()
+    novas = estatisticas.atualizar()
+    if novas is None:
+        # 🔁 CSV reescrito (e não só acrescido): reconstrói do zero
+        carregar_estatisticas.clear()
+        estatisticas = carregar_estatisticas()
+    elif novas:
+        # 🤝 As outras réplicas partem deste retrato em vez de reler o que já foi ingerido
+        estatisticas.publicar(espaco_padrao('estatisticas'))
+    return estatisticas
+
+
+@st.cache_resource
+def carregar_cache_figuras():
+    from cache_compartilhado import espaco_padrao
+    from cache_figuras import CacheFiguras
+    cache = CacheFiguras(compartilhado=espaco_padrao('figuras'))
+    metricas.registrar_estatisticas('cache_figuras', cache.estatisticas, 'Cache de figuras do painel')
+    return cache
+
+
+def tema_atual():
+    return getattr(getattr(st.context, 'theme', None), 'type', None) or 'light'
+
+
+def exibir_grafico(retrato, id_grafico, desenhar, *args, **kwargs):
+    # A versão da chave vem do mesmo retrato que o gráfico lê; o cache, do loader (cache_resource)
+    chave = (id_grafico, retrato.versao, tema_atual())
+    imagem = carregar_cache_figuras().obter(chave, lambda: desenhar(*args, **kwargs))
+    st.image(imagem, width='stretch')
+
+# ============================
+# 🛠️ Sub-aba de Desempenho (oculta: ?admin=1, e só com as métricas ligadas)
+# ============================
+SUBABA_DESEMPENHO = '🛠️ Desempenho'
+
+
+def exibir_desempenho():
+    st.subheader('Tempos por Etapa, Caches e Memória')
+    resumo = [
+        {
+            'métrica': nome,
+            'rótulos': ', '.join(f'{chave}={valor}' for chave, valor in rotulos),
+            'chamadas': chamadas,
+            'média (ms)': media,
+            'total (s)': total
+        }
+        for (nome, rotulos), (chamadas, total, media) in sorted(metricas.resumo().items())
+    ]
+    st.dataframe(resumo, width='stretch', hide_index=True)
+    with st.expander('Exportação Prometheus'):
+        st.code(metricas.exportar_prometheus(), language='text')
+    if st.button('Zerar temporizadores e contadores'):
+        metricas.limpar()
+        st.rerun()
 
 # ============================
 # 🔀 Abas do App
 # ============================
-aba1, aba2 = st.tabs(['🔍 Sistema Preditivo', '📊 Painel Analítico'])
+# on_change='rerun' torna as abas preguiçosas: só o conteúdo da aba aberta é executado
+aba1, aba2 = st.tabs(['🔍 Sistema Preditivo', '📊 Painel Analítico'], key='aba', on_change='rerun')
 
 # ============================
 # 🔍 Aba 1 — Sistema Preditivo
@@ -106,512 +156,289 @@ with aba1:
         submit = st.form_submit_button('🔍 Fazer Predição')
 
     if submit:
-        # 🔧 Mapeamento das variáveis ordinais
-        mapeamento_atividade = {'Nunca': 0, 'Pouquíssima': 1, 'Moderada': 2, 'Frequente': 3}
-        mapeamento_alimentacao = {'Não': 0, 'Às vezes': 1, 'Frequente': 2, 'Sempre': 3}
-        mapeamento_vegetais = {'Nunca ou Raramente': 0, 'Às vezes': 1, 'Sempre': 2}
-        mapeamento_alcool = {'Não Aplicável': 0, 'Às vezes': 1, 'Frequente': 2, 'Sempre': 3}
-
-        # 🔧 Construir DataFrame inicial
-        dados = pd.DataFrame({
-            'genero': [genero],
-            'idade': [idade],
-            'altura': [altura],
-            'peso': [peso],
-            'historico_familiar': [historico_familiar],
-            'consome_alta_calorias_frequente': [consome_calorias],
-            'consumo_vegetais': [consumo_vegetais],
-            'qtde_refeicoes_principais': [refeicoes],
-            'alimentacao_entre_refeicoes': [alimentacao_entre_refeicoes],
-            'fuma': [fuma],
-            'qtde_agua_diaria': [agua],
-            'monitora_calorias': [monitora_calorias],
-            'freq_atividade_fisica': [atividade_fisica],
-            'tempo_uso_dispositivos': [tempo_dispositivo],
-            'freq_consumo_alcool': [freq_consumo_alcool],
-            'meio_transporte_contumaz': [meio_transporte]
-        })
-
-        # 🔄 Aplicar LabelEncoder nas variáveis nominais
-        colunas_categoricas = [
-            'genero', 'historico_familiar',
-            'consome_alta_calorias_frequente',
-            'fuma', 'monitora_calorias',
-            'meio_transporte_contumaz'
-        ]
-
-        for col in colunas_categoricas:
-            dados[col] = label_encoders[col].transform(dados[col])
-
-        # 🔄 Aplicar mapeamento manual nas ordinais
-        dados['alimentacao_entre_refeicoes'] = mapeamento_alimentacao[dados['alimentacao_entre_refeicoes'].values[0]]
-        dados['freq_consumo_alcool'] = mapeamento_alcool[dados['freq_consumo_alcool'].values[0]]
-        dados['freq_atividade_fisica'] = mapeamento_atividade[dados['freq_atividade_fisica'].values[0]]
-        dados['consumo_vegetais'] = mapeamento_vegetais[dados['consumo_vegetais'].values[0]]
-
-        # 🔄 Aplicar scaler nas variáveis numéricas
-        colunas_numericas = [
-            'idade', 'altura', 'peso',
-            'qtde_refeicoes_principais', 'qtde_agua_diaria',
-            'tempo_uso_dispositivos'
-        ]
-        dados[colunas_numericas] = scaler.transform(dados[colunas_numericas])
-
-        # ✔️ Garantir a ordem das features
-        dados = dados[features]
-
-        # 🚀 Predição
-        pred = modelo.predict(dados)[0]
-        resultado = label_encoder_target.inverse_transform([pred])[0]
+        # 🔧 Construir registro de entrada
+        registro = {
+            'genero': genero,
+            'idade': idade,
+            'altura': altura,
+            'peso': peso,
+            'historico_familiar': historico_familiar,
+            'consome_alta_calorias_frequente': consome_calorias,
+            'consumo_vegetais': consumo_vegetais,
+            'qtde_refeicoes_principais': refeicoes,
+            'alimentacao_entre_refeicoes': alimentacao_entre_refeicoes,
+            'fuma': fuma,
+            'qtde_agua_diaria': agua,
+            'monitora_calorias': monitora_calorias,
+            'freq_atividade_fisica': atividade_fisica,
+            'tempo_uso_dispositivos': tempo_dispositivo,
+            'freq_consumo_alcool': freq_consumo_alcool,
+            'meio_transporte_contumaz': meio_transporte
+        }
+
+        # ⏳ Artefatos carregados em segundo plano enquanto o formulário era desenhado
+        try:
+            registro_modelos = carga_artefatos.result()
+        except Exception:
+            iniciar_carga_artefatos.clear()  # 🔁 nova tentativa no próximo rerun
+            raise
+        registro_modelos.atualizar_se_modificado()
+
+        # 🚀 Predição, probabilidades e principais fatores em uma só travessia das árvores
+        from preditor import principais_contribuicoes
+        resultado, probabilidades, contribuicoes = carregar_agrupador().prever(registro)
 
         st.subheader('🎯 Resultado da Predição:')
         st.success(f'📊 Nível de Obesidade: **{resultado}**')
 
+        col_proba, col_fatores = st.columns(2)
+        with col_proba:
+            st.markdown('**Probabilidade por nível**')
+            st.bar_chart(
+                probabilidades.iloc[0].rename('Probabilidade'), horizontal=True, sort=False,
+                x_label='Probabilidade', y_label=''
+            )
+
+        with col_fatores:
+            st.markdown('**Fatores que mais pesaram no nível previsto**')
+            if contribuicoes is None:
+                st.caption('Contribuições por feature indisponíveis para o modelo carregado.')
+            else:
+                for feature, valor in principais_contribuicoes(contribuicoes, k=3)[0]:
+                    sentido = 'a favor' if valor > 0 else 'contra'
+                    st.markdown(f"- `{feature.replace('_', ' ')}` — {sentido} ({valor:+.2f})")
+
 
 # ============================
 # 📊 Aba 2 — Painel Analítico
 # ============================
 with aba2:
-    st.title('📊 Painel Analítico')
-
-    subaba = st.selectbox(
-        'Selecione a Análise:',
-        ['🎯 Distribuição Geral',
-         '🔍 Perfil Demográfico',
-         '🥦 Estilo de Vida',
-         '🔧 Comportamento e Hábitos',
-         '🚬 Consumo e Transporte']
-    )
-
-    # 🎯 Distribuição Geral
-    if subaba == '🎯 Distribuição Geral':
-        st.subheader('Distribuição dos Níveis de Obesidade, Peso, Altura e Idade')
-
-        col_esq, col_centro, col_dir = st.columns([1, 2, 1])
-        with col_centro:
-            fig, ax = plt.subplots(figsize=(6, 4))
-            contagem = df_graficos['Obesity_Label'].value_counts().reindex(
-                [mapeamento_obesidade[k] for k in ordem_obesidade]
+    if aba2.open:
+        import graficos_painel
+
+        # 📸 Um só retrato por rerun: dados e chave do cache de figuras são do mesmo instante
+        retrato = estatisticas_atualizadas().retrato
+        tabelas = retrato.tabelas
+
+        st.title('📊 Painel Analítico')
+
+        opcoes_subaba = list(SUBABAS)
+        if metricas.ativo and st.query_params.get('admin') == '1':
+            opcoes_subaba.append(SUBABA_DESEMPENHO)
+        subaba = st.selectbox('Selecione a Análise:', opcoes_subaba)
+        inicio_subaba = time.perf_counter()
+
+        if subaba == SUBABA_DESEMPENHO:
+            exibir_desempenho()
+
+        # 🎯 Distribuição Geral
+        if subaba == '🎯 Distribuição Geral':
+            st.subheader('Distribuição dos Níveis de Obesidade, Peso, Altura e Idade')
+
+            col_esq, col_centro, col_dir = st.columns([1, 2, 1])
+            with col_centro:
+                exibir_grafico(retrato, 'distribuicao_niveis', graficos_painel.distribuicao_niveis, tabelas)
+
+                st.markdown(
+                    """
+                    <div style='max-width:800px; margin:auto; text-align:justify; font-size:16px;'>
+                    A maior concentração de indivíduos está nos níveis <strong>Obesidade I</strong>, <strong>Obesidade III</strong> e <strong>Obesidade II</strong>, respectivamente, o que revela cenário preocupante de <strong>predominância de obesidade severa</strong> na amostra analisada.
+                    <br><br>
+                    As categorias intermediárias — como <em>Sobrepeso</em> e <em>Peso Normal</em> — aparecem em proporções similares, enquanto o grupo <em>Abaixo do Peso</em> é o menos frequente.
+                    <br><br>
+                    Essa distribuição evidencia a <strong>necessidade urgente de intervenções em saúde pública</strong>, voltadas à <strong>prevenção e tratamento da obesidade em níveis mais avançados</strong>, antes que evoluam para comorbidades associadas.
+                    </div>
+                    """,
+                    unsafe_allow_html=True
+                )
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                exibir_grafico(
+                    retrato, 'hist_altura', graficos_painel.histograma_painel,
+                    retrato, 'altura', 'orange', 'Distribuição de Altura', 'Altura (m)'
+                )
+
+            with col2:
+                exibir_grafico(
+                    retrato, 'hist_peso', graficos_painel.histograma_painel,
+                    retrato, 'peso', 'blue', 'Distribuição de Peso', 'Peso (kg)'
+                )
+
+            with col3:
+                exibir_grafico(
+                    retrato, 'hist_idade', graficos_painel.histograma_painel,
+                    retrato, 'idade', 'green', 'Distribuição de Idade', 'Idade (anos)'
+                )
+
+            st.markdown(
+                """
+                <div style="display: flex; justify-content: center; margin-top: 30px;">
+                    <div style="max-width: 1000px; text-align: justify; font-size: 16px;">
+                        As distribuições revelam que a <strong>altura</strong> apresenta variação moderada, com maior concentração entre <strong>1,65 m e 1,80 m</strong>.
+                        <br><br>
+                        O <strong>peso</strong> demonstra ampla dispersão, com picos na faixa de <strong>80 a 90 kg</strong>, refletindo possíveis padrões de sobrepeso.
+                        <br><br>
+                        Já a <strong>idade</strong> está fortemente concentrada em <strong>jovens adultos</strong>, especialmente entre <strong>18 e 25 anos</strong>, indicando que o público analisado é majoritariamente jovem.
+                    </div>
+                </div>
+                """,
+                unsafe_allow_html=True
             )
-            sns.barplot(x=contagem.values, y=contagem.index, color='red', ax=ax)
-            ax.set_title('Distribuição dos Níveis de Obesidade', fontsize=12, fontweight='bold')
-            ax.set_xlabel('Quantidade', fontsize=9)
-            ax.set_ylabel('Nível de Obesidade', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            st.pyplot(fig)
+
+        # 🔍 Perfil Demográfico
+        elif subaba == '🔍 Perfil Demográfico':
+            st.subheader('Distribuição por Gênero e Histórico Familiar')
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                exibir_grafico(
+                    retrato, 'contagem_genero', graficos_painel.contagem_por_nivel,
+                    tabelas, 'genero', 'Obesidade por Gênero', rotulo_x='Gênero', figsize=(5, 3)
+                )
+
+            with col2:
+                exibir_grafico(
+                    retrato, 'contagem_historico_familiar', graficos_painel.contagem_por_nivel,
+                    tabelas, 'historico_familiar', 'Obesidade x Histórico Familiar',
+                    rotulo_x='Histórico Familiar', figsize=(5, 3)
+                )
+
+            # 🔸 Legenda única
+            exibir_grafico(retrato, 'legenda_niveis', graficos_painel.legenda_niveis)
 
             st.markdown(
                 """
                 <div style='max-width:800px; margin:auto; text-align:justify; font-size:16px;'>
-                A maior concentração de indivíduos está nos níveis <strong>Obesidade I</strong>, <strong>Obesidade III</strong> e <strong>Obesidade II</strong>, respectivamente, o que revela cenário preocupante de <strong>predominância de obesidade severa</strong> na amostra analisada.
+                O <strong>Gráfico I</strong> evidencia que a <strong>obesidade é mais prevalente no sexo masculino</strong>, especialmente nos níveis mais severos (Obesidade II e III), enquanto as mulheres apresentam maior concentração nos níveis leves e em estado de peso normal.
                 <br><br>
-                As categorias intermediárias — como <em>Sobrepeso</em> e <em>Peso Normal</em> — aparecem em proporções similares, enquanto o grupo <em>Abaixo do Peso</em> é o menos frequente.
+                Já no <strong>Gráfico II</strong>, observa-se que indivíduos com <strong>histórico familiar de obesidade</strong> concentram a maioria dos casos em todos os níveis da condição, reforçando a <strong>influência genética e comportamental</strong> no desenvolvimento da obesidade.
                 <br><br>
-                Essa distribuição evidencia a <strong>necessidade urgente de intervenções em saúde pública</strong>, voltadas à <strong>prevenção e tratamento da obesidade em níveis mais avançados</strong>, antes que evoluam para comorbidades associadas.
+                Esses achados apontam para a necessidade de <strong>abordagens personalizadas</strong> na prevenção e tratamento, considerando tanto o gênero quanto os antecedentes familiares.
                 </div>
                 """,
                 unsafe_allow_html=True
             )
 
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            fig, ax = plt.subplots(figsize=(4, 3))
-            sns.histplot(df_graficos['altura'], kde=True, bins=20, color='orange', ax=ax)
-            ax.set_title('Distribuição de Altura', fontsize=12, fontweight='bold')
-            ax.set_xlabel('Altura (m)', fontsize=9)
-            ax.set_ylabel('Frequência', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            st.pyplot(fig)
-
-        with col2:
-            fig, ax = plt.subplots(figsize=(4, 3))
-            sns.histplot(df_graficos['peso'], kde=True, bins=20, color='blue', ax=ax)
-            ax.set_title('Distribuição de Peso', fontsize=12, fontweight='bold')
-            ax.set_xlabel('Peso (kg)', fontsize=9)
-            ax.set_ylabel('Frequência', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            st.pyplot(fig)
-
-        with col3:
-            fig, ax = plt.subplots(figsize=(4, 3))
-            sns.histplot(df_graficos['idade'], kde=True, bins=20, color='green', ax=ax)
-            ax.set_title('Distribuição de Idade', fontsize=12, fontweight='bold')
-            ax.set_xlabel('Idade (anos)', fontsize=9)
-            ax.set_ylabel('Frequência', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            st.pyplot(fig)
-
-        st.markdown(
-            """
-            <div style="display: flex; justify-content: center; margin-top: 30px;">
-                <div style="max-width: 1000px; text-align: justify; font-size: 16px;">
-                    As distribuições revelam que a <strong>altura</strong> apresenta variação moderada, com maior concentração entre <strong>1,65 m e 1,80 m</strong>.
-                    <br><br>
-                    O <strong>peso</strong> demonstra ampla dispersão, com picos na faixa de <strong>80 a 90 kg</strong>, refletindo possíveis padrões de sobrepeso.
-                    <br><br>
-                    Já a <strong>idade</strong> está fortemente concentrada em <strong>jovens adultos</strong>, especialmente entre <strong>18 e 25 anos</strong>, indicando que o público analisado é majoritariamente jovem.
+
+        # 🥦 Estilo de Vida
+        if subaba == '🥦 Estilo de Vida':
+            st.subheader('Análise de Estilo de Vida')
+
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                exibir_grafico(
+                    retrato, 'box_consumo_vegetais', graficos_painel.boxplot_painel,
+                    retrato, 'consumo_vegetais', 'Consumo de Vegetais', 'Frequência'
+                )
+
+            with col2:
+                exibir_grafico(
+                    retrato, 'box_freq_atividade_fisica', graficos_painel.boxplot_painel,
+                    retrato, 'freq_atividade_fisica', 'Frequência de Atividade Física', 'Frequência'
+                )
+
+            with col3:
+                exibir_grafico(
+                    retrato, 'box_qtde_agua_diaria', graficos_painel.boxplot_painel,
+                    retrato, 'qtde_agua_diaria', 'Consumo de Água (Litros)', 'Litros'
+                )
+
+            st.markdown(
+                """
+                <div style='max-width:800px; margin:auto; text-align:justify; font-size:16px;'>
+                A distribuição do <strong>consumo de vegetais</strong> é relativamente estável entre os diferentes níveis de obesidade, o que sugere que apenas esse fator isolado pode não ser determinante para a condição.
+                <br><br>
+                Em contrapartida, a <strong>frequência de atividade física</strong> apresenta uma clara tendência de queda conforme aumenta o nível de obesidade, indicando forte associação entre sedentarismo e obesidade severa.
+                <br><br>
+                Já o <strong>consumo de água</strong> não mostra padrão linear, mas níveis mais altos de obesidade mantêm uma mediana próxima a 2,5 litros, o que pode refletir tentativas de controle ou compensação no estilo de vida.
                 </div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-
-    # 🔍 Perfil Demográfico
-    elif subaba == '🔍 Perfil Demográfico':
-        st.subheader('Distribuição por Gênero e Histórico Familiar')
-
-        col1, col2 = st.columns(2)
-
-        df_plot = df_graficos.copy()
-        df_plot['genero'] = df_plot['genero'].map({'Male': 'Masculino', 'Female': 'Feminino'})
-        df_plot['historico_familiar'] = df_plot['historico_familiar'].map({'yes': 'Sim', 'no': 'Não'})
-
-        with col1:
-            fig, ax = plt.subplots(figsize=(5, 3))
-            sns.countplot(
-                data=df_plot,
-                x='genero',
-                hue='Obesity_Label',
-                palette='Reds',
-                hue_order=[mapeamento_obesidade[k] for k in ordem_obesidade],
-                ax=ax
-            )
-            ax.set_title('Obesidade por Gênero', fontsize=12, fontweight='bold')
-            ax.set_xlabel('Gênero', fontsize=9)
-            ax.set_ylabel('Quantidade', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            ax.get_legend().remove()
-            st.pyplot(fig)
-
-        with col2:
-            fig, ax = plt.subplots(figsize=(5, 3))
-            sns.countplot(
-                data=df_plot,
-                x='historico_familiar',
-                hue='Obesity_Label',
-                palette='Reds',
-                hue_order=[mapeamento_obesidade[k] for k in ordem_obesidade],
-                ax=ax
-            )
-            ax.set_title('Obesidade x Histórico Familiar', fontsize=12, fontweight='bold')
-            ax.set_xlabel('Histórico Familiar', fontsize=9)
-            ax.set_ylabel('Quantidade', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            ax.get_legend().remove()
-            st.pyplot(fig)
-
-        # 🔸 Legenda única
-        cores = sns.color_palette("Reds", n_colors=7)
-        legenda_patches = [
-            Patch(color=cores[i], label=mapeamento_obesidade[k])
-            for i, k in enumerate(ordem_obesidade)
-        ]
-
-        fig, ax = plt.subplots(figsize=(6, 1))
-        ax.axis('off')
-        ax.legend(
-            handles=legenda_patches,
-            title='Nível de Obesidade',
-            loc='center',
-            ncol=4,
-            fontsize=8,
-            title_fontsize=9,
-            frameon=False
-        )
-        st.pyplot(fig)
-
-        st.markdown(
-            """
-            <div style='max-width:800px; margin:auto; text-align:justify; font-size:16px;'>
-            O <strong>Gráfico I</strong> evidencia que a <strong>obesidade é mais prevalente no sexo masculino</strong>, especialmente nos níveis mais severos (Obesidade II e III), enquanto as mulheres apresentam maior concentração nos níveis leves e em estado de peso normal.
-            <br><br>
-            Já no <strong>Gráfico II</strong>, observa-se que indivíduos com <strong>histórico familiar de obesidade</strong> concentram a maioria dos casos em todos os níveis da condição, reforçando a <strong>influência genética e comportamental</strong> no desenvolvimento da obesidade.
-            <br><br>
-            Esses achados apontam para a necessidade de <strong>abordagens personalizadas</strong> na prevenção e tratamento, considerando tanto o gênero quanto os antecedentes familiares.
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-
-
-    # 🥦 Estilo de Vida
-    if subaba == '🥦 Estilo de Vida':
-        st.subheader('Análise de Estilo de Vida')
-
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            fig, ax = plt.subplots(figsize=(4, 3))
-            sns.boxplot(
-                data=df_graficos,
-                x='Obesity_Label',
-                y='consumo_vegetais',
-                palette='Reds',
-                order=[mapeamento_obesidade[k] for k in ordem_obesidade],
-                ax=ax
-            )
-            ax.set_title('Consumo de Vegetais', fontsize=12, fontweight='bold')
-            ax.set_xlabel('Nível de Obesidade', fontsize=9)
-            ax.set_ylabel('Frequência', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            plt.xticks(rotation=45)
-            st.pyplot(fig)
-
-        with col2:
-            fig, ax = plt.subplots(figsize=(4, 3))
-            sns.boxplot(
-                data=df_graficos,
-                x='Obesity_Label',
-                y='freq_atividade_fisica',
-                palette='Reds',
-                order=[mapeamento_obesidade[k] for k in ordem_obesidade],
-                ax=ax
-            )
-            ax.set_title('Frequência de Atividade Física', fontsize=12, fontweight='bold')
-            ax.set_xlabel('Nível de Obesidade', fontsize=9)
-            ax.set_ylabel('Frequência', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            plt.xticks(rotation=45)
-            st.pyplot(fig)
-
-        with col3:
-            fig, ax = plt.subplots(figsize=(4, 3))
-            sns.boxplot(
-                data=df_graficos,
-                x='Obesity_Label',
-                y='qtde_agua_diaria',
-                palette='Reds',
-                order=[mapeamento_obesidade[k] for k in ordem_obesidade],
-                ax=ax
-            )
-            ax.set_title('Consumo de Água (Litros)', fontsize=12, fontweight='bold')
-            ax.set_xlabel('Nível de Obesidade', fontsize=9)
-            ax.set_ylabel('Litros', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            plt.xticks(rotation=45)
-            st.pyplot(fig)
-
-        st.markdown(
-            """
-            <div style='max-width:800px; margin:auto; text-align:justify; font-size:16px;'>
-            A distribuição do <strong>consumo de vegetais</strong> é relativamente estável entre os diferentes níveis de obesidade, o que sugere que apenas esse fator isolado pode não ser determinante para a condição.
-            <br><br>
-            Em contrapartida, a <strong>frequência de atividade física</strong> apresenta uma clara tendência de queda conforme aumenta o nível de obesidade, indicando forte associação entre sedentarismo e obesidade severa.
-            <br><br>
-            Já o <strong>consumo de água</strong> não mostra padrão linear, mas níveis mais altos de obesidade mantêm uma mediana próxima a 2,5 litros, o que pode refletir tentativas de controle ou compensação no estilo de vida.
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    
-    # 🔧 Comportamento e Hábitos
-    if subaba == '🔧 Comportamento e Hábitos':
-        st.subheader('Comportamento e Hábitos Alimentares')
-
-        # 🔧 Correção dos rótulos
-        df_plot = df_graficos.copy()
-        df_plot['alimentacao_entre_refeicoes'] = df_plot['alimentacao_entre_refeicoes'].replace({
-            'no': 'Não', 'Sometimes': 'Às vezes', 'Frequently': 'Frequente', 'Always': 'Sempre'
-        })
-        df_plot['monitora_calorias'] = df_plot['monitora_calorias'].replace({
-            'yes': 'Sim', 'no': 'Não'
-        })
-        df_plot['consome_alta_calorias_frequente'] = df_plot['consome_alta_calorias_frequente'].replace({
-            'yes': 'Sim', 'no': 'Não'
-        })
-
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            fig, ax = plt.subplots(figsize=(4, 3))
-            sns.countplot(
-                data=df_plot,
-                x='alimentacao_entre_refeicoes',
-                hue='Obesity_Label',
-                palette='Reds',
-                hue_order=[mapeamento_obesidade[k] for k in ordem_obesidade],
-                ax=ax
-            )
-            ax.set_title('Consumo Entre Refeições', fontsize=12, fontweight='bold')
-            ax.set_ylabel('Quantidade', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            ax.set_xlabel('')
-            plt.xticks(rotation=45)
-            ax.get_legend().remove()
-            st.pyplot(fig)
-
-        with col2:
-            fig, ax = plt.subplots(figsize=(4, 3))
-            sns.countplot(
-                data=df_plot,
-                x='monitora_calorias',
-                hue='Obesity_Label',
-                palette='Reds',
-                hue_order=[mapeamento_obesidade[k] for k in ordem_obesidade],
-                ax=ax
-            )
-            ax.set_title('Monitoramento de Calorias', fontsize=12, fontweight='bold')
-            ax.set_ylabel('Quantidade', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            ax.set_xlabel('')
-            plt.xticks(rotation=45)
-            ax.get_legend().remove()
-            st.pyplot(fig)
-
-        with col3:
-            fig, ax = plt.subplots(figsize=(4, 3))
-            sns.countplot(
-                data=df_plot,
-                x='consome_alta_calorias_frequente',
-                hue='Obesity_Label',
-                palette='Reds',
-                hue_order=[mapeamento_obesidade[k] for k in ordem_obesidade],
-                ax=ax
-            )
-            ax.set_title('Consumo de Alimentos Calóricos', fontsize=12, fontweight='bold')
-            ax.set_ylabel('Quantidade', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            ax.set_xlabel('')
-            plt.xticks(rotation=45)
-            ax.get_legend().remove()
-            st.pyplot(fig)
-
-        # 🔸 Legenda única
-        cores = sns.color_palette("Reds", n_colors=7)
-        legenda_patches = [
-            Patch(color=cores[i], label=mapeamento_obesidade[k])
-            for i, k in enumerate(ordem_obesidade)
-        ]
-
-        fig, ax = plt.subplots(figsize=(6, 1))
-        ax.axis('off')
-        ax.legend(
-            handles=legenda_patches,
-            title='Nível de Obesidade',
-            loc='center',
-            ncol=4,
-            fontsize=8,
-            title_fontsize=9,
-            frameon=False
-        )
-        st.pyplot(fig)
-
-        st.markdown(
-            """
-            <div style='max-width:800px; margin:auto; text-align:justify; font-size:16px;'>
-            A maioria dos indivíduos com obesidade relatam consumir alimentos entre as refeições com alguma frequência, sendo rara a ausência desse hábito em níveis mais altos de obesidade.
-            <br><br>
-            O <strong>monitoramento de calorias</strong> é bastante negligenciado em todos os níveis, mas sua prática é quase inexistente entre os obesos, o que sugere falta de controle alimentar intencional nesse grupo.
-            <br><br>
-            Já o <strong>consumo de alimentos calóricos</strong> mostra uma forte associação com níveis mais altos de obesidade, sendo mais prevalente justamente entre os indivíduos com obesidade moderada a grave, evidenciando um comportamento alimentar de alto risco.
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-
-        # 🚬 Consumo e Transporte
-    if subaba == '🚬 Consumo e Transporte':
-        st.subheader('Consumo de Cigarro, Álcool e Transporte')
-
-        # 🔧 Correção dos rótulos
-        df_plot = df_graficos.copy()
-        df_plot['fuma'] = df_plot['fuma'].replace({'yes': 'Sim', 'no': 'Não'})
-        df_plot['freq_consumo_alcool'] = df_plot['freq_consumo_alcool'].replace({
-            'no': 'Não', 'Sometimes': 'Às vezes', 'Frequently': 'Frequente', 'Always': 'Sempre'
-        })
-        df_plot['meio_transporte_contumaz'] = df_plot['meio_transporte_contumaz'].replace({
-            'Walking': 'Caminhada',
-            'Bike': 'Bicicleta',
-            'Public_Transportation': 'Transporte Público',
-            'Automobile': 'Automóvel',
-            'Motorbike': 'Moto'
-        })
-
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            fig, ax = plt.subplots(figsize=(4, 3))
-            sns.countplot(
-                data=df_plot,
-                x='fuma',
-                hue='Obesity_Label',
-                palette='Reds',
-                hue_order=[mapeamento_obesidade[k] for k in ordem_obesidade],
-                ax=ax
+                """,
+                unsafe_allow_html=True
             )
-            ax.set_title('Consumo de Cigarro', fontsize=12, fontweight='bold')
-            ax.set_xlabel('')  # 🔥 Oculta o nome do eixo X
-            ax.set_ylabel('Quantidade', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            plt.xticks(rotation=45)
-            ax.get_legend().remove()
-            st.pyplot(fig)
-
-        with col2:
-            fig, ax = plt.subplots(figsize=(4, 3))
-            sns.countplot(
-                data=df_plot,
-                x='freq_consumo_alcool',
-                hue='Obesity_Label',
-                palette='Reds',
-                hue_order=[mapeamento_obesidade[k] for k in ordem_obesidade],
-                ax=ax
+
+        # 🔧 Comportamento e Hábitos
+        if subaba == '🔧 Comportamento e Hábitos':
+            st.subheader('Comportamento e Hábitos Alimentares')
+
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                exibir_grafico(
+                    retrato, 'contagem_alimentacao_entre_refeicoes', graficos_painel.contagem_por_nivel,
+                    tabelas, 'alimentacao_entre_refeicoes', 'Consumo Entre Refeições'
+                )
+
+            with col2:
+                exibir_grafico(
+                    retrato, 'contagem_monitora_calorias', graficos_painel.contagem_por_nivel,
+                    tabelas, 'monitora_calorias', 'Monitoramento de Calorias'
+                )
+
+            with col3:
+                exibir_grafico(
+                    retrato, 'contagem_consome_alta_calorias_frequente', graficos_painel.contagem_por_nivel,
+                    tabelas, 'consome_alta_calorias_frequente', 'Consumo de Alimentos Calóricos'
+                )
+
+            # 🔸 Legenda única
+            exibir_grafico(retrato, 'legenda_niveis', graficos_painel.legenda_niveis)
+
+            st.markdown(
+                """
+                <div style='max-width:800px; margin:auto; text-align:justify; font-size:16px;'>
+                A maioria dos indivíduos com obesidade relatam consumir alimentos entre as refeições com alguma frequência, sendo rara a ausência desse hábito em níveis mais altos de obesidade.
+                <br><br>
+                O <strong>monitoramento de calorias</strong> é bastante negligenciado em todos os níveis, mas sua prática é quase inexistente entre os obesos, o que sugere falta de controle alimentar intencional nesse grupo.
+                <br><br>
+                Já o <strong>consumo de alimentos calóricos</strong> mostra uma forte associação com níveis mais altos de obesidade, sendo mais prevalente justamente entre os indivíduos com obesidade moderada a grave, evidenciando um comportamento alimentar de alto risco.
+                </div>
+                """,
+                unsafe_allow_html=True
             )
-            ax.set_title('Consumo de Álcool', fontsize=12, fontweight='bold')
-            ax.set_xlabel('')  # 🔥 Oculta o nome do eixo X
-            ax.set_ylabel('Quantidade', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            plt.xticks(rotation=45)
-            ax.get_legend().remove()
-            st.pyplot(fig)
-
-        with col3:
-            fig, ax = plt.subplots(figsize=(4, 3))
-            sns.countplot(
-                data=df_plot,
-                x='meio_transporte_contumaz',
-                hue='Obesity_Label',
-                palette='Reds',
-                hue_order=[mapeamento_obesidade[k] for k in ordem_obesidade],
-                ax=ax
+
+            # 🚬 Consumo e Transporte
+        if subaba == '🚬 Consumo e Transporte':
+            st.subheader('Consumo de Cigarro, Álcool e Transporte')
+
+            col1, col2, col3 = st.columns(3)
+
+            with col1:
+                exibir_grafico(
+                    retrato, 'contagem_fuma', graficos_painel.contagem_por_nivel,
+                    tabelas, 'fuma', 'Consumo de Cigarro'
+                )
+
+            with col2:
+                exibir_grafico(
+                    retrato, 'contagem_freq_consumo_alcool', graficos_painel.contagem_por_nivel,
+                    tabelas, 'freq_consumo_alcool', 'Consumo de Álcool'
+                )
+
+            with col3:
+                exibir_grafico(
+                    retrato, 'contagem_meio_transporte_contumaz', graficos_painel.contagem_por_nivel,
+                    tabelas, 'meio_transporte_contumaz', 'Meio de Transporte'
+                )
+
+            # 🔸 Legenda única
+            exibir_grafico(retrato, 'legenda_niveis', graficos_painel.legenda_niveis)
+
+            st.markdown(
+                """
+                <div style='max-width:800px; margin:auto; text-align:justify; font-size:16px;'>
+                O tabagismo é pouco prevalente na amostra analisada, mas entre os que fumam observa-se leve aumento nos níveis de obesidade.
+                <br><br>
+                O <strong>consumo de álcool</strong> esporádico (“às vezes”) é comum em todos os grupos, mas há destaque para níveis mais elevados de obesidade nesse padrão, sugerindo possível relação com consumo calórico extra.
+                <br><br>
+                Por fim, observa-se que indivíduos com <strong>obesidade grave</strong> utilizam predominantemente <strong>transporte público</strong> e <strong>automóvel</strong>, enquanto a prática de deslocamento a pé ou de bicicleta praticamente desaparece entre esses grupos — evidenciando baixo nível de atividade física no cotidiano.
+                </div>
+                """,
+                unsafe_allow_html=True
             )
-            ax.set_title('Meio de Transporte', fontsize=12, fontweight='bold')
-            ax.set_xlabel('')  # 🔥 Oculta o nome do eixo X
-            ax.set_ylabel('Quantidade', fontsize=9)
-            ax.tick_params(axis='both', labelsize=8)
-            plt.xticks(rotation=45)
-            ax.get_legend().remove()
-            st.pyplot(fig)
-
-        # 🔸 Legenda única
-        cores = sns.color_palette("Reds", n_colors=7)
-        legenda_patches = [
-            Patch(color=cores[i], label=mapeamento_obesidade[k])
-            for i, k in enumerate(ordem_obesidade)
-        ]
-
-        fig, ax = plt.subplots(figsize=(6, 1))
-        ax.axis('off')
-        ax.legend(
-            handles=legenda_patches,
-            title='Nível de Obesidade',
-            loc='center',
-            ncol=4,
-            fontsize=8,
-            title_fontsize=9,
-            frameon=False
-        )
-        st.pyplot(fig)
-
-        st.markdown(
-            """
-            <div style='max-width:800px; margin:auto; text-align:justify; font-size:16px;'>
-            O tabagismo é pouco prevalente na amostra analisada, mas entre os que fumam observa-se leve aumento nos níveis de obesidade.
-            <br><br>
-            O <strong>consumo de álcool</strong> esporádico (“às vezes”) é comum em todos os grupos, mas há destaque para níveis mais elevados de obesidade nesse padrão, sugerindo possível relação com consumo calórico extra.
-            <br><br>
-            Por fim, observa-se que indivíduos com <strong>obesidade grave</strong> utilizam predominantemente <strong>transporte público</strong> e <strong>automóvel</strong>, enquanto a prática de deslocamento a pé ou de bicicleta praticamente desaparece entre esses grupos — evidenciando baixo nível de atividade física no cotidiano.
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
\ No newline at end of file
+
+        # ⏱️ Tempo total da sub-aba: dados, gráficos (do cache ou desenhados) e textos
+        if subaba != SUBABA_DESEMPENHO:
+            metricas.observar('subaba', time.perf_counter() - inicio_subaba, subaba=subaba)
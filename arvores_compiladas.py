@@ -0,0 +1,261 @@
+# ============================
+# 🌲 Árvores Compiladas — GradientBoosting achatado em arrays NumPy contíguos
+# ============================
+
+import numpy as np
+from scipy.special import softmax
+
+# Linhas avaliadas por bloco: blocos pequenos mantêm a matriz (árvores × linhas) de
+# índices no cache da CPU — medido mais rápido que blocos grandes
+TAMANHO_BLOCO = 32
+
+
+def _completar_arvore(arvore, profundidade, feature, limiar, valor_folha, valor_no):
+    # Reescreve a árvore como árvore binária completa em layout de heap (filhos de i em
+    # 2i+1 e 2i+2). Folhas rasas viram nós com limiar +inf (sempre à esquerda) e o valor
+    # é replicado em todas as folhas completas abaixo delas.
+    n_internos = 2 ** profundidade - 1
+
+    def preencher(no, posicao, nivel):
+        if nivel == profundidade:
+            valor_folha[posicao - n_internos] = arvore.value[no, 0, 0]
+            return
+        valor_no[posicao] = arvore.value[no, 0, 0]
+        if arvore.children_left[no] < 0:
+            feature[posicao], limiar[posicao] = 0, np.inf
+            preencher(no, 2 * posicao + 1, nivel + 1)
+            preencher(no, 2 * posicao + 2, nivel + 1)
+        else:
+            feature[posicao], limiar[posicao] = arvore.feature[no], arvore.threshold[no]
+            preencher(arvore.children_left[no], 2 * posicao + 1, nivel + 1)
+            preencher(arvore.children_right[no], 2 * posicao + 2, nivel + 1)
+
+    preencher(0, 0, 0)
+
+
+class ArvoresCompiladas:
+    """Avalia todas as árvores de um `GradientBoostingClassifier` com travessia vetorizada.
+
+    Cada árvore vira uma árvore completa de `profundidade` níveis em layout de heap:
+    `feature`/`limiar`/`valor_no` têm forma (árvores, 2^p − 1) e `valor_folha` (árvores, 2^p). A
+    travessia é só aritmética de índices, um passo por nível para todas as árvores e
+    linhas ao mesmo tempo. As comparações usam X em float32, como o sklearn, e a soma
+    dos estágios segue a mesma ordem — classes e probabilidades saem idênticas.
+    """
+
+    def __init__(self, feature, limiar, valor_folha, n_estagios, n_classes,
+                 taxa_aprendizado, decisao_inicial, classes, valor_no=None):
+        self.feature = np.ascontiguousarray(feature, dtype='int32')
+        self.limiar = np.ascontiguousarray(limiar, dtype='float64')
+        self.valor_folha = np.ascontiguousarray(valor_folha, dtype='float64')
+        # Valores dos nós internos: só as contribuições por feature precisam deles
+        self.valor_no = None if valor_no is None else np.ascontiguousarray(valor_no, dtype='float64')
+        self.n_estagios = n_estagios
+        self.n_classes = n_classes
+        self.taxa_aprendizado = taxa_aprendizado
+        self.decisao_inicial = np.asarray(decisao_inicial, dtype='float64')
+        self.classes_ = np.asarray(classes)
+        self.profundidade = int(np.log2(self.valor_folha.shape[1]))
+        self.n_arvores = self.feature.shape[0]
+
+    @classmethod
+    def de_modelo(cls, modelo):
+        """Achata um `GradientBoostingClassifier` treinado (init padrão, perda log_loss)."""
+        arvores = [estimador.tree_ for estimador in modelo.estimators_.ravel()]
+        profundidade = max(arvore.max_depth for arvore in arvores)
+        feature = np.zeros((len(arvores), 2 ** profundidade - 1), dtype='int32')
+        limiar = np.zeros((len(arvores), 2 ** profundidade - 1), dtype='float64')
+        valor_folha = np.zeros((len(arvores), 2 ** profundidade), dtype='float64')
+        valor_no = np.zeros((len(arvores), 2 ** profundidade - 1), dtype='float64')
+        for i, arvore in enumerate(arvores):
+            _completar_arvore(arvore, profundidade, feature[i], limiar[i], valor_folha[i], valor_no[i])
+
+        decisao_inicial = modelo._raw_predict_init(
+            np.zeros((1, modelo.n_features_in_), dtype='float32')
+        )[0]
+        return cls(
+            feature, limiar, valor_folha,
+            n_estagios=modelo.estimators_.shape[0],
+            n_classes=modelo.estimators_.shape[1],
+            taxa_aprendizado=float(modelo.learning_rate),
+            decisao_inicial=decisao_inicial,
+            classes=modelo.classes_,
+            valor_no=valor_no
+        )
+
+    # ============================
+    # 🚀 Inferência
+    # ============================
+    def _percorrer(self, X):
+        # Índices planos (árvore × nó) visitados em cada nível, da raiz à folha: p + 1 arrays (árvores, n)
+        X = np.ascontiguousarray(X, dtype='float32')
+        n, n_features = X.shape
+        n_internos = self.feature.shape[1]
+        X_plano = X.ravel()
+        base_arvore = (np.arange(self.n_arvores, dtype='int64') * n_internos)[:, None]
+        base_linha = np.arange(n, dtype='int64') * n_features
+        posicao = np.zeros((self.n_arvores, n), dtype='int64')
+        feature, limiar = self.feature.ravel(), self.limiar.ravel()
+        caminho = []
+        for _ in range(self.profundidade):
+            no = base_arvore + posicao
+            caminho.append(no)
+            x = X_plano.take(base_linha + feature.take(no))
+            posicao = 2 * posicao + 1 + (x > limiar.take(no))
+        caminho.append(posicao - n_internos)
+        return caminho
+
+    def folhas(self, X):
+        """Posição da folha (0 … 2^p − 1) alcançada por cada linha em cada árvore: (árvores, n)."""
+        return self._percorrer(X)[-1]
+
+    def _valores(self, folhas):
+        deslocamento = (np.arange(self.n_arvores) * self.valor_folha.shape[1])[:, None]
+        return self.valor_folha.ravel().take(deslocamento + folhas)
+
+    def _somar_estagios(self, valores):
+        # Soma sequencial init + Σ taxa·valor, na mesma ordem do sklearn (cumsum não é pairwise)
+        n = valores.shape[1]
+        valores = valores.reshape(self.n_estagios, self.n_classes, n)
+        parcelas = np.empty((self.n_estagios + 1, self.n_classes, n), dtype='float64')
+        parcelas[0] = self.decisao_inicial[:, None]
+        np.multiply(self.taxa_aprendizado, valores, out=parcelas[1:])
+        return np.cumsum(parcelas, axis=0)[-1].T
+
+    def decision_function(self, X):
+        X = np.asarray(X, dtype='float32')
+        saida = np.empty((len(X), self.n_classes), dtype='float64')
+        for inicio in range(0, len(X), TAMANHO_BLOCO):
+            bloco = X[inicio:inicio + TAMANHO_BLOCO]
+            saida[inicio:inicio + len(bloco)] = self._somar_estagios(self._valores(self._percorrer(bloco)[-1]))
+        return saida
+
+    def decisao_e_contribuicoes(self, X):
+        """Decisão bruta (n, classes), contribuições (n, classes, features) e viés (classes,).
+
+        Uma única travessia alimenta as duas saídas. A decisão é idêntica à de
+        `decision_function`. As contribuições seguem o método de Saabas: em cada nó do
+        caminho, a variação de valor do nó para o filho visitado, vezes a taxa de
+        aprendizado, vai para a feature do nó. Viés + Σ contribuições = decisão.
+        """
+        if self.valor_no is None:
+            raise ValueError('Árvores sem valores dos nós internos: contribuições indisponíveis.')
+        X = np.asarray(X, dtype='float32')
+        n, n_features = X.shape
+        decisao = np.empty((n, self.n_classes), dtype='float64')
+        contribuicoes = np.empty((n, self.n_classes, n_features), dtype='float64')
+        feature, valor_no = self.feature.ravel(), self.valor_no.ravel()
+        classe = self._classe_por_arvore()[:, None]
+
+        for inicio in range(0, n, TAMANHO_BLOCO):
+            bloco = X[inicio:inicio + TAMANHO_BLOCO]
+            nb = len(bloco)
+            caminho = self._percorrer(bloco)
+            valores_folha = self._valores(caminho[-1])
+            decisao[inicio:inicio + nb] = self._somar_estagios(valores_folha)
+
+            # Índice plano (linha, classe, feature) de cada passo do caminho → um bincount por nível
+            linha_classe = (np.arange(nb)[None, :] * self.n_classes + classe) * n_features
+            acumulado = np.zeros(nb * self.n_classes * n_features, dtype='float64')
+            valores = [valor_no.take(no) for no in caminho[:-1]] + [valores_folha]
+            for nivel, no in enumerate(caminho[:-1]):
+                variacao = valores[nivel + 1] - valores[nivel]
+                indices = linha_classe + feature.take(no)
+                acumulado += np.bincount(indices.ravel(), weights=variacao.ravel(), minlength=acumulado.size)
+            contribuicoes[inicio:inicio + nb] = (
+                self.taxa_aprendizado * acumulado.reshape(nb, self.n_classes, n_features)
+            )
+
+        return decisao, contribuicoes, self._vies()
+
+    def _classe_por_arvore(self):
+        return np.tile(np.arange(self.n_classes), self.n_estagios)
+
+    def _vies(self):
+        raizes = self.valor_no[:, 0].reshape(self.n_estagios, self.n_classes)
+        return self.decisao_inicial + self.taxa_aprendizado * raizes.sum(axis=0)
+
+    def predict_proba(self, X):
+        return softmax(self.decision_function(X), axis=1)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.decision_function(X), axis=1)]
+
+
+class ArvoresReduzidas(ArvoresCompiladas):
+    """Variante enxuta das árvores compiladas, gerada por reduzir_modelo.py.
+
+    As árvores vêm agrupadas por classe (`inicios_classes`), com as estruturalmente
+    idênticas já fundidas numa só, então a decisão é init + taxa · Σ por classe em vez da
+    soma estágio a estágio. `feature` é uint8 e folhas/nós são float32. Os limiares podem
+    ser float16 ou, com `bordas`, códigos uint8: cada feature tem a lista ordenada dos seus
+    limiares e X é trocado pela posição de cada valor nela uma vez por chamada, antes dos
+    blocos da travessia (x > t_k ⇔ código(x) > k). O código 255 marca as folhas rasas.
+    """
+
+    def __init__(self, feature, limiar, valor_folha, inicios_classes, n_estagios, n_classes,
+                 taxa_aprendizado, decisao_inicial, classes, valor_no=None, bordas=None, inicios_bordas=None):
+        # Sem conversão de dtype: arrays de um pacote mapeado continuam apontando para o arquivo
+        self.feature = np.ascontiguousarray(feature)
+        self.limiar = np.ascontiguousarray(limiar)
+        self.valor_folha = np.ascontiguousarray(valor_folha)
+        self.valor_no = None if valor_no is None else np.ascontiguousarray(valor_no)
+        self.inicios_classes = np.asarray(inicios_classes, dtype='int64')
+        self.bordas = None if bordas is None else np.asarray(bordas, dtype='float64')
+        self.inicios_bordas = None if inicios_bordas is None else np.asarray(inicios_bordas, dtype='int64')
+        self._tabelas = [] if self.bordas is None else [
+            (j, self.bordas[inicio:fim])
+            for j, (inicio, fim) in enumerate(zip(self.inicios_bordas[:-1], self.inicios_bordas[1:])) if fim > inicio
+        ]
+        self.n_estagios = n_estagios
+        self.n_classes = n_classes
+        self.taxa_aprendizado = taxa_aprendizado
+        self.decisao_inicial = np.asarray(decisao_inicial, dtype='float64')
+        self.classes_ = np.asarray(classes)
+        self.profundidade = int(np.log2(self.valor_folha.shape[1]))
+        self.n_arvores = self.feature.shape[0]
+
+    def codificar(self, X):
+        """Posição de cada valor entre os limiares da sua feature (float32, como a travessia espera)."""
+        X = np.asarray(X, dtype='float32')
+        codigos = np.zeros(X.shape, dtype='float32')
+        for j, bordas in self._tabelas:
+            codigos[:, j] = np.searchsorted(bordas, X[:, j], side='left')
+        return codigos
+
+    def _entrada(self, X):
+        return X if self.bordas is None else self.codificar(X)
+
+    def folhas(self, X):
+        return super().folhas(self._entrada(X))
+
+    def decision_function(self, X):
+        return super().decision_function(self._entrada(X))
+
+    def decisao_e_contribuicoes(self, X):
+        return super().decisao_e_contribuicoes(self._entrada(X))
+
+    def _somar_estagios(self, valores):
+        somas = np.add.reduceat(valores.astype('float64'), self.inicios_classes, axis=0)
+        return (self.decisao_inicial[:, None] + self.taxa_aprendizado * somas).T
+
+    def _classe_por_arvore(self):
+        return np.repeat(np.arange(self.n_classes), np.diff(np.append(self.inicios_classes, self.n_arvores)))
+
+    def _vies(self):
+        raizes = np.add.reduceat(self.valor_no[:, 0].astype('float64'), self.inicios_classes)
+        return self.decisao_inicial + self.taxa_aprendizado * raizes
+
+
+def verificar_paridade(modelo, compilado, X, tolerancia=1e-12, tolerancia_rotulos=0.0):
+    """Confere predições (no máximo a fração `tolerancia_rotulos` diferente) e probabilidades
+    dentro da tolerância; devolve o maior desvio."""
+    divergencia = float(np.mean(modelo.predict(X) != compilado.predict(X)))
+    if divergencia > tolerancia_rotulos:
+        raise AssertionError(
+            f'Predições divergem da referência em {divergencia:.2%} das linhas (tolerância {tolerancia_rotulos:.2%}).'
+        )
+    desvio = float(np.max(np.abs(modelo.predict_proba(X) - compilado.predict_proba(X))))
+    if desvio > tolerancia:
+        raise AssertionError(f'Probabilidades divergem da referência: desvio máximo {desvio:.3e}')
+    return desvio
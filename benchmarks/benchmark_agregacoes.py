@@ -0,0 +1,60 @@
+# ============================
+# ⏱️ Benchmark — countplot sobre a base bruta vs. tabelas de contingência
+# Uso: python -m benchmarks.benchmark_agregacoes [--linhas 2111 100000 1000000]
+# ============================
+
+import argparse
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+from agregacoes_painel import COLUNAS_CONTAGEM, TabelasContingencia
+from dados_painel import carregar_dados_painel, ordem_rotulos_obesidade
+
+
+def replicar(df, linhas):
+    repeticoes = -(-linhas // len(df))
+    return pd.concat([df] * repeticoes, ignore_index=True).head(linhas)
+
+
+def desenhar_todos(desenhar):
+    inicio = time.perf_counter()
+    for col in COLUNAS_CONTAGEM:
+        fig, ax = plt.subplots(figsize=(4, 3))
+        desenhar(col, ax)
+        plt.close(fig)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description='countplot bruto vs. tabelas pré-agregadas')
+    parser.add_argument('--linhas', type=int, nargs='+', default=[2111, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    base = carregar_dados_painel()
+    print(f'{"linhas":>10}{"bruto (s)":>12}{"agregação (s)":>16}{"desenho agregado (s)":>22}')
+    for linhas in args.linhas:
+        df = replicar(base, linhas)
+
+        bruto = desenhar_todos(lambda col, ax: sns.countplot(
+            data=df, x=col, hue='Obesity_Label', palette='Reds',
+            hue_order=ordem_rotulos_obesidade, ax=ax
+        ))
+
+        inicio = time.perf_counter()
+        tabelas = TabelasContingencia(df)
+        agregacao = time.perf_counter() - inicio
+
+        agregado = desenhar_todos(lambda col, ax: sns.barplot(
+            data=tabelas.tabela(col), x=col, y='quantidade', hue='Obesity_Label',
+            palette='Reds', hue_order=ordem_rotulos_obesidade, errorbar=None, ax=ax
+        ))
+        print(f'{linhas:>10,}{bruto:>12.3f}{agregacao:>16.3f}{agregado:>22.3f}')
+
+
+if __name__ == '__main__':
+    main()
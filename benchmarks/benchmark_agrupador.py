@@ -0,0 +1,118 @@
+# ============================
+# ⏱️ Benchmark — requisições concorrentes: uma inferência por chamada vs. micro-lotes
+# Uso: python -m benchmarks.benchmark_agrupador [--clientes 32] [--janelas 2 5]
+# ============================
+
+import argparse
+import asyncio
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from agrupador_predicoes import AgrupadorPredicoes, explicar_por_registro
+from preditor import traduzir_codigos_brutos
+from registro_modelos import carregar_versao
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def rodar_threads(prever, registros, clientes, por_cliente):
+    """Cada cliente faz `por_cliente` chamadas sequenciais; devolve latências e duração."""
+    latencias = [[] for _ in range(clientes)]
+    largada = threading.Barrier(clientes + 1)
+
+    def cliente(indice):
+        largada.wait()
+        for j in range(por_cliente):
+            registro = registros[(indice * por_cliente + j) % len(registros)]
+            inicio = time.perf_counter()
+            prever(registro)
+            latencias[indice].append(time.perf_counter() - inicio)
+
+    threads = [threading.Thread(target=cliente, args=(i,)) for i in range(clientes)]
+    for thread in threads:
+        thread.start()
+    largada.wait()
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return np.concatenate(latencias), time.perf_counter() - inicio
+
+
+def rodar_async(agrupador, registros, clientes, por_cliente):
+    """Mesma carga, com os clientes como corrotinas num único event loop."""
+    async def cliente(indice, latencias):
+        for j in range(por_cliente):
+            registro = registros[(indice * por_cliente + j) % len(registros)]
+            inicio = time.perf_counter()
+            await agrupador.prever_async(registro)
+            latencias.append(time.perf_counter() - inicio)
+
+    async def todos():
+        latencias = []
+        await asyncio.gather(*(cliente(i, latencias) for i in range(clientes)))
+        return np.array(latencias)
+
+    inicio = time.perf_counter()
+    latencias = asyncio.run(todos())
+    return latencias, time.perf_counter() - inicio
+
+
+def relatar(nome, latencias, duracao, agrupador=None):
+    p50, p95, p99 = np.percentile(latencias, [50, 95, 99]) * 1e3
+    lote = f'{agrupador.estatisticas()["tamanho_medio_lote"]:6.1f}' if agrupador else f'{1:6.1f}'
+    print(f'{nome:<24} {len(latencias) / duracao:10,.0f} {p50:9.2f} {p95:9.2f} {p99:9.2f}   {lote}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Predições concorrentes com e sem micro-lotes')
+    parser.add_argument('--clientes', type=int, default=32)
+    parser.add_argument('--por-cliente', type=int, default=50)
+    parser.add_argument('--janelas', type=float, nargs='+', default=[2, 5])
+    parser.add_argument('--max-lote', type=int, default=64)
+    args = parser.parse_args()
+
+    preditor = carregar_versao(RAIZ).preditor
+    preditor.cache = None  # cada requisição paga a inferência
+    base = traduzir_codigos_brutos(pd.read_csv(os.path.join(RAIZ, 'Obesity.csv')))
+    registros = base.drop(columns=['nivel_obesidade']).to_dict('records')
+
+    # ✔️ O agrupador entrega a cada chamador exatamente o resultado da chamada isolada
+    agrupador = AgrupadorPredicoes(lambda regs: explicar_por_registro(preditor, regs), 5, args.max_lote)
+    amostra = registros[:200]
+    futuros = [agrupador.submeter(r) for r in amostra]
+    for registro, futuro in zip(amostra, futuros):
+        rotulo, proba, contrib = futuro.result()
+        esperado = preditor.prever_explicado([registro])
+        assert rotulo == esperado[0][0], 'Rótulo diverge da chamada isolada'
+        assert np.abs(proba.to_numpy() - esperado[1].to_numpy()).max() <= 1e-12, 'Probabilidades divergem'
+        assert np.abs(contrib.to_numpy() - esperado[2].to_numpy()).max() <= 1e-9, 'Contribuições divergem'
+    # 🛟 Um registro inválido falha sozinho; os demais do lote seguem
+    invalido = dict(registros[0], genero='???')
+    futuros = [agrupador.submeter(r) for r in [registros[1], invalido, registros[2]]]
+    assert futuros[0].result() and futuros[2].result() and futuros[1].exception() is not None
+    agrupador.fechar()
+    print(f'Paridade OK em {len(amostra)} registros; registro inválido isolado no lote')
+
+    def direto(registro):
+        return preditor.prever_explicado([registro])
+
+    print(f'\n{args.clientes} clientes × {args.por_cliente} chamadas')
+    print(f'{"modo":<24} {"req/s":>10} {"p50 (ms)":>9} {"p95 (ms)":>9} {"p99 (ms)":>9}   {"lote":>6}')
+    relatar('sem agrupamento', *rodar_threads(direto, registros, args.clientes, args.por_cliente))
+    for janela in args.janelas:
+        agrupador = AgrupadorPredicoes(lambda regs: explicar_por_registro(preditor, regs), janela, args.max_lote)
+        relatar(f'agrupado {janela:g} ms', *rodar_threads(agrupador.prever, registros, args.clientes,
+                                                          args.por_cliente), agrupador)
+        agrupador.fechar()
+        agrupador = AgrupadorPredicoes(lambda regs: explicar_por_registro(preditor, regs), janela, args.max_lote)
+        relatar(f'agrupado {janela:g} ms (asyncio)', *rodar_async(agrupador, registros, args.clientes,
+                                                                  args.por_cliente), agrupador)
+        agrupador.fechar()
+
+
+if __name__ == '__main__':
+    main()
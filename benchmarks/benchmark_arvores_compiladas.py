@@ -0,0 +1,56 @@
+# ============================
+# ⏱️ Benchmark — árvores compiladas vs. sklearn (paridade + latência/vazão)
+# Uso: python -m benchmarks.benchmark_arvores_compiladas [--lotes 1 100 100000]
+# ============================
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from arvores_compiladas import ArvoresCompiladas, verificar_paridade
+from benchmarks.sintetico import gerar_dataframe
+from preditor import PreditorObesidade, traduzir_codigos_brutos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cronometrar(funcao, X, repeticoes):
+    funcao(X)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao(X)
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Árvores compiladas vs. sklearn')
+    parser.add_argument('--lotes', type=int, nargs='+', default=[1, 100, 100_000])
+    args = parser.parse_args()
+
+    preditor = PreditorObesidade.carregar(RAIZ)
+    modelo = preditor.modelo
+    compilado = ArvoresCompiladas.de_modelo(modelo)
+
+    # ✔️ Paridade sobre o Obesity.csv e sobre dados sintéticos (valores fora da grade original)
+    base = preditor.preprocessar(traduzir_codigos_brutos(pd.read_csv(os.path.join(RAIZ, 'Obesity.csv'))))
+    desvio = verificar_paridade(modelo, compilado, base)
+    sintetico = preditor.preprocessar(traduzir_codigos_brutos(gerar_dataframe(max(args.lotes))))
+    desvio = max(desvio, verificar_paridade(modelo, compilado, sintetico))
+    print(f'Paridade OK — classes idênticas, desvio máximo de probabilidade {desvio:.1e}')
+
+    X_total = sintetico.to_numpy(dtype='float32')
+    print(f'{"lote":>8}{"sklearn (ms)":>16}{"compilado (ms)":>16}{"sklearn linhas/s":>20}{"compilado linhas/s":>22}')
+    for lote in args.lotes:
+        X = pd.DataFrame(X_total[:lote], columns=preditor.features)
+        repeticoes = max(3, min(200, 200_000 // lote))
+        t_sklearn = cronometrar(modelo.predict_proba, X, repeticoes)
+        t_compilado = cronometrar(compilado.predict_proba, X, repeticoes)
+        print(f'{lote:>8,}{t_sklearn * 1e3:>16.3f}{t_compilado * 1e3:>16.3f}'
+              f'{lote / t_sklearn:>20,.0f}{lote / t_compilado:>22,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# ============================
+# ⏱️ Benchmark — dados do painel: CSV vs. cache colunar (Feather) em 2k, 1M e 10M linhas
+# Uso: python -m benchmarks.benchmark_cache_colunar [--linhas 1000000 10000000]
+# ============================
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.sintetico import CAMINHO_CSV, gerar_csv
+
+# Colunas de uma sub-aba típica (histogramas da Distribuição Geral)
+COLUNAS_SUBABA = ['altura', 'peso', 'idade']
+
+MODOS = {
+    'csv': 'CSV completo',
+    'csv_subaba': 'CSV, só a sub-aba',
+    'construir': 'cria o cache',
+    'colunar': 'cache completo',
+    'colunar_subaba': 'cache, só a sub-aba'
+}
+
+
+def medir(modo, caminho, diretorio_cache):
+    """Roda num processo novo: tempo de carga, pico de RSS e memória do DataFrame."""
+    import resource
+    import time
+
+    from dados_painel import carregar_dados_painel
+
+    colunas = COLUNAS_SUBABA if modo.endswith('_subaba') else None
+    diretorio = None if modo.startswith('csv') else diretorio_cache
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    inicio = time.perf_counter()
+    df = carregar_dados_painel(caminho, colunas=colunas, diretorio_cache=diretorio)
+    duracao = time.perf_counter() - inicio
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        'segundos': duracao,
+        'pico_mb': (pico - base) / 1024,
+        'df_mb': df.memory_usage(deep=True).sum() / 2 ** 20,
+        'linhas': len(df)
+    }))
+
+
+def rodar(modo, caminho, diretorio_cache):
+    processo = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.benchmark_cache_colunar', '--medir', modo, caminho, diretorio_cache],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(processo.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CSV vs. cache colunar do painel')
+    parser.add_argument('--linhas', type=int, nargs='+', default=[1_000_000, 10_000_000],
+                        help='tamanhos sintéticos, além do Obesity.csv')
+    parser.add_argument('--diretorio', default=tempfile.gettempdir())
+    parser.add_argument('--medir', nargs=3, metavar=('MODO', 'CSV', 'CACHE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        medir(*args.medir)
+        return
+
+    arquivos = [CAMINHO_CSV]
+    for linhas in args.linhas:
+        caminho = os.path.join(args.diretorio, f'obesidade_sintetico_{linhas}.csv')
+        if not os.path.exists(caminho):
+            print(f'Gerando {caminho} ...')
+            gerar_csv(caminho, linhas)
+        arquivos.append(caminho)
+
+    print(f'{"linhas":>12}  {"modo":<20}  {"tempo (s)":>10}  {"pico RSS (MB)":>14}  {"DataFrame (MB)":>15}')
+    for caminho in arquivos:
+        diretorio_cache = tempfile.mkdtemp(prefix='cache_colunar_')
+        try:
+            for modo, descricao in MODOS.items():
+                r = rodar(modo, caminho, diretorio_cache)
+                print(f'{r["linhas"]:>12,}  {descricao:<20}  {r["segundos"]:>10.3f}  '
+                      f'{r["pico_mb"]:>14,.0f}  {r["df_mb"]:>15,.1f}')
+        finally:
+            shutil.rmtree(diretorio_cache)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# ============================
+# ⏱️ Benchmark — primeira renderização vs. figura em cache, por sub-aba
+# Uso: python -m benchmarks.benchmark_cache_figuras
+# ============================
+
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+import graficos_painel as g
+from cache_figuras import CacheFiguras
+from dados_painel import carregar_dados_painel
+from estatisticas_painel import EstatisticasPainel
+
+
+def graficos_por_subaba(estatisticas):
+    """Os mesmos gráficos (e argumentos) que o app desenha em cada sub-aba."""
+    tabelas = estatisticas.tabelas
+    return {
+        '🎯 Distribuição Geral': [
+            ('distribuicao_niveis', lambda: g.distribuicao_niveis(tabelas)),
+            ('hist_altura', lambda: g.histograma_painel(
+                estatisticas, 'altura', 'orange', 'Distribuição de Altura', 'Altura (m)')),
+            ('hist_peso', lambda: g.histograma_painel(
+                estatisticas, 'peso', 'blue', 'Distribuição de Peso', 'Peso (kg)')),
+            ('hist_idade', lambda: g.histograma_painel(
+                estatisticas, 'idade', 'green', 'Distribuição de Idade', 'Idade (anos)'))
+        ],
+        '🔍 Perfil Demográfico': [
+            ('contagem_genero', lambda: g.contagem_por_nivel(tabelas, 'genero', 'Obesidade por Gênero', 'Gênero', (5, 3))),
+            ('contagem_historico_familiar', lambda: g.contagem_por_nivel(
+                tabelas, 'historico_familiar', 'Obesidade x Histórico Familiar', 'Histórico Familiar', (5, 3))),
+            ('legenda_niveis', g.legenda_niveis)
+        ],
+        '🥦 Estilo de Vida': [
+            ('box_consumo_vegetais', lambda: g.boxplot_painel(
+                estatisticas, 'consumo_vegetais', 'Consumo de Vegetais', 'Frequência')),
+            ('box_freq_atividade_fisica', lambda: g.boxplot_painel(
+                estatisticas, 'freq_atividade_fisica', 'Frequência de Atividade Física', 'Frequência')),
+            ('box_qtde_agua_diaria', lambda: g.boxplot_painel(
+                estatisticas, 'qtde_agua_diaria', 'Consumo de Água (Litros)', 'Litros'))
+        ],
+        '🔧 Comportamento e Hábitos': [
+            ('contagem_alimentacao_entre_refeicoes', lambda: g.contagem_por_nivel(
+                tabelas, 'alimentacao_entre_refeicoes', 'Consumo Entre Refeições')),
+            ('contagem_monitora_calorias', lambda: g.contagem_por_nivel(tabelas, 'monitora_calorias', 'Monitoramento de Calorias')),
+            ('contagem_consome_alta_calorias_frequente', lambda: g.contagem_por_nivel(
+                tabelas, 'consome_alta_calorias_frequente', 'Consumo de Alimentos Calóricos')),
+            ('legenda_niveis_2', g.legenda_niveis)
+        ],
+        '🚬 Consumo e Transporte': [
+            ('contagem_fuma', lambda: g.contagem_por_nivel(tabelas, 'fuma', 'Consumo de Cigarro')),
+            ('contagem_freq_consumo_alcool', lambda: g.contagem_por_nivel(tabelas, 'freq_consumo_alcool', 'Consumo de Álcool')),
+            ('contagem_meio_transporte_contumaz', lambda: g.contagem_por_nivel(
+                tabelas, 'meio_transporte_contumaz', 'Meio de Transporte')),
+            ('legenda_niveis_3', g.legenda_niveis)
+        ]
+    }
+
+
+def renderizar_subaba(cache, versao, graficos):
+    inicio = time.perf_counter()
+    for id_grafico, desenhar in graficos:
+        cache.obter((id_grafico, versao, 'light'), desenhar)
+    return time.perf_counter() - inicio
+
+
+def main():
+    df = carregar_dados_painel()
+    estatisticas = EstatisticasPainel(df)
+    cache = CacheFiguras()
+    versao = df.attrs['versao']
+
+    # 🔥 Aquece imports/fontes do matplotlib para não inflar a primeira sub-aba
+    cache.obter(('aquecimento', versao, 'light'), g.legenda_niveis)
+
+    print(f'{"Sub-aba":<28}{"1ª renderização (ms)":>22}{"em cache (ms)":>16}')
+    for subaba, graficos in graficos_por_subaba(estatisticas).items():
+        primeira = renderizar_subaba(cache, versao, graficos)
+        em_cache = renderizar_subaba(cache, versao, graficos)
+        print(f'{subaba:<28}{primeira * 1e3:>22.1f}{em_cache * 1e3:>16.3f}')
+    print(f'Cache: {len(cache)} figuras, {cache.bytes_em_uso / 1024:.0f} KiB, '
+          f'{cache.acertos} acertos / {cache.faltas} faltas')
+
+
+if __name__ == '__main__':
+    main()
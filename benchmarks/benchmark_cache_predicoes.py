@@ -0,0 +1,55 @@
+# ============================
+# ⏱️ Benchmark — submissões repetidas com e sem cache de predições
+# Uso: python -m benchmarks.benchmark_cache_predicoes [--submissoes 2000 --threads 8]
+# ============================
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cache_predicoes import CachePredicoes
+from preditor import COLUNAS_ENTRADA, PreditorObesidade, traduzir_codigos_brutos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def medir(preditor, registros, threads):
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        resultados = list(pool.map(lambda r: preditor.prever([r])[0], registros))
+    return time.perf_counter() - inicio, resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cache de predições: latência e taxa de acerto')
+    parser.add_argument('--submissoes', type=int, default=2000)
+    parser.add_argument('--perfis-distintos', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    base = traduzir_codigos_brutos(pd.read_csv(os.path.join(RAIZ, 'Obesity.csv')))[COLUNAS_ENTRADA]
+    perfis = base.head(args.perfis_distintos).to_dict('records')
+    rng = np.random.default_rng(0)
+    registros = [perfis[i] for i in rng.integers(0, len(perfis), args.submissoes)]
+
+    sem_cache = PreditorObesidade.carregar(RAIZ)
+    com_cache = PreditorObesidade(
+        sem_cache.modelo, sem_cache.scaler, sem_cache.label_encoders,
+        sem_cache.label_encoder_target, sem_cache.features, cache=CachePredicoes()
+    )
+
+    dur_sem, res_sem = medir(sem_cache, registros, args.threads)
+    dur_com, res_com = medir(com_cache, registros, args.threads)
+    assert res_sem == res_com, 'Cache alterou predições'
+
+    print(f'Sem cache: {dur_sem / args.submissoes * 1e3:7.3f} ms/submissão')
+    print(f'Com cache: {dur_com / args.submissoes * 1e3:7.3f} ms/submissão')
+    print(f'Estatísticas: {com_cache.cache.estatisticas()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# ============================
+# ⏱️ Benchmark — carga de artefatos por rerun vs. registro do processo
+# Uso: python -m benchmarks.benchmark_carregamento [--reruns 50]
+# ============================
+
+import argparse
+import os
+import time
+
+import joblib
+
+from registro_modelos import ARQUIVOS_ARTEFATOS, RegistroModelos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def carregar_como_antes():
+    """O que o app fazia no topo do script a cada rerun."""
+    return {nome: joblib.load(os.path.join(RAIZ, arquivo)) for nome, arquivo in ARQUIVOS_ARTEFATOS.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Carga de artefatos: antes vs. registro')
+    parser.add_argument('--reruns', type=int, default=50)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    for _ in range(args.reruns):
+        carregar_como_antes()
+    antes = (time.perf_counter() - inicio) / args.reruns
+
+    registro = RegistroModelos(RAIZ)
+    inicio = time.perf_counter()
+    registro.ativa
+    primeira_carga = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(args.reruns):
+        registro.atualizar_se_modificado()
+        registro.preditor
+    depois = (time.perf_counter() - inicio) / args.reruns
+
+    print(f'Antes  — joblib.load por rerun        : {antes * 1e3:8.2f} ms')
+    print(f'Depois — primeira carga + validação   : {primeira_carga * 1e3:8.2f} ms (uma vez por processo)')
+    print(f'Depois — custo por rerun              : {depois * 1e3:8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# ============================
+# ⏱️ Benchmark — ingestão incremental vs. recomputar as estatísticas do painel do zero
+# Uso: python -m benchmarks.benchmark_estatisticas [--linhas 10000 100000 1000000] [--lote 1000]
+# ============================
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.sintetico import gerar_csv, gerar_dataframe
+from dados_painel import carregar_dados_painel
+from estatisticas_painel import COLUNAS_BOXPLOT, COLUNAS_ESTATISTICAS, COLUNAS_HISTOGRAMA, EstatisticasPainel
+
+
+def cronometrar(funcao, repeticoes=3):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def conferir(incremental, completo, df):
+    """Incremental e do zero precisam coincidir; quantis próximos dos exatos."""
+    for col in incremental.tabelas.colunas:
+        assert incremental.tabelas.tabela(col).equals(completo.tabelas.tabela(col)), f'Contagens divergem em {col}'
+    pior_quantil = 0.0
+    for col, resumo in incremental.resumos.items():
+        outro = completo.resumos[col]
+        assert (resumo.contagens == outro.contagens).all(), f'Histograma diverge em {col}'
+        assert np.allclose(resumo.media, outro.media, rtol=1e-12), f'Média diverge em {col}'
+        assert np.allclose(resumo.m2, outro.m2, rtol=1e-9), f'Variância diverge em {col}'
+        exatos = np.percentile(df[col].to_numpy(dtype='float64'), [25, 50, 75])
+        pior_quantil = max(pior_quantil, np.abs(resumo.quantis([.25, .5, .75]) - exatos).max() / resumo.largura)
+    return pior_quantil
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Custo de atualizar as estatísticas do painel')
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--lote', type=int, default=1000, help='linhas acrescentadas por atualização')
+    args = parser.parse_args()
+
+    diretorio = tempfile.mkdtemp(prefix='estatisticas_')
+    print(f'Lote acrescentado: {args.lote:,} linhas '
+          f'(histogramas {", ".join(COLUNAS_HISTOGRAMA)}; quantis {", ".join(COLUNAS_BOXPLOT)})')
+    print(f'{"base (linhas)":>14}  {"do zero (ms)":>13}  {"incremental (ms)":>17}  '
+          f'{"CSV acrescido (ms)":>19}  {"ganho":>8}  {"erro quantil (bins)":>20}')
+    try:
+        for linhas in args.linhas:
+            caminho = os.path.join(diretorio, f'base_{linhas}.csv')
+            gerar_csv(caminho, linhas)
+            df = carregar_dados_painel(caminho, colunas=COLUNAS_ESTATISTICAS, diretorio_cache=None)
+            lote_bruto = gerar_dataframe(args.lote, semente=99)
+            caminho_lote = os.path.join(diretorio, 'lote.csv')
+            lote_bruto.to_csv(caminho_lote, index=False)
+            lote = carregar_dados_painel(caminho_lote, colunas=COLUNAS_ESTATISTICAS, diretorio_cache=None)
+            combinado = pd.concat([df, lote], ignore_index=True)
+
+            # Do zero: todas as linhas de novo a cada lote (o que o painel fazia)
+            do_zero = cronometrar(lambda: EstatisticasPainel(combinado))
+
+            # Incremental: só o lote, sobre estatísticas já montadas
+            tempos = []
+            for _ in range(3):
+                estatisticas = EstatisticasPainel(df)
+                inicio = time.perf_counter()
+                estatisticas.adicionar(lote)
+                tempos.append(time.perf_counter() - inicio)
+            incremental = min(tempos) * 1000
+            pior_quantil = conferir(estatisticas, EstatisticasPainel(combinado), combinado)
+
+            # Ponta a ponta: linhas acrescentadas ao CSV e lidas a partir do último byte visto
+            estatisticas = EstatisticasPainel.de_csv(caminho, diretorio_cache=None)
+            lote_bruto.to_csv(caminho, mode='a', header=False, index=False)
+            inicio = time.perf_counter()
+            novas = estatisticas.atualizar()
+            csv_acrescido = (time.perf_counter() - inicio) * 1000
+            assert novas == args.lote, f'Esperadas {args.lote} linhas novas, lidas {novas}'
+            assert estatisticas.total_linhas == linhas + args.lote
+
+            print(f'{linhas:>14,}  {do_zero:>13.1f}  {incremental:>17.2f}  {csv_acrescido:>19.2f}  '
+                  f'{do_zero / incremental:>7.0f}x  {pior_quantil:>20.2f}')
+    finally:
+        shutil.rmtree(diretorio)
+
+
+if __name__ == '__main__':
+    main()
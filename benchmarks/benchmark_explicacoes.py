@@ -0,0 +1,68 @@
+# ============================
+# ⏱️ Benchmark — rótulo + probabilidades + contribuições em uma travessia vs. só predição
+# Uso: python -m benchmarks.benchmark_explicacoes [--lotes 1 100 10000]
+# ============================
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from preditor import ORDEM_CLASSES, traduzir_codigos_brutos
+from registro_modelos import carregar_versao
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cronometrar(funcao, repeticoes):
+    funcao()
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Custo das explicações sobre a predição')
+    parser.add_argument('--lotes', type=int, nargs='+', default=[1, 100, 10_000])
+    args = parser.parse_args()
+
+    preditor = carregar_versao(RAIZ).preditor
+    preditor.cache = None  # mede a inferência, não o cache de predições
+    base = traduzir_codigos_brutos(pd.read_csv(os.path.join(RAIZ, 'Obesity.csv')))
+    base = base.drop(columns=['nivel_obesidade'])
+
+    # ✔️ Mesmos rótulos e probabilidades do caminho atual; contribuições somam a decisão
+    rotulos, proba, contribuicoes = preditor.prever_explicado(base)
+    assert (rotulos == preditor.prever(base)).all(), 'Rótulos divergem de prever()'
+    desvio = np.abs(proba.to_numpy() - preditor.prever_proba(base)[ORDEM_CLASSES].to_numpy()).max()
+    assert desvio <= 1e-12, f'Probabilidades divergem: {desvio:.3e}'
+    arvores = preditor._arvores_explicacao()
+    decisao, todas, vies = arvores.decisao_e_contribuicoes(preditor.preprocessar_matriz(base))
+    residuo = np.abs(vies + todas.sum(axis=2) - decisao).max()
+    assert residuo <= 1e-9, f'Contribuições não somam a decisão: {residuo:.3e}'
+    print(f'Paridade OK — desvio de probabilidade {desvio:.1e}, resíduo da soma {residuo:.1e}')
+
+    def ingenuo(lote):
+        # Três chamadas independentes: predição, probabilidades e explicação
+        preditor.prever(lote)
+        preditor.prever_proba(lote)
+        arvores.decisao_e_contribuicoes(preditor.preprocessar_matriz(lote))
+
+    print(f'{"lote":>8}  {"só prever (ms)":>15}  {"+ proba (ms)":>13}  {"ingênuo 3x (ms)":>16}  {"explicado (ms)":>15}')
+    for tamanho in args.lotes:
+        lote = pd.concat([base] * int(np.ceil(tamanho / len(base))), ignore_index=True).head(tamanho)
+        repeticoes = max(3, 200 // tamanho)
+        tempos = [
+            cronometrar(lambda: preditor.prever(lote), repeticoes),
+            cronometrar(lambda: preditor.prever_com_proba(lote), repeticoes),
+            cronometrar(lambda: ingenuo(lote), repeticoes),
+            cronometrar(lambda: preditor.prever_explicado(lote), repeticoes),
+        ]
+        print(f'{tamanho:>8,}  {tempos[0]:>15.2f}  {tempos[1]:>13.2f}  {tempos[2]:>16.2f}  {tempos[3]:>15.2f}')
+
+
+if __name__ == '__main__':
+    main()
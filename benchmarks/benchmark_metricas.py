@@ -0,0 +1,94 @@
+# ============================
+# ⏱️ Benchmark — custo da instrumentação (métricas ligadas vs. desligadas)
+# Uso: python -m benchmarks.benchmark_metricas [--repeticoes 2000]
+# ============================
+
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from metricas import Metricas, metricas
+from preditor import traduzir_codigos_brutos
+from registro_modelos import carregar_versao
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Uma amostra do formato de texto: nome{rótulos} valor
+LINHA_AMOSTRA = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[^}]*\})? [-+0-9.eEInfa]+$')
+
+
+def por_chamada(funcao, repeticoes):
+    """Melhor de 5 rodadas, em microssegundos por chamada."""
+    melhores = []
+    for _ in range(5):
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            funcao()
+        melhores.append((time.perf_counter() - inicio) / repeticoes * 1e6)
+    return min(melhores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Custo das métricas sobre os caminhos quentes')
+    parser.add_argument('--repeticoes', type=int, default=2000)
+    args = parser.parse_args()
+
+    # 🔬 Custo bruto de cada primitiva
+    print(f'{"primitiva":<34} {"ligada (µs)":>12} {"desligada (µs)":>15}')
+    for nome, chamar in [
+        ('with medir(...)', None),
+        ('incrementar', lambda m: m.incrementar('contador', rota='x')),
+    ]:
+        tempos = []
+        for ativo in (True, False):
+            m = Metricas(ativo=ativo)
+            if chamar is None:
+                def chamada(m=m):
+                    with m.medir('etapa', etapa='x'):
+                        pass
+            else:
+                def chamada(m=m, chamar=chamar):
+                    chamar(m)
+            tempos.append(por_chamada(chamada, args.repeticoes * 10))
+        print(f'{nome:<34} {tempos[0]:>12.3f} {tempos[1]:>15.3f}')
+
+    # 🚀 Caminhos instrumentados de verdade, com e sem métricas
+    preditor = carregar_versao(RAIZ).preditor
+    preditor.cache = None
+    base = traduzir_codigos_brutos(pd.read_csv(os.path.join(RAIZ, 'Obesity.csv')))
+    base = base.drop(columns=['nivel_obesidade'])
+    registro = base.iloc[0].to_dict()
+    lote = base.head(100)
+
+    casos = [
+        ('preprocessar 1 registro', lambda: preditor.preprocessar_matriz([registro]), args.repeticoes),
+        ('prever 1 registro', lambda: preditor.prever([registro]), args.repeticoes // 10),
+        ('prever_explicado 1 registro', lambda: preditor.prever_explicado([registro]), args.repeticoes // 10),
+        ('prever_com_proba 100 registros', lambda: preditor.prever_com_proba(lote), args.repeticoes // 20),
+    ]
+    print(f'\n{"caminho":<34} {"ligada (µs)":>12} {"desligada (µs)":>15} {"custo":>8}')
+    for nome, funcao, repeticoes in casos:
+        tempos = {}
+        for ativo in (False, True) * 3:  # alternado, para diluir ruído de aquecimento e de carga
+            metricas.ativo = ativo
+            tempos.setdefault(ativo, []).append(por_chamada(funcao, max(repeticoes, 20)))
+        ligada, desligada = min(tempos[True]), min(tempos[False])
+        print(f'{nome:<34} {ligada:>12.1f} {desligada:>15.1f} {(ligada / desligada - 1) * 100:>7.1f}%')
+    metricas.ativo = True
+
+    # ✔️ Exportação no formato de texto do Prometheus
+    texto = metricas.exportar_prometheus()
+    amostras = [linha for linha in texto.splitlines() if linha and not linha.startswith('#')]
+    invalidas = [linha for linha in amostras if not LINHA_AMOSTRA.match(linha)]
+    assert not invalidas, f'Linhas fora do formato: {invalidas[:3]}'
+    inicio = time.perf_counter()
+    metricas.exportar_prometheus()
+    print(f'\nExportação OK — {len(amostras)} amostras em {(time.perf_counter() - inicio) * 1e3:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
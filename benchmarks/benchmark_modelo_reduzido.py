@@ -0,0 +1,79 @@
+# ============================
+# ⏱️ Benchmark — variantes reduzidas (estágios, limiares, fusão) vs. o modelo completo
+# Uso: python -m benchmarks.benchmark_modelo_reduzido [--linhas 100000] [--estagios 60]
+# ============================
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from reduzir_modelo import LIMIARES, dados_avaliacao, reduzir, tamanho_arrays
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cronometrar(funcao, repeticoes=3):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def conferir_sem_perda(completo, X):
+    """Todos os estágios com limiares exatos: só a fusão de árvores muda, e ela não pode mudar nada."""
+    motor = reduzir(completo, limiares='exato', n_features=X.shape[1])
+    decisao = motor.decision_function(X)
+    esperado = completo.decision_function(X)
+    assert (np.argmax(decisao, axis=1) == np.argmax(esperado, axis=1)).all(), 'Fusão mudou rótulos'
+    desvio = float(np.abs(decisao - esperado).max())
+    assert desvio < 1e-6, f'Fusão desviou a decisão em {desvio:.1e}'
+    return motor.n_arvores, desvio
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tamanho, latência e concordância das variantes reduzidas')
+    parser.add_argument('--linhas', type=int, default=100_000, help='linhas sintéticas para a latência em lote')
+    parser.add_argument('--estagios', type=int, default=60)
+    args = parser.parse_args()
+
+    from benchmarks.sintetico import gerar_dataframe
+    from pacote_modelo import salvar_pacote
+    from preditor import COLUNAS_ENTRADA, traduzir_codigos_brutos
+    from registro_modelos import carregar_versao
+
+    preditor = carregar_versao(RAIZ, backend='compilado', variante='').preditor
+    completo = preditor.motor
+    X_real, _ = dados_avaliacao(preditor)
+    sintetico = traduzir_codigos_brutos(gerar_dataframe(args.linhas, 0))[COLUNAS_ENTRADA]
+    X = preditor.preprocessar_matriz(sintetico)
+
+    arvores, desvio = conferir_sem_perda(completo, X)
+    print(f'Fusão sem perda: {completo.n_arvores} → {arvores} árvores, desvio máx. da decisão {desvio:.1e}\n')
+
+    rotulos_completo = np.argmax(completo.decision_function(X), axis=1)
+    variantes = [('completo', completo)] + [
+        (f'{limiares}/{args.estagios}', reduzir(completo, args.estagios, limiares, n_features=X.shape[1]))
+        for limiares in LIMIARES
+    ]
+    print(f'{"variante":<14}{"árvores":>8}{"pacote KB":>11}{"1 linha (ms)":>14}{"1k (ms)":>9}'
+          f'{f"{args.linhas // 1000}k (ms)":>11}{"concord. sintético":>20}')
+    with tempfile.TemporaryDirectory() as diretorio:
+        for nome, motor in variantes:
+            caminho = salvar_pacote(
+                os.path.join(diretorio, 'variante.obpkg'), motor, preditor.preprocessador, preditor.classes, nome
+            )
+            concordancia = float(np.mean(np.argmax(motor.decision_function(X), axis=1) == rotulos_completo))
+            print(f'{nome:<14}{motor.n_arvores:>8}{os.path.getsize(caminho) / 1024:>11.1f}'
+                  f'{cronometrar(lambda: motor.predict_proba(X_real[:1]), 200) * 1000:>14.3f}'
+                  f'{cronometrar(lambda: motor.predict_proba(X[:1000]), 5) * 1000:>9.1f}'
+                  f'{cronometrar(lambda: motor.predict_proba(X), 2) * 1000:>11.0f}{concordancia:>20.2%}')
+    print(f'\nArrays do modelo completo: {tamanho_arrays(completo) / 1024:.1f} KB')
+
+
+if __name__ == '__main__':
+    main()
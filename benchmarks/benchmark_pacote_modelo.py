@@ -0,0 +1,112 @@
+# ============================
+# ⏱️ Benchmark — cinco joblib vs. pacote único mapeado em memória
+# Uso: python -m benchmarks.benchmark_pacote_modelo [--workers 8]
+# ============================
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _worker(modo, caminho, registro_teste, fila, liberar):
+    """Carrega o modelo, faz uma predição e reporta memória; fica vivo até todos medirem."""
+    import psutil
+
+    # Imports dentro do worker: com spawn, o caminho do pacote nunca carrega o sklearn
+    inicio = time.perf_counter()
+    if modo == 'joblib':
+        from registro_modelos import ARQUIVOS_ARTEFATOS, carregar_versao
+        preditor = carregar_versao(caminho).preditor
+    else:
+        from preditor import PreditorObesidade
+        preditor = PreditorObesidade.de_pacote(caminho)
+    carga = time.perf_counter() - inicio
+    preditor.prever([registro_teste])
+
+    memoria = psutil.Process().memory_full_info()
+    fila.put((carga, memoria.rss, memoria.pss, memoria.uss))
+    liberar.wait()
+
+
+def medir_workers(modo, caminho, registro_teste, workers):
+    contexto = multiprocessing.get_context('spawn')
+    fila, liberar = contexto.Queue(), contexto.Event()
+    processos = [
+        contexto.Process(target=_worker, args=(modo, caminho, registro_teste, fila, liberar))
+        for _ in range(workers)
+    ]
+    for processo in processos:
+        processo.start()
+    medidas = np.array([fila.get() for _ in processos])
+    liberar.set()
+    for processo in processos:
+        processo.join()
+    return medidas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Joblib vs. pacote mapeado em memória')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--cargas', type=int, default=20, help='cargas repetidas no processo atual')
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    from pacote_modelo import ErroPacote, carregar_pacote, converter_artefatos
+    from preditor import PreditorObesidade, traduzir_codigos_brutos
+    from registro_modelos import ARQUIVOS_ARTEFATOS, carregar_versao
+
+    caminho_pacote = os.path.join(tempfile.mkdtemp(), 'modelo.obpkg')
+    converter_artefatos(RAIZ, caminho_pacote)
+    tamanho_joblib = sum(os.path.getsize(os.path.join(RAIZ, f)) for f in ARQUIVOS_ARTEFATOS.values())
+    print(f'Pacote: {os.path.getsize(caminho_pacote) / 1024:,.0f} KB '
+          f'(cinco joblib: {tamanho_joblib / 1024:,.0f} KB)')
+
+    # ✔️ Mesmas classes e probabilidades que os artefatos joblib
+    base = traduzir_codigos_brutos(pd.read_csv(os.path.join(RAIZ, 'Obesity.csv')))
+    base = base.drop(columns=['nivel_obesidade'])
+    original = carregar_versao(RAIZ).preditor
+    pacote = PreditorObesidade.de_pacote(caminho_pacote)
+    assert (original.prever(base) == pacote.prever(base)).all(), 'Classes divergem'
+    desvio = np.abs(original.prever_proba(base).to_numpy() - pacote.prever_proba(base).to_numpy()).max()
+    assert desvio <= 1e-12, f'Probabilidades divergem: {desvio:.3e}'
+    print(f'Paridade OK em {len(base):,} linhas — desvio máximo {desvio:.1e}')
+
+    # 🛡️ Um byte alterado nos arrays precisa ser rejeitado pelo checksum
+    corrompido = caminho_pacote + '.corrompido'
+    with open(caminho_pacote, 'rb') as arquivo:
+        conteudo = bytearray(arquivo.read())
+    conteudo[-1] ^= 0xFF
+    with open(corrompido, 'wb') as arquivo:
+        arquivo.write(conteudo)
+    try:
+        carregar_pacote(corrompido)
+        raise AssertionError('Pacote corrompido foi aceito')
+    except ErroPacote:
+        print('Checksum OK — pacote corrompido rejeitado')
+
+    # ⏱️ Carga no mesmo processo (pacotes Python já importados)
+    for nome, carregar in [('joblib', lambda: carregar_versao(RAIZ)),
+                           ('pacote', lambda: PreditorObesidade.de_pacote(caminho_pacote))]:
+        inicio = time.perf_counter()
+        for _ in range(args.cargas):
+            carregar()
+        print(f'Carga {nome:>6}: {(time.perf_counter() - inicio) / args.cargas * 1000:8.2f} ms')
+
+    # 🧠 Memória com N workers novos (spawn), cada um com seu modelo carregado
+    registro_teste = base.iloc[0].to_dict()
+    print(f'\n{args.workers} workers   import + carga (ms)   RSS total (MB)   PSS total (MB)   USS total (MB)')
+    for modo, caminho in [('joblib', RAIZ), ('pacote', caminho_pacote)]:
+        medidas = medir_workers(modo, caminho, registro_teste, args.workers)
+        carga, rss, pss, uss = medidas[:, 0].mean(), *(medidas[:, 1:].sum(axis=0) / 2 ** 20)
+        print(f'{modo:>10}   {carga * 1000:19.1f}   {rss:14,.0f}   {pss:14,.0f}   {uss:14,.0f}')
+
+
+if __name__ == '__main__':
+    main()
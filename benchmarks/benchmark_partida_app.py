@@ -0,0 +1,76 @@
+# ============================
+# ⏱️ Benchmark — partida a frio do app (perfil -X importtime e tempo até o primeiro render)
+# Uso: python -m benchmarks.benchmark_partida_app [--app app.py --repeticoes 3]
+# ============================
+
+import argparse
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pacotes de topo cujo custo de importação interessa na partida
+PACOTES = ['streamlit', 'pandas', 'numpy', 'scipy', 'sklearn', 'joblib', 'matplotlib', 'seaborn', 'pyarrow']
+
+# Roda num processo novo: primeiro render do app, como num container recém-iniciado
+SCRIPT_RENDER = '''
+import sys, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=300)
+inicio = time.perf_counter()
+app.run()
+assert not app.exception, app.exception
+print(f"RENDER {time.perf_counter() - inicio:.4f}")
+modulos = sys.modules
+print("CARREGADOS " + ",".join(p for p in sys.argv[2].split(",") if p in modulos))
+'''
+
+
+def medir_partida(app):
+    """(segundos até o primeiro render, pacotes carregados, {pacote: ms de importação})."""
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SCRIPT_RENDER, app, ','.join(PACOTES)],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    )
+    render, carregados = None, []
+    for linha in processo.stdout.splitlines():
+        if linha.startswith('RENDER '):
+            render = float(linha.split()[1])
+        elif linha.startswith('CARREGADOS '):
+            carregados = [p for p in linha.split(' ', 1)[1].split(',') if p]
+
+    # Linhas "import time: self | cumulative | nome": soma o tempo próprio de todos os
+    # submódulos de cada pacote, onde quer que tenham sido importados
+    importacao = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        proprio, _, nome = linha[len('import time:'):].split('|')
+        pacote = nome.strip().split('.')[0]
+        if pacote in PACOTES:
+            importacao[pacote] = importacao.get(pacote, 0) + int(proprio) / 1000
+    return render, carregados, importacao
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Partida a frio do app Streamlit')
+    parser.add_argument('--app', default=os.path.join(RAIZ, 'app.py'))
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    medicoes = [medir_partida(args.app) for _ in range(args.repeticoes)]
+    renders = sorted(m[0] for m in medicoes)
+    _, carregados, importacao = medicoes[-1]
+
+    print(f'Tempo até o primeiro render (mediana de {len(renders)}): {renders[len(renders) // 2]:.2f} s')
+    print(f'Pacotes carregados no primeiro render: {", ".join(carregados)}')
+    # O perfil cobre o processo inteiro, inclusive importações feitas pela thread de carga
+    print(f'{"pacote":>12}  {"importação (ms)":>16}')
+    for pacote in PACOTES:
+        if pacote in importacao:
+            print(f'{pacote:>12}  {importacao[pacote]:>16,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+# ============================
+# ⏱️ Benchmark — pontuação em streaming de um arquivo sintético grande
+# Uso: python -m benchmarks.benchmark_pontuar_lote [--linhas 10000000 --processos 1 4]
+# ============================
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.sintetico import gerar_csv
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Linhas/s e pico de RSS do pontuar_lote.py')
+    parser.add_argument('--linhas', type=int, default=10_000_000)
+    parser.add_argument('--processos', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--formato-saida', choices=['csv', 'parquet'], default='parquet')
+    parser.add_argument('--diretorio', default=tempfile.gettempdir())
+    args = parser.parse_args()
+
+    entrada = os.path.join(args.diretorio, f'obesidade_sintetico_{args.linhas}.csv')
+    if not os.path.exists(entrada):
+        print(f'Gerando {entrada} ...')
+        gerar_csv(entrada, args.linhas)
+
+    saida = os.path.join(args.diretorio, f'obesidade_previsoes.{args.formato_saida}')
+    for processos in sorted(set(args.processos)):
+        # Um subprocesso por medição: o pico de RSS não herda o da rodada anterior
+        print(f'--processos {processos}: ', end='', flush=True)
+        subprocess.run([
+            sys.executable, os.path.join(RAIZ, 'pontuar_lote.py'), entrada, saida,
+            '--processos', str(processos)
+        ], check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# ============================
+# ⏱️ Benchmark — predição linha a linha vs. em lote
+# Uso: python -m benchmarks.benchmark_predicao_lote [--linhas 100000]
+# ============================
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from preditor import (
+    COLUNAS_CATEGORICAS, COLUNAS_NUMERICAS, PreditorObesidade,
+    mapeamento_alcool, mapeamento_alimentacao, mapeamento_atividade,
+    mapeamento_vegetais, traduzir_codigos_brutos
+)
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def prever_linha_a_linha(preditor, linha):
+    """Reproduz literalmente o caminho original do bloco `if submit:` para uma linha."""
+    dados = pd.DataFrame({col: [linha[col]] for col in linha.index})
+
+    for col in COLUNAS_CATEGORICAS:
+        dados[col] = preditor.label_encoders[col].transform(dados[col])
+
+    dados['alimentacao_entre_refeicoes'] = mapeamento_alimentacao[dados['alimentacao_entre_refeicoes'].values[0]]
+    dados['freq_consumo_alcool'] = mapeamento_alcool[dados['freq_consumo_alcool'].values[0]]
+    dados['freq_atividade_fisica'] = mapeamento_atividade[dados['freq_atividade_fisica'].values[0]]
+    dados['consumo_vegetais'] = mapeamento_vegetais[dados['consumo_vegetais'].values[0]]
+
+    dados[COLUNAS_NUMERICAS] = preditor.scaler.transform(dados[COLUNAS_NUMERICAS])
+    dados = dados[preditor.features]
+
+    pred = preditor.modelo.predict(dados)[0]
+    return preditor.label_encoder_target.inverse_transform([pred])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Predição linha a linha vs. em lote')
+    parser.add_argument('--linhas', type=int, default=100_000, help='tamanho do lote replicado')
+    parser.add_argument('--amostra-linha', type=int, default=500, help='linhas medidas no caminho antigo')
+    args = parser.parse_args()
+
+    preditor = PreditorObesidade.carregar(RAIZ)
+    base = traduzir_codigos_brutos(pd.read_csv(os.path.join(RAIZ, 'Obesity.csv')))
+    base = base.drop(columns=['nivel_obesidade'])
+
+    # 🔁 Caminho antigo: um DataFrame por linha
+    amostra = base.head(args.amostra_linha)
+    inicio = time.perf_counter()
+    antigos = [prever_linha_a_linha(preditor, linha) for _, linha in amostra.iterrows()]
+    dur_linha = time.perf_counter() - inicio
+
+    # 🚀 Caminho novo: uma chamada para todas as linhas
+    novos = preditor.prever(amostra)
+    assert list(novos) == antigos, 'Divergência entre o caminho em lote e o linha a linha'
+
+    repeticoes = int(np.ceil(args.linhas / len(base)))
+    lote = pd.concat([base] * repeticoes, ignore_index=True).head(args.linhas)
+    inicio = time.perf_counter()
+    preditor.prever(lote)
+    dur_lote = time.perf_counter() - inicio
+
+    taxa_linha = len(amostra) / dur_linha
+    taxa_lote = len(lote) / dur_lote
+    print(f'Linha a linha : {taxa_linha:>12,.0f} linhas/s ({len(amostra)} linhas)')
+    print(f'Em lote       : {taxa_lote:>12,.0f} linhas/s ({len(lote)} linhas)')
+    print(f'Aceleração    : {taxa_lote / taxa_linha:>12,.1f}x')
+
+
+if __name__ == '__main__':
+    main()
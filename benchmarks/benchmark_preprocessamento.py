@@ -0,0 +1,88 @@
+# ============================
+# ⏱️ Benchmark — pré-processamento por coluna vs. fundido
+# Uso: python -m benchmarks.benchmark_preprocessamento [--linhas 100000]
+# ============================
+
+import argparse
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from preditor import (
+    COLUNAS_CATEGORICAS, COLUNAS_NUMERICAS, MAPEAMENTOS_ORDINAIS, PreditorObesidade,
+    para_dataframe, traduzir_codigos_brutos
+)
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def preprocessar_por_coluna(preditor, registros):
+    """Caminho anterior: um transform por encoder, mapas ordinais, scaler e reindex."""
+    dados = para_dataframe(registros)
+    saida = {}
+    for col in COLUNAS_CATEGORICAS:
+        saida[col] = preditor.label_encoders[col].transform(dados[col].to_numpy())
+    for col, mapa in MAPEAMENTOS_ORDINAIS.items():
+        saida[col] = dados[col].map(mapa).to_numpy(dtype='int64')
+    escaladas = preditor.scaler.transform(dados[COLUNAS_NUMERICAS].astype('float64'))
+    for i, col in enumerate(COLUNAS_NUMERICAS):
+        saida[col] = escaladas[:, i]
+    return pd.DataFrame({col: saida[col] for col in preditor.features})
+
+
+def medir(funcao, repeticoes):
+    """(ms por chamada, pico de memória alocada em KB numa chamada)."""
+    funcao()
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    ms = (time.perf_counter() - inicio) / repeticoes * 1000
+    tracemalloc.start()
+    funcao()
+    pico = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return ms, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pré-processamento por coluna vs. fundido')
+    parser.add_argument('--linhas', type=int, default=100_000, help='tamanho do lote grande')
+    args = parser.parse_args()
+
+    preditor = PreditorObesidade.carregar(RAIZ)
+    base = traduzir_codigos_brutos(pd.read_csv(os.path.join(RAIZ, 'Obesity.csv')))
+    base = base.drop(columns=['nivel_obesidade'])
+    repeticoes = int(np.ceil(args.linhas / len(base)))
+    lote = pd.concat([base] * repeticoes, ignore_index=True).head(args.linhas)
+    registro = base.iloc[0].to_dict()
+
+    # ✔️ Saída idêntica à que o modelo recebe (o sklearn converte a entrada para float32)
+    antigo = preprocessar_por_coluna(preditor, lote).to_numpy(dtype='float32')
+    novo = preditor.preprocessar_matriz(lote)
+    assert np.array_equal(antigo, novo), 'Divergência no lote'
+    assert np.array_equal(
+        preprocessar_por_coluna(preditor, [registro]).to_numpy(dtype='float32'),
+        preditor.preprocessar_matriz([registro])
+    ), 'Divergência no registro único'
+    print(f'Saídas idênticas em {len(lote):,} linhas e no registro único')
+
+    buffer = np.empty((len(lote), len(preditor.features)), dtype='float32')
+    casos = [
+        ('1 registro (dict)', lambda: preprocessar_por_coluna(preditor, [registro]),
+         lambda: preditor.preprocessar_matriz([registro]), 300),
+        (f'{len(lote):,} linhas', lambda: preprocessar_por_coluna(preditor, lote),
+         lambda: preditor.preprocessar_matriz(lote, saida=buffer), 3),
+    ]
+    print(f'{"caso":>20}  {"por coluna (ms)":>16}  {"fundido (ms)":>13}  {"pico antigo":>12}  {"pico fundido":>13}')
+    for nome, antigo, fundido, n in casos:
+        ms_antigo, pico_antigo = medir(antigo, n)
+        ms_fundido, pico_fundido = medir(fundido, n)
+        print(f'{nome:>20}  {ms_antigo:>16.3f}  {ms_fundido:>13.3f}  '
+              f'{pico_antigo:>9,.0f} KB  {pico_fundido:>10,.0f} KB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# ============================
+# ⏱️ Benchmark — histogramas/KDE e boxplots: seaborn sobre as linhas vs. modo binado
+# Uso: python -m benchmarks.benchmark_renderizacao [--linhas 10000 1000000 10000000] [--exato-ate 10000000]
+# ============================
+
+import argparse
+import time
+import warnings
+
+import matplotlib
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+import graficos_painel as g
+from cache_figuras import renderizar_figura
+from dados_painel import carregar_dados_painel
+from estatisticas_painel import COLUNAS_BOXPLOT, COLUNAS_HISTOGRAMA, EstatisticasPainel
+
+# 📏 Tolerâncias de equivalência (frações do pico; quantis em larguras de bin fino)
+TOLERANCIA_BARRAS = 0.02
+TOLERANCIA_KDE = 0.02
+TOLERANCIA_QUANTIS_BINS = 2.0
+
+
+def escalar_painel(base, linhas, semente=0):
+    """Reamostra a visão do painel com 1% de ruído nas colunas numéricas dos gráficos."""
+    rng = np.random.default_rng(semente)
+    df = base.iloc[rng.integers(0, len(base), linhas)].reset_index(drop=True)
+    for col in COLUNAS_HISTOGRAMA + COLUNAS_BOXPLOT:
+        df[col] = (df[col].to_numpy() * (1 + rng.normal(0, 0.01, linhas))).astype('float32')
+    return df
+
+
+def cronometrar(desenhar, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        renderizar_figura(desenhar())
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def comparar_histograma(df, estatisticas, coluna):
+    """Barras e curva KDE dos dois caminhos, lidas dos artistas desenhados."""
+    exato = g.histograma(df, coluna, 'blue', '', '')
+    binado = g.histograma_painel(estatisticas, coluna, 'blue', '', '', modo='binado')
+    barras = [np.array([p.get_height() for p in fig.axes[0].patches]) for fig in (exato, binado)]
+    curvas = [fig.axes[0].lines[0].get_ydata() for fig in (exato, binado)]
+    plt.close(exato)
+    plt.close(binado)
+    pico = barras[0].max()
+    return np.abs(barras[0] - barras[1]).max() / pico, np.abs(curvas[0] - curvas[1]).max() / curvas[0].max()
+
+
+def comparar_quantis(df, estatisticas, coluna):
+    """Maior erro de Q1/mediana/Q3 por nível, em larguras de bin fino."""
+    resumo = estatisticas.resumos[coluna]
+    pior = 0.0
+    for indice, nivel in enumerate(estatisticas.niveis):
+        valores = df.loc[df['Obesity_Label'] == nivel, coluna].to_numpy(dtype='float64')
+        if len(valores):
+            exatos = np.percentile(valores, [25, 50, 75])
+            pior = max(pior, np.abs(resumo.quantis([.25, .5, .75], indice) - exatos).max() / resumo.largura)
+    return pior
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Custo de histogramas/KDE e boxplots por tamanho da base')
+    parser.add_argument('--linhas', type=int, nargs='+', default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument('--exato-ate', type=int, default=10_000_000,
+                        help='maior base desenhada também pelo seaborn sobre as linhas')
+    args = parser.parse_args()
+    warnings.simplefilter('ignore', FutureWarning)  # palette sem hue no boxplot original
+
+    base = carregar_dados_painel(diretorio_cache=None)
+    renderizar_figura(g.legenda_niveis())  # aquece fontes/imports do matplotlib
+
+    print(f'{"linhas":>11}  {"resumos (ms)":>13}  {"hist exato":>11}  {"hist binado":>12}  {"KDE amostra":>12}  '
+          f'{"box exato":>10}  {"box binado":>11}  {"Δbarras":>8}  {"ΔKDE":>7}  {"Δquantis":>9}')
+    for linhas in args.linhas:
+        df = escalar_painel(base, linhas)
+        inicio = time.perf_counter()
+        estatisticas = EstatisticasPainel(df)
+        construcao = (time.perf_counter() - inicio) * 1000
+        repeticoes = 3 if linhas <= 1_000_000 else 1
+
+        binado = [
+            cronometrar(lambda: g.histograma_painel(estatisticas, 'peso', 'blue', 'Peso', 'Peso (kg)', modo='binado'), 3),
+            cronometrar(lambda: g.histograma_painel(
+                estatisticas, 'peso', 'blue', 'Peso', 'Peso (kg)', modo='binado', kde='amostra'), 3),
+            cronometrar(lambda: g.boxplot_painel(estatisticas, 'consumo_vegetais', 'Vegetais', 'Freq.', modo='binado'), 3)
+        ]
+        if linhas <= args.exato_ate:
+            exato = [
+                cronometrar(lambda: g.histograma(df, 'peso', 'blue', 'Peso', 'Peso (kg)'), repeticoes),
+                cronometrar(lambda: g.boxplot_por_nivel(df, 'consumo_vegetais', 'Vegetais', 'Freq.'), repeticoes)
+            ]
+            # ✔️ Equivalência visual: mesmas barras e curva, quantis a ~1 bin fino
+            diferencas = [comparar_histograma(df, estatisticas, col) for col in COLUNAS_HISTOGRAMA]
+            delta_barras = max(d[0] for d in diferencas)
+            delta_kde = max(d[1] for d in diferencas)
+            delta_quantis = max(comparar_quantis(df, estatisticas, col) for col in COLUNAS_BOXPLOT)
+            assert delta_barras <= TOLERANCIA_BARRAS, f'Barras divergem {delta_barras:.2%} do pico'
+            assert delta_kde <= TOLERANCIA_KDE, f'KDE diverge {delta_kde:.2%} do pico'
+            assert delta_quantis <= TOLERANCIA_QUANTIS_BINS, f'Quantis divergem {delta_quantis:.2f} bins'
+            colunas_exatas = (f'{exato[0]:>11.0f}', f'{exato[1]:>10.0f}',
+                              f'{delta_barras:>8.2%}', f'{delta_kde:>7.2%}', f'{delta_quantis:>9.2f}')
+        else:
+            colunas_exatas = (f'{"—":>11}', f'{"—":>10}', f'{"—":>8}', f'{"—":>7}', f'{"—":>9}')
+        print(f'{linhas:>11,}  {construcao:>13.0f}  {colunas_exatas[0]}  {binado[0]:>12.0f}  {binado[1]:>12.0f}  '
+              f'{colunas_exatas[1]}  {binado[2]:>11.0f}  {"  ".join(colunas_exatas[2:])}')
+        del df, estatisticas
+    print('\nTempos em ms (figura desenhada + PNG); Δ = maior diferença entre os caminhos '
+          '(barras/KDE: fração do pico; quantis: larguras de bin fino)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# ============================
+# ⏱️ Benchmark — 4 réplicas com caches isolados vs. armazém compartilhado (OBESIDADE_CACHE_DIR)
+# Uso: python -m benchmarks.benchmark_replicas [--replicas 4] [--linhas 1000000] [--predicoes 2000]
+# ============================
+
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+
+def replica(caminho_csv, diretorio_colunar, predicoes, semente):
+    """Carga do painel, todos os gráficos e `predicoes` submissões, como uma sessão do app."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import numpy as np
+    import pandas as pd
+
+    from benchmarks.benchmark_cache_figuras import graficos_por_subaba
+    from cache_compartilhado import armazem_padrao, espaco_padrao
+    from cache_figuras import CacheFiguras
+    from estatisticas_painel import EstatisticasPainel
+    from preditor import traduzir_codigos_brutos
+    from registro_modelos import carregar_versao
+
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    tempos = {}
+
+    inicio = time.perf_counter()
+    estatisticas = EstatisticasPainel.de_csv(caminho_csv, diretorio_colunar, compartilhado=espaco_padrao('estatisticas'))
+    tempos['estatisticas'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    cache = CacheFiguras(compartilhado=espaco_padrao('figuras'))
+    for graficos in graficos_por_subaba(estatisticas).values():
+        for id_grafico, desenhar in graficos:
+            cache.obter((id_grafico, estatisticas.versao, 'light'), desenhar)
+    tempos['graficos'] = time.perf_counter() - inicio
+
+    preditor = carregar_versao(raiz).preditor
+    base = traduzir_codigos_brutos(pd.read_csv(os.path.join(raiz, 'Obesity.csv'))).drop(columns=['nivel_obesidade'])
+    registros = base.sample(predicoes, replace=True, random_state=0).to_dict('records')
+    np.random.default_rng(semente).shuffle(registros)
+    inicio = time.perf_counter()
+    for registro in registros:
+        preditor.prever_explicado(registro)
+    tempos['predicoes'] = time.perf_counter() - inicio
+
+    figuras = cache.estatisticas()
+    cache_predicoes = preditor.cache.estatisticas()
+    armazem = armazem_padrao()
+    return {
+        'tempos': tempos,
+        'pico_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        'figuras_desenhadas': figuras['faltas'] - figuras['acertos_compartilhados'],
+        'figuras_total': figuras['faltas'] + figuras['acertos'],
+        'acerto_predicoes': cache_predicoes['taxa_acerto'],
+        'bytes_armazem': armazem.estatisticas()['bytes'] if armazem is not None else 0
+    }
+
+
+def rodar(modo, args, caminho_csv, diretorio_colunar, diretorio_compartilhado):
+    """1ª réplica sozinha (cache frio); as demais juntas, como um scale-out com o nó já aquecido."""
+    if diretorio_compartilhado:
+        os.environ['OBESIDADE_CACHE_DIR'] = diretorio_compartilhado
+    else:
+        os.environ.pop('OBESIDADE_CACHE_DIR', None)
+    contexto = multiprocessing.get_context('spawn')  # processos novos leem o ambiente acima
+    with contexto.Pool(args.replicas - 1, maxtasksperchild=1) as pool:
+        primeira = pool.apply(replica, (caminho_csv, diretorio_colunar, args.predicoes, 0))
+        demais = pool.starmap(replica, [
+            (caminho_csv, diretorio_colunar, args.predicoes, semente) for semente in range(1, args.replicas)
+        ])
+    resultados = [primeira] + demais
+    for indice, r in enumerate(resultados, 1):
+        t = r['tempos']
+        print(f'{modo:<14}{indice:>3}  {t["estatisticas"]:>12.2f}  {t["graficos"]:>10.2f}  {t["predicoes"]:>11.2f}  '
+              f'{r["figuras_desenhadas"]:>6}/{r["figuras_total"]:<3}  {r["acerto_predicoes"]:>12.0%}  '
+              f'{r["pico_rss"] / 2 ** 20:>13.0f}')
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Réplicas do app com e sem cache compartilhado')
+    parser.add_argument('--replicas', type=int, default=4)
+    parser.add_argument('--linhas', type=int, default=1_000_000, help='tamanho do CSV sintético do painel')
+    parser.add_argument('--predicoes', type=int, default=2000, help='submissões por réplica')
+    args = parser.parse_args()
+
+    from benchmarks.sintetico import gerar_csv
+    from dados_painel import construir_cache_colunar
+
+    diretorio = tempfile.mkdtemp(prefix='replicas_')
+    try:
+        caminho_csv = gerar_csv(os.path.join(diretorio, 'painel.csv'), args.linhas)
+        diretorio_colunar = os.path.join(diretorio, 'colunar')
+        construir_cache_colunar(caminho_csv, diretorio_colunar)  # as duas rodadas partem do Feather pronto
+
+        print(f'{args.replicas} réplicas, painel com {args.linhas:,} linhas, {args.predicoes:,} submissões cada '
+              f'(a 1ª réplica roda sozinha; as demais em paralelo)')
+        print(f'{"modo":<14}{"#":>3}  {"estatíst. (s)":>12}  {"gráf. (s)":>10}  {"predições (s)":>11}  '
+              f'{"desenh.":>10}  {"acerto pred.":>12}  {"pico RSS (MB)":>13}')
+        isolado = rodar('isolado', args, caminho_csv, diretorio_colunar, None)
+        compartilhado = rodar('compartilhado', args, caminho_csv, diretorio_colunar, os.path.join(diretorio, 'compartilhado'))
+
+        for modo, resultados in (('isolado', isolado), ('compartilhado', compartilhado)):
+            aquecidas = resultados[1:]
+            desenhadas = sum(r['figuras_desenhadas'] for r in aquecidas)
+            total = sum(r['figuras_total'] for r in aquecidas)
+            print(f'\n{modo}: réplicas aquecidas — acerto de figuras {1 - desenhadas / total:.0%}, '
+                  f'acerto de predições {sum(r["acerto_predicoes"] for r in aquecidas) / len(aquecidas):.0%}, '
+                  f'pico RSS somado {sum(r["pico_rss"] for r in resultados) / 2 ** 20:.0f} MB')
+        print(f'Armazém compartilhado em disco: {compartilhado[-1]["bytes_armazem"] / 2 ** 20:.1f} MB')
+    finally:
+        shutil.rmtree(diretorio)
+
+
+if __name__ == '__main__':
+    main()
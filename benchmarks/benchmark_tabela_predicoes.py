@@ -0,0 +1,101 @@
+# ============================
+# ⏱️ Benchmark — tabela de predições pré-computada vs. inferência ao vivo
+# Uso: python -m benchmarks.benchmark_tabela_predicoes [--vizinhanca 2] [--submissoes 20000]
+# ============================
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.sintetico import gerar_dataframe
+from preditor import COLUNAS_ENTRADA, traduzir_codigos_brutos
+from registro_modelos import carregar_versao
+from tabela_predicoes import PASSOS, TabelaPredicoes, celulas_da_populacao
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 📏 A grade usa os passos dos widgets: as submissões sintéticas chegam arredondadas como no app
+PASSOS_FORMULARIO = PASSOS
+
+
+def submissoes_do_formulario(linhas, semente):
+    dados = traduzir_codigos_brutos(gerar_dataframe(linhas, semente))[COLUNAS_ENTRADA]
+    for col, passo in PASSOS_FORMULARIO.items():
+        dados[col] = (dados[col] / passo).round() * passo
+    return dados
+
+
+def latencias_us(funcao, registros):
+    tempos = []
+    for registro in registros:
+        inicio = time.perf_counter()
+        funcao(registro)
+        tempos.append((time.perf_counter() - inicio) * 1e6)
+    return statistics.median(tempos), np.percentile(tempos, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tabela de predições: custo, tamanho e concordância')
+    parser.add_argument('--vizinhanca', type=int, default=2)
+    parser.add_argument('--submissoes', type=int, default=20_000, help='submissões sintéticas avaliadas')
+    args = parser.parse_args()
+
+    versao = carregar_versao(RAIZ)
+    preditor = versao.preditor
+    preditor.cache = None  # mede tabela e modelo, não o cache de predições
+
+    # 🏗️ Construção: perfis do Obesity.csv + vizinhança, pontuados em lote
+    inicio = time.perf_counter()
+    populacao = traduzir_codigos_brutos(pd.read_csv(os.path.join(RAIZ, 'Obesity.csv')))
+    tabela = TabelaPredicoes.construir(preditor, celulas_da_populacao(populacao, args.vizinhanca), versao.versao)
+    construcao = time.perf_counter() - inicio
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = tabela.salvar(os.path.join(diretorio, 'tabela.npz'))
+        tamanho_disco = os.path.getsize(caminho)
+        inicio = time.perf_counter()
+        tabela = TabelaPredicoes.carregar(caminho)
+        carga = time.perf_counter() - inicio
+    print(f'Tabela: {len(tabela):,} células em {construcao:.1f}s; {tamanho_disco / 2 ** 20:.1f} MB em disco, '
+          f'{tabela.nbytes / 2 ** 20:.1f} MB em memória, carga {carga * 1000:.0f} ms')
+
+    # ✔️ Concordância: rótulo da célula vs. inferência na entrada exata
+    dados = submissoes_do_formulario(args.submissoes, semente=7)
+    posicoes = tabela.localizar(dados)
+    acertos = posicoes >= 0
+    rotulos_vivos, proba_viva, _ = preditor.prever_explicado(dados[acertos].reset_index(drop=True))
+    linhas = tabela.linhas(dados.to_dict('records'), 'explicado')
+    assert [linha is not None for linha in linhas] == list(acertos), 'Consulta por registro diverge da vetorizada'
+    linhas = [linha for linha in linhas if linha is not None]
+    rotulos_tabela = np.array([linha[0] for linha in linhas], dtype=object)
+    proba_tabela = np.vstack([linha[1] for linha in linhas])
+    concordancia = (rotulos_tabela == rotulos_vivos).mean()
+    desvio_proba = np.abs(proba_tabela - proba_viva.to_numpy()).max(axis=1)
+    print(f'Submissões sintéticas (passos do formulário): {acertos.mean():.1%} respondidas pela tabela; '
+          f'rótulo igual ao ao vivo em {concordancia:.2%} delas')
+    print(f'Desvio de probabilidade nas respondidas: mediana {np.median(desvio_proba):.1e}, '
+          f'máx. {desvio_proba.max():.1e}')
+    # Só entradas exatamente na grade são respondidas: a tabela tem que concordar com o modelo
+    assert concordancia == 1.0, f'Tabela diverge do modelo em {1 - concordancia:.2%} das respondidas'
+    assert desvio_proba.max() < 1e-6, f'Probabilidades da tabela desviam {desvio_proba.max():.1e}'
+
+    # ⏱️ Latência por submissão (um registro por chamada, como o formulário)
+    registros = dados[acertos].head(2000).to_dict('records')
+    mediana_tabela, p99_tabela = latencias_us(lambda r: tabela.linhas([r], 'explicado'), registros)
+    ao_vivo = preditor.tabela
+    mediana_viva, p99_viva = latencias_us(preditor.prever_explicado, registros)
+    preditor.tabela = tabela
+    mediana_preditor, p99_preditor = latencias_us(preditor.prever_explicado, registros)
+    preditor.tabela = ao_vivo
+    print(f'{"caminho":<34}{"mediana (µs)":>14}{"p99 (µs)":>12}')
+    print(f'{"consulta na tabela":<34}{mediana_tabela:>14.0f}{p99_tabela:>12.0f}')
+    print(f'{"prever_explicado com tabela":<34}{mediana_preditor:>14.0f}{p99_preditor:>12.0f}')
+    print(f'{"prever_explicado ao vivo":<34}{mediana_viva:>14.0f}{p99_viva:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
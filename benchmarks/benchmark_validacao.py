@@ -0,0 +1,142 @@
+# ============================
+# ⏱️ Benchmark — pontuação em lote com e sem validação de entrada / monitor de deriva
+# Uso: python -m benchmarks.benchmark_validacao [--linhas 1000000] [--repeticoes 2] [--formato-saida parquet]
+# ============================
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import pontuar_lote
+from benchmarks.sintetico import gerar_csv, gerar_dataframe
+from preditor import COLUNAS_ENTRADA, traduzir_codigos_brutos
+from validacao_entrada import PSI_MODERADO, PSI_SIGNIFICATIVO, MonitorEntrada, PerfilReferencia, ValidadorEntrada
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 🧨 Falhas injetadas no lote "sujo": (coluna bruta, valor)
+FALHAS = [('Gender', 'Other'), ('Age', np.nan), ('Weight', 350.0), ('FCVC', 7.0), ('MTRANS', 'Scooter')]
+
+
+def cronometrar(funcao, repeticoes=3):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def custo_por_chunk(perfil, chunk_bruto):
+    """Milissegundos de cada estágio num chunk, isolados do resto do pipeline."""
+    from registro_modelos import carregar_versao
+    preditor = carregar_versao(RAIZ).preditor
+    dados = traduzir_codigos_brutos(chunk_bruto)
+    validador = ValidadorEntrada(perfil, 'substituir')
+    monitor = MonitorEntrada(perfil)
+    resultado = validador.validar(dados)
+    return {
+        'tradução': cronometrar(lambda: traduzir_codigos_brutos(chunk_bruto)),
+        'validação': cronometrar(lambda: validador.validar(dados)),
+        'deriva': cronometrar(lambda: monitor.contar(dados, resultado)),
+        'modelo': cronometrar(lambda: preditor.prever(dados[COLUNAS_ENTRADA]), 1)
+    }
+
+
+def conferir_deriva(perfil):
+    """Reamostra da referência fica estável; peso +10% tem que acusar deriva significativa."""
+    base = pd.read_csv(os.path.join(RAIZ, 'Obesity.csv'))
+    reamostra = traduzir_codigos_brutos(base.sample(200_000, replace=True, random_state=0))
+    deslocado = reamostra.assign(peso=reamostra['peso'] * 1.10)
+    resultados = {}
+    for nome, dados in (('reamostra', reamostra), ('peso +10%', deslocado)):
+        monitor = MonitorEntrada(perfil)
+        for inicio in range(0, len(dados), 50_000):  # incremental, como no streaming
+            monitor.adicionar(dados.iloc[inicio:inicio + 50_000])
+        resultados[nome] = monitor
+    psi_estavel = max(resultados['reamostra'].psi(col) for col in COLUNAS_ENTRADA)
+    psi_peso = resultados['peso +10%'].psi('peso')
+    assert psi_estavel < PSI_MODERADO, f'Reamostra da referência com PSI {psi_estavel:.3f}'
+    assert psi_peso > PSI_SIGNIFICATIVO, f'Peso deslocado com PSI {psi_peso:.3f}'
+    return psi_estavel, psi_peso, resultados['peso +10%'].ks('peso')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Linhas/s do pontuar_lote com validação ligada e desligada')
+    parser.add_argument('--linhas', type=int, default=1_000_000)
+    parser.add_argument('--tamanho-chunk', type=int, default=200_000)
+    parser.add_argument('--repeticoes', type=int, default=2, help='melhor de N passadas por configuração')
+    parser.add_argument('--formato-saida', choices=['csv', 'parquet'], default='parquet')
+    parser.add_argument('--diretorio', default=tempfile.gettempdir())
+    args = parser.parse_args()
+
+    entrada = os.path.join(args.diretorio, f'obesidade_sintetico_{args.linhas}.csv')
+    if not os.path.exists(entrada):
+        print(f'Gerando {entrada} ...')
+        gerar_csv(entrada, args.linhas)
+    perfil = PerfilReferencia.carregar()
+
+    # 🔬 Custo isolado de cada estágio num chunk
+    custos = custo_por_chunk(perfil, gerar_dataframe(args.tamanho_chunk, 1))
+    print(f'Chunk de {args.tamanho_chunk:,} linhas: ' + ', '.join(f'{k} {v * 1000:.0f} ms' for k, v in custos.items()))
+    print(f'Validação + deriva = {(custos["validação"] + custos["deriva"]) / custos["modelo"]:.1%} do tempo do modelo\n')
+
+    # 🚀 Vazão ponta a ponta (leitura, tradução, validação, modelo e escrita)
+    saida = os.path.join(args.diretorio, f'obesidade_validacao.{args.formato_saida}')
+    configuracoes = [
+        ('desligada', None, False),
+        ('substituir', 'substituir', False),
+        ('substituir + deriva', 'substituir', True),
+        ('descartar + deriva', 'descartar', True)
+    ]
+    rotulos = {}
+    print(f'{"validação":<22}{"linhas/s":>12}{"Δ vs desligada":>16}')
+    referencia = None
+    for nome, politica, deriva in configuracoes:
+        vazao = 0.0
+        for _ in range(args.repeticoes):
+            monitor = MonitorEntrada(perfil) if deriva else None
+            inicio = time.perf_counter()
+            total = pontuar_lote.pontuar_arquivo(
+                entrada, saida, args.tamanho_chunk, validacao=politica, monitor=monitor, perfil=perfil
+            )
+            vazao = max(vazao, total / (time.perf_counter() - inicio))
+        referencia = referencia or vazao
+        print(f'{nome:<22}{vazao:>12,.0f}{vazao / referencia - 1:>+16.1%}')
+        leitor = pd.read_parquet if args.formato_saida == 'parquet' else pd.read_csv
+        rotulos[nome] = leitor(saida, columns=['nivel_obesidade_previsto'])['nivel_obesidade_previsto'].to_numpy()
+        os.remove(saida)
+
+    # ✔️ Em dados limpos a validação não muda nenhuma predição
+    for nome in rotulos:
+        assert (rotulos[nome] == rotulos['desligada']).all(), f'{nome}: predições divergem em dados limpos'
+
+    # 🧨 Lote sujo: sem validação o lote aborta; com ela, cada falha é contada e a linha segue
+    sujo = gerar_dataframe(50_000, 2)
+    rng = np.random.default_rng(2)
+    for coluna, valor in FALHAS:
+        sujo.loc[rng.choice(len(sujo), 50, replace=False), coluna] = valor
+    dados = traduzir_codigos_brutos(sujo)
+    resultado = ValidadorEntrada(perfil, 'descartar').validar(dados)
+    contagens = resultado.contagens()[:, 1:].sum()
+    assert contagens == 50 * len(FALHAS), f'{contagens} problemas contados de {50 * len(FALHAS)} injetados'
+    try:
+        pontuar_lote._inicializar_worker(RAIZ)
+        pontuar_lote.pontuar_chunk((0, sujo, False, False))
+        raise AssertionError('Lote sujo pontuado sem validação')
+    except ValueError:
+        pass
+    print(f'\nLote sujo: {contagens} falhas injetadas, {contagens} detectadas, '
+          f'{(~resultado.validas).sum()} linhas descartadas (sem validação: ValueError)')
+
+    psi_estavel, psi_peso, ks_peso = conferir_deriva(perfil)
+    print(f'Deriva: reamostra da referência com PSI máx. {psi_estavel:.3f}; '
+          f'peso +10% com PSI {psi_peso:.3f} e KS {ks_peso:.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# ============================
+# 🧪 Dados Sintéticos — escala o Obesity.csv para milhões de linhas
+# Uso: python -m benchmarks.sintetico saida.csv --linhas 10000000
+# ============================
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_CSV = os.path.join(RAIZ, 'Obesity.csv')
+
+# 📏 Colunas contínuas recebem ruído relativo para não repetir linhas idênticas
+RUIDO = {'Age': 0.02, 'Height': 0.005, 'Weight': 0.02, 'CH2O': 0.02, 'TUE': 0.02}
+LIMITES = {
+    'Age': (14, 61), 'Height': (1.45, 1.98), 'Weight': (39, 173),
+    'CH2O': (1, 3), 'TUE': (0, 2)
+}
+
+
+def gerar_dataframe(linhas, semente=0, base=None):
+    """Reamostra linhas do Obesity.csv (com ruído nas contínuas) no formato bruto original."""
+    base = pd.read_csv(CAMINHO_CSV) if base is None else base
+    rng = np.random.default_rng(semente)
+    df = base.iloc[rng.integers(0, len(base), linhas)].reset_index(drop=True)
+    for col, escala in RUIDO.items():
+        valores = df[col].to_numpy() * (1 + rng.normal(0, escala, linhas))
+        df[col] = np.clip(valores, *LIMITES[col]).round(6)
+    return df
+
+
+def gerar_csv(caminho, linhas, semente=0, tamanho_bloco=1_000_000):
+    """Grava `linhas` linhas sintéticas em blocos, sem manter o arquivo todo em memória."""
+    base = pd.read_csv(CAMINHO_CSV)
+    escritas = 0
+    bloco = 0
+    while escritas < linhas:
+        n = min(tamanho_bloco, linhas - escritas)
+        df = gerar_dataframe(n, semente + bloco, base)
+        df.to_csv(caminho, mode='w' if escritas == 0 else 'a', header=escritas == 0, index=False)
+        escritas += n
+        bloco += 1
+    return caminho
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera um CSV sintético no formato do Obesity.csv')
+    parser.add_argument('saida')
+    parser.add_argument('--linhas', type=int, default=1_000_000)
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args()
+    gerar_csv(args.saida, args.linhas, args.semente)
+
+
+if __name__ == '__main__':
+    main()
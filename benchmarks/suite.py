@@ -0,0 +1,469 @@
+# ============================
+# 🧪 Suíte de Benchmarks e Regressão — tempos vs. linha de base + saídas de referência
+# Uso: python -m benchmarks.suite [--linhas 1000000] [-k predicao] [--tolerancia 0.25]
+#      python -m benchmarks.suite --salvar-base           (grava a nova linha de base)
+#      python -m benchmarks.suite --atualizar-referencia  (regrava as predições de referência)
+# Sai com código 1 se alguma predição mudar ou algum caso regredir além da tolerância.
+# ============================
+
+import argparse
+import datetime
+import functools
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRETORIO_REFERENCIA = os.path.join(RAIZ, 'benchmarks', 'referencia')
+CAMINHO_BASE = os.path.join(DIRETORIO_REFERENCIA, 'linha_base.json')
+CAMINHO_PREDICOES = os.path.join(DIRETORIO_REFERENCIA, 'predicoes_obesity.csv')
+CAMINHO_RESULTADOS = os.path.join(RAIZ, 'benchmarks', 'resultados', 'ultimo.json')
+
+# 🎯 Probabilidades são gravadas com 10 casas; acima disso é mudança de verdade
+TOLERANCIA_PROBABILIDADE = 1e-9
+
+# ============================
+# 📋 Registro de Casos
+# ============================
+CASOS = {}
+
+
+def caso(nome, repeticoes_minimas=5):
+    """Registra `preparar(contexto) -> funcao` sob `nome` (grupo.caso)."""
+    def registrar(preparar):
+        CASOS[nome] = (preparar, repeticoes_minimas)
+        return preparar
+    return registrar
+
+
+class Contexto:
+    """Dados e modelos compartilhados entre os casos, montados só quando algum caso pede."""
+
+    def __init__(self, linhas, diretorio):
+        self.linhas = linhas
+        self.diretorio = diretorio
+
+    @functools.cached_property
+    def versao(self):
+        from registro_modelos import carregar_versao
+        return carregar_versao(RAIZ)
+
+    def preditor(self, backend):
+        from preditor import PreditorObesidade
+        if backend == 'pacote':
+            return PreditorObesidade.de_pacote(self.caminho_pacote)
+        if backend == 'reduzido':
+            return PreditorObesidade.de_pacote(self.caminho_reduzido)
+        origem = self.versao.preditor
+        return PreditorObesidade(
+            origem.modelo, origem.scaler, origem.label_encoders, origem.label_encoder_target,
+            origem.features, backend=backend
+        )
+
+    @functools.cached_property
+    def caminho_pacote(self):
+        from pacote_modelo import converter_artefatos
+        return converter_artefatos(RAIZ, os.path.join(self.diretorio, 'modelo.obpkg'))
+
+    @functools.cached_property
+    def caminho_reduzido(self):
+        # Mesma variante que o reduzir_modelo.py escolhe por padrão (float16, 60 estágios)
+        from pacote_modelo import salvar_pacote
+        from reduzir_modelo import reduzir
+        preditor = self.preditor('compilado')
+        motor = reduzir(preditor.motor, 60, 'float16', n_features=len(preditor.features))
+        return salvar_pacote(
+            os.path.join(self.diretorio, 'reduzido.obpkg'), motor, preditor.preprocessador, preditor.classes,
+            f'{self.versao.versao}-float16-e60'
+        )
+
+    @functools.cached_property
+    def base(self):
+        from preditor import traduzir_codigos_brutos
+        base = traduzir_codigos_brutos(pd.read_csv(os.path.join(RAIZ, 'Obesity.csv')))
+        return base.drop(columns=['nivel_obesidade'])
+
+    @functools.cached_property
+    def caminho_sintetico(self):
+        from benchmarks.sintetico import gerar_csv
+        caminho = os.path.join(tempfile.gettempdir(), f'obesidade_sintetico_{self.linhas}.csv')
+        if not os.path.exists(caminho):
+            print(f'Gerando {caminho} ...')
+            gerar_csv(caminho, self.linhas)
+        return caminho
+
+    @functools.cached_property
+    def bruto_sintetico(self):
+        return pd.read_csv(self.caminho_sintetico)
+
+    @functools.cached_property
+    def sintetico(self):
+        from preditor import COLUNAS_ENTRADA, traduzir_codigos_brutos
+        return traduzir_codigos_brutos(self.bruto_sintetico)[COLUNAS_ENTRADA]
+
+    @functools.cached_property
+    def dados_painel(self):
+        from dados_painel import carregar_dados_painel
+        return carregar_dados_painel(diretorio_cache=None)
+
+    @functools.cached_property
+    def graficos(self):
+        from benchmarks.benchmark_cache_figuras import graficos_por_subaba
+        from estatisticas_painel import EstatisticasPainel
+        return {
+            id_grafico: desenhar
+            for graficos in graficos_por_subaba(EstatisticasPainel(self.dados_painel)).values()
+            for id_grafico, desenhar in graficos
+            if not id_grafico[-1].isdigit()  # legendas repetidas entre sub-abas
+        }
+
+
+# ============================
+# 📂 Carga de Artefatos
+# ============================
+@caso('carga.artefatos_joblib')
+def _carga_joblib(ctx):
+    from registro_modelos import carregar_versao
+    return lambda: carregar_versao(RAIZ)
+
+
+@caso('carga.pacote_mmap')
+def _carga_pacote(ctx):
+    from preditor import PreditorObesidade
+    caminho = ctx.caminho_pacote
+    return lambda: PreditorObesidade.de_pacote(caminho)
+
+
+# ============================
+# 🚀 Predição (sem cache de predições)
+# ============================
+def _caso_predicao(backend, tamanho, metodo='prever'):
+    def preparar(ctx):
+        preditor = ctx.preditor(backend)
+        if tamanho == 1:
+            entrada = [ctx.base.iloc[0].to_dict()]
+        else:
+            entrada = ctx.sintetico.head(tamanho)
+        funcao = getattr(preditor, metodo)
+        return lambda: funcao(entrada)
+    return preparar
+
+
+for _backend in ('sklearn', 'compilado', 'pacote', 'reduzido'):
+    caso(f'predicao.{_backend}_1_registro', 20)(_caso_predicao(_backend, 1))
+caso('predicao.sklearn_10k', 5)(_caso_predicao('sklearn', 10_000))
+caso('predicao.sklearn_proba_10k', 5)(_caso_predicao('sklearn', 10_000, 'prever_com_proba'))
+caso('predicao.explicada_1_registro', 20)(_caso_predicao('compilado', 1, 'prever_explicado'))
+caso('predicao.reduzido_10k', 5)(_caso_predicao('reduzido', 10_000))
+caso('predicao.explicada_10k', 3)(_caso_predicao('compilado', 10_000, 'prever_explicado'))
+
+
+# ============================
+# 🔧 Pré-processamento, etapa por etapa
+# ============================
+def _preprocessador_parcial(ctx, categoricas):
+    from preprocessamento_fundido import PreprocessadorFundido
+    completo = ctx.versao.preditor.preprocessador
+    features = [col for col in completo.features if (col in completo.categorias) == categoricas]
+    return PreprocessadorFundido(
+        features, completo.categorias, completo.codigos, completo.medias, completo.escalas
+    )
+
+
+@caso('preprocessamento.traducao_brutos_100k', 3)
+def _traducao_brutos(ctx):
+    from preditor import traduzir_codigos_brutos
+    bruto = ctx.bruto_sintetico.head(100_000)
+    return lambda: traduzir_codigos_brutos(bruto)
+
+
+@caso('preprocessamento.codificacao_100k')
+def _codificacao(ctx):
+    preprocessador, dados = _preprocessador_parcial(ctx, True), ctx.sintetico.head(100_000)
+    return lambda: preprocessador.transformar(dados)
+
+
+@caso('preprocessamento.escala_100k')
+def _escala(ctx):
+    preprocessador, dados = _preprocessador_parcial(ctx, False), ctx.sintetico.head(100_000)
+    return lambda: preprocessador.transformar(dados)
+
+
+@caso('preprocessamento.completo_100k')
+def _completo(ctx):
+    preprocessador, dados = ctx.versao.preditor.preprocessador, ctx.sintetico.head(100_000)
+    return lambda: preprocessador.transformar(dados)
+
+
+@caso('preprocessamento.completo_1_registro', 20)
+def _completo_registro(ctx):
+    preprocessador, registro = ctx.versao.preditor.preprocessador, ctx.base.iloc[0].to_dict()
+    return lambda: preprocessador.transformar([registro])
+
+
+# ============================
+# 🛡️ Validação de Entrada e Deriva
+# ============================
+@caso('validacao.validar_100k')
+def _validar(ctx):
+    from validacao_entrada import PerfilReferencia, ValidadorEntrada
+    validador, dados = ValidadorEntrada(PerfilReferencia.carregar(), 'substituir'), ctx.sintetico.head(100_000)
+    return lambda: validador.validar(dados)
+
+
+@caso('validacao.deriva_100k')
+def _deriva(ctx):
+    from validacao_entrada import MonitorEntrada, PerfilReferencia
+    monitor, dados = MonitorEntrada(PerfilReferencia.carregar()), ctx.sintetico.head(100_000)
+    return lambda: monitor.contar(dados)
+
+
+# ============================
+# 📊 Dados do Painel
+# ============================
+@caso('dados.csv_obesity')
+def _csv_obesity(ctx):
+    from dados_painel import carregar_dados_painel
+    return lambda: carregar_dados_painel(diretorio_cache=None)
+
+
+@caso('dados.csv_sintetico', 3)
+def _csv_sintetico(ctx):
+    from dados_painel import carregar_dados_painel
+    caminho = ctx.caminho_sintetico
+    return lambda: carregar_dados_painel(caminho, diretorio_cache=None)
+
+
+@caso('dados.colunar_sintetico', 3)
+def _colunar_sintetico(ctx):
+    from dados_painel import carregar_dados_painel
+    caminho, diretorio = ctx.caminho_sintetico, os.path.join(ctx.diretorio, 'cache_dados')
+    carregar_dados_painel(caminho, diretorio_cache=diretorio)  # constrói o cache fora da medição
+    return lambda: carregar_dados_painel(caminho, diretorio_cache=diretorio)
+
+
+@caso('dados.agregacoes_sintetico', 3)
+def _agregacoes_sintetico(ctx):
+    from agregacoes_painel import TabelasContingencia
+    from dados_painel import carregar_dados_painel
+    df = carregar_dados_painel(ctx.caminho_sintetico, diretorio_cache=os.path.join(ctx.diretorio, 'cache_dados'))
+    return lambda: TabelasContingencia(df)
+
+
+@caso('dados.estatisticas_sintetico', 3)
+def _estatisticas_sintetico(ctx):
+    from dados_painel import carregar_dados_painel
+    from estatisticas_painel import COLUNAS_ESTATISTICAS, EstatisticasPainel
+    df = carregar_dados_painel(
+        ctx.caminho_sintetico, colunas=COLUNAS_ESTATISTICAS,
+        diretorio_cache=os.path.join(ctx.diretorio, 'cache_dados')
+    )
+    return lambda: EstatisticasPainel(df)
+
+
+# ============================
+# 🖼️ Gráficos do Painel Analítico (desenho + PNG, como no app)
+# ============================
+def _caso_grafico(id_grafico):
+    def preparar(ctx):
+        from cache_figuras import renderizar_figura
+        desenhar = ctx.graficos[id_grafico]
+        return lambda: renderizar_figura(desenhar())
+    return preparar
+
+
+for _id in (
+    'distribuicao_niveis', 'hist_altura', 'hist_peso', 'hist_idade',
+    'contagem_genero', 'contagem_historico_familiar', 'legenda_niveis',
+    'box_consumo_vegetais', 'box_freq_atividade_fisica', 'box_qtde_agua_diaria',
+    'contagem_alimentacao_entre_refeicoes', 'contagem_monitora_calorias',
+    'contagem_consome_alta_calorias_frequente', 'contagem_fuma',
+    'contagem_freq_consumo_alcool', 'contagem_meio_transporte_contumaz'
+):
+    caso(f'grafico.{_id}', 3)(_caso_grafico(_id))
+
+
+# ============================
+# ⏱️ Medição
+# ============================
+def medir(funcao, repeticoes_minimas, orcamento_s):
+    """Aquece uma vez e repete até `repeticoes_minimas` e `orcamento_s` (no máx. 200 rodadas)."""
+    funcao()
+    tempos = []
+    inicio = time.perf_counter()
+    while len(tempos) < repeticoes_minimas or (time.perf_counter() - inicio < orcamento_s and len(tempos) < 200):
+        t = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - t)
+    tempos = np.array(tempos) * 1000
+    return {
+        'mediana_ms': float(np.median(tempos)),
+        'minimo_ms': float(tempos.min()),
+        'p95_ms': float(np.percentile(tempos, 95)),
+        'rodadas': len(tempos)
+    }
+
+
+def ambiente():
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+# ============================
+# ✔️ Saídas de Referência
+# ============================
+def predicoes_referencia(ctx, backend):
+    rotulos, proba = ctx.preditor(backend).prever_com_proba(ctx.base)
+    return rotulos, proba
+
+
+def gravar_referencia(ctx):
+    rotulos, proba = predicoes_referencia(ctx, 'sklearn')
+    tabela = proba.copy()
+    tabela.insert(0, 'classe', rotulos)
+    os.makedirs(DIRETORIO_REFERENCIA, exist_ok=True)
+    tabela.to_csv(CAMINHO_PREDICOES, index=False, float_format='%.10f')
+    print(f'Referência gravada: {CAMINHO_PREDICOES} ({len(tabela):,} linhas)')
+
+
+def conferir_referencia(ctx):
+    """Predições do Obesity.csv em todos os backends vs. o arquivo de referência. Retorna falhas."""
+    referencia = pd.read_csv(CAMINHO_PREDICOES)
+    esperado_rotulos = referencia.pop('classe').to_numpy()
+    falhas = []
+    backends = ['sklearn', 'pacote']
+    if hasattr(ctx.versao.preditor.modelo, 'estimators_'):
+        backends.insert(1, 'compilado')
+    for backend in backends:
+        rotulos, proba = predicoes_referencia(ctx, backend)
+        divergentes = int((rotulos != esperado_rotulos).sum())
+        desvio = float(np.abs(proba[referencia.columns].to_numpy() - referencia.to_numpy()).max())
+        ok = divergentes == 0 and desvio <= TOLERANCIA_PROBABILIDADE
+        print(f'  {backend:<10} rótulos divergentes: {divergentes:>4}   desvio de probabilidade: {desvio:.1e}'
+              f'   {"OK" if ok else "FALHOU"}')
+        if not ok:
+            falhas.append(backend)
+    return falhas
+
+
+# ============================
+# 📈 Comparação com a Linha de Base
+# ============================
+def comparar(resultados, base, tolerancia, minimo_ms):
+    """Imprime a tabela de comparação e devolve os casos que regrediram."""
+    regressoes = []
+    print(f'\n{"caso":<48} {"mediana (ms)":>13} {"base (ms)":>11} {"razão":>7}  status')
+    for nome, medida in resultados.items():
+        anterior = base.get(nome)
+        if anterior is None:
+            print(f'{nome:<48} {medida["mediana_ms"]:>13.3f} {"—":>11} {"—":>7}  novo')
+            continue
+        razao = medida['mediana_ms'] / anterior['mediana_ms']
+        # Abaixo de `minimo_ms` de diferença absoluta é ruído de medição, não regressão
+        regrediu = razao > 1 + tolerancia and medida['mediana_ms'] - anterior['mediana_ms'] > minimo_ms
+        status = 'REGRESSÃO' if regrediu else ('melhor' if razao < 1 / (1 + tolerancia) else 'ok')
+        print(f'{nome:<48} {medida["mediana_ms"]:>13.3f} {anterior["mediana_ms"]:>11.3f} {razao:>7.2f}  {status}')
+        if regrediu:
+            regressoes.append(nome)
+    return regressoes
+
+
+def main():
+    # Avisos de depreciação do seaborn se repetiriam a cada rodada dos gráficos
+    warnings.filterwarnings('ignore', category=FutureWarning)
+    parser = argparse.ArgumentParser(description='Suíte de benchmarks e regressão')
+    parser.add_argument('-k', dest='filtro', default=None, help='roda só os casos que contêm o texto')
+    parser.add_argument('--linhas', type=int, default=1_000_000, help='tamanho do CSV sintético')
+    parser.add_argument('--orcamento', type=float, default=1.0, help='segundos mínimos por caso')
+    parser.add_argument('--tolerancia', type=float, default=0.25, help='regressão relativa tolerada')
+    parser.add_argument('--minimo-ms', type=float, default=0.5, help='diferença absoluta ignorada')
+    parser.add_argument('--base', default=CAMINHO_BASE)
+    parser.add_argument('--saida', default=CAMINHO_RESULTADOS)
+    parser.add_argument('--salvar-base', action='store_true', help='grava os resultados como linha de base')
+    parser.add_argument('--atualizar-referencia', action='store_true')
+    parser.add_argument('--sem-referencia', action='store_true', help='pula a conferência das predições')
+    parser.add_argument('--listar', action='store_true')
+    args = parser.parse_args()
+
+    selecionados = [nome for nome in CASOS if args.filtro is None or args.filtro in nome]
+    if args.listar:
+        print('\n'.join(selecionados))
+        return 0
+
+    diretorio = tempfile.mkdtemp(prefix='suite_benchmarks_')
+    ctx = Contexto(args.linhas, diretorio)
+    codigo = 0
+    try:
+        if args.atualizar_referencia:
+            gravar_referencia(ctx)
+        if not args.sem_referencia:
+            print('Predições do Obesity.csv vs. referência:')
+            if conferir_referencia(ctx):
+                codigo = 1
+
+        resultados = {}
+        for nome in selecionados:
+            preparar, repeticoes = CASOS[nome]
+            resultados[nome] = medir(preparar(ctx), repeticoes, args.orcamento)
+            print(f'  {nome:<48} {resultados[nome]["mediana_ms"]:>11.3f} ms')
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+    relatorio = {
+        'data': datetime.datetime.now().isoformat(timespec='seconds'),
+        'ambiente': ambiente(),
+        'parametros': {'linhas': args.linhas},
+        'casos': resultados
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    print(f'\nResultados gravados em {args.saida}')
+
+    if args.salvar_base:
+        base = {}
+        if os.path.exists(args.base):
+            with open(args.base, encoding='utf-8') as arquivo:
+                base = json.load(arquivo)
+            if base.get('parametros') != relatorio['parametros']:
+                base = {}
+        # Com -k, atualiza só os casos rodados e mantém os demais da base anterior
+        relatorio['casos'] = {**base.get('casos', {}), **resultados}
+        with open(args.base, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+        print(f'Linha de base gravada em {args.base}')
+    elif os.path.exists(args.base):
+        with open(args.base, encoding='utf-8') as arquivo:
+            base = json.load(arquivo)
+        if base.get('parametros') != relatorio['parametros']:
+            print(f'Linha de base com outros parâmetros ({base.get("parametros")}); comparação ignorada.')
+        else:
+            regressoes = comparar(resultados, base['casos'], args.tolerancia, args.minimo_ms)
+            if regressoes:
+                print(f'\n{len(regressoes)} caso(s) regrediram mais de {args.tolerancia:.0%}: {", ".join(regressoes)}')
+                codigo = 1
+    else:
+        print(f'Sem linha de base em {args.base}; rode com --salvar-base para criá-la.')
+    return codigo
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+# ============================
+# ⏱️ Teste de carga — serviço HTTP de predição
+# Uso: python -m benchmarks.teste_carga_http [--url http://host:porta] [--clientes 16]
+#      Sem --url, sobe o servidor localmente numa porta livre.
+# ============================
+
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from preditor import COLUNAS_ENTRADA, traduzir_codigos_brutos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def postar(url, corpo):
+    requisicao = urllib.request.Request(
+        url, data=json.dumps(corpo).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}, method='POST'
+    )
+    inicio = time.perf_counter()
+    with urllib.request.urlopen(requisicao) as resposta:
+        resposta.read()
+    return time.perf_counter() - inicio
+
+
+def rodar(url, corpos, clientes):
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(clientes) as pool:
+        latencias = np.array(list(pool.map(lambda corpo: postar(url, corpo), corpos)))
+    return latencias, time.perf_counter() - inicio
+
+
+def relatar(nome, latencias, duracao, registros_por_chamada):
+    p50, p99 = np.percentile(latencias, [50, 99]) * 1e3
+    chamadas = len(latencias) / duracao
+    print(f'{nome:<22} p50 {p50:8.2f} ms  p99 {p99:8.2f} ms  '
+          f'{chamadas:8.1f} req/s  {chamadas * registros_por_chamada:10,.0f} registros/s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga do serviço HTTP')
+    parser.add_argument('--url', default=None)
+    parser.add_argument('--clientes', type=int, default=16)
+    parser.add_argument('--requisicoes', type=int, default=1000)
+    parser.add_argument('--tamanho-lote', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        from servico_http import criar_servidor
+        servidor = criar_servidor('127.0.0.1', 0, args.workers)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{servidor.server_address[1]}'
+
+    base = traduzir_codigos_brutos(pd.read_csv(os.path.join(RAIZ, 'Obesity.csv')))[COLUNAS_ENTRADA]
+    registros = base.to_dict('records')
+
+    unitarios = [registros[i % len(registros)] for i in range(args.requisicoes)]
+    latencias, duracao = rodar(url + '/predict', unitarios, args.clientes)
+    relatar('/predict', latencias, duracao, 1)
+
+    n_lotes = max(1, args.requisicoes // 20)
+    lotes = [{'registros': registros[:args.tamanho_lote]}] * n_lotes
+    latencias, duracao = rodar(url + '/predict/batch', lotes, args.clientes)
+    relatar(f'/predict/batch ({args.tamanho_lote})', latencias, duracao, args.tamanho_lote)
+
+
+if __name__ == '__main__':
+    main()
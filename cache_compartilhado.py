@@ -0,0 +1,205 @@
+# ============================
+# 🤝 Cache Compartilhado — armazém em disco (SQLite) reaproveitado pelas réplicas do nó
+# ============================
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from metricas import metricas
+
+# 📂 Com OBESIDADE_CACHE_DIR definido, figuras, estatísticas do painel e predições passam a
+# ser compartilhadas por todos os processos que apontam para o mesmo diretório
+DIRETORIO_COMPARTILHADO = os.environ.get('OBESIDADE_CACHE_DIR') or None
+LIMITE_BYTES_PADRAO = int(os.environ.get('OBESIDADE_CACHE_LIMITE_MB', '512')) * 1024 * 1024
+
+ARQUIVO_BANCO = 'cache_compartilhado.sqlite3'
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS itens (
+    espaco TEXT NOT NULL,
+    chave BLOB NOT NULL,
+    valor BLOB NOT NULL,
+    tamanho INTEGER NOT NULL,
+    criado REAL NOT NULL,
+    expira REAL,
+    PRIMARY KEY (espaco, chave)
+);
+CREATE INDEX IF NOT EXISTS itens_criado ON itens (criado);
+"""
+
+
+def _resumo_chave(chave):
+    # Chaves são tuplas de str/bytes/números: o pickle delas é estável entre processos
+    return hashlib.blake2b(pickle.dumps(chave, protocol=5), digest_size=16).digest()
+
+
+class ArmazemCompartilhado:
+    """Chave-valor persistente em um arquivo SQLite (modo WAL), seguro entre processos e threads.
+
+    Não há serviço externo: as réplicas do mesmo nó abrem o mesmo arquivo e o cache de
+    páginas do sistema operacional faz o papel de memória compartilhada. Valores são
+    gravados com pickle, então o diretório deve ser acessível só ao usuário do app.
+    Quando o total passa de `limite_bytes`, os itens mais antigos são descartados.
+    """
+
+    def __init__(self, diretorio, limite_bytes=LIMITE_BYTES_PADRAO):
+        os.makedirs(diretorio, exist_ok=True)
+        self.caminho = os.path.join(diretorio, ARQUIVO_BANCO)
+        self.limite_bytes = limite_bytes
+        self._local = threading.local()
+        self._trava = threading.Lock()
+        self._gravados_desde_poda = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.gravacoes = 0
+        self.despejos = 0
+        self._conexao().executescript(_ESQUEMA)
+
+    def _conexao(self):
+        # Uma conexão por thread: conexões SQLite não devem ser usadas por threads diferentes
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conexao.execute('PRAGMA journal_mode=WAL')
+            conexao.execute('PRAGMA synchronous=NORMAL')
+            self._local.conexao = conexao
+        return conexao
+
+    def espaco(self, nome, ttl_segundos=None):
+        return EspacoCompartilhado(self, nome, ttl_segundos)
+
+    # ============================
+    # 🔑 Leitura e Escrita
+    # ============================
+    def obter_varios(self, espaco, chaves):
+        """Lista com o valor de cada chave, ou None nas faltas/expiradas."""
+        resumos = [_resumo_chave(chave) for chave in chaves]
+        encontrados = {}
+        for inicio in range(0, len(resumos), 500):  # limite de parâmetros por consulta
+            bloco = resumos[inicio:inicio + 500]
+            linhas = self._conexao().execute(
+                f'SELECT chave, valor FROM itens WHERE espaco = ? AND chave IN ({",".join("?" * len(bloco))}) '
+                'AND (expira IS NULL OR expira > ?)',
+                (espaco, *bloco, time.time())
+            ).fetchall()
+            encontrados.update(linhas)
+        valores = [encontrados.get(resumo) for resumo in resumos]
+        acertos = sum(valor is not None for valor in valores)
+        with self._trava:
+            self.acertos += acertos
+            self.faltas += len(valores) - acertos
+        return [None if valor is None else pickle.loads(valor) for valor in valores]
+
+    def guardar_varios(self, espaco, chaves, valores, ttl_segundos=None):
+        agora = time.time()
+        expira = agora + ttl_segundos if ttl_segundos else None
+        linhas = []
+        for chave, valor in zip(chaves, valores):
+            dados = pickle.dumps(valor, protocol=5)
+            linhas.append((espaco, _resumo_chave(chave), dados, len(dados), agora, expira))
+        if not linhas:
+            return
+        conexao = self._conexao()
+        with conexao:
+            conexao.execute('BEGIN IMMEDIATE')
+            conexao.executemany('INSERT OR REPLACE INTO itens VALUES (?, ?, ?, ?, ?, ?)', linhas)
+        with self._trava:
+            self.gravacoes += len(linhas)
+            self._gravados_desde_poda += sum(linha[3] for linha in linhas)
+            podar = self._gravados_desde_poda > self.limite_bytes // 16
+            if podar:
+                self._gravados_desde_poda = 0
+        if podar:
+            self.podar()
+
+    def podar(self):
+        """Remove expirados e, acima do limite, os itens mais antigos (somar tamanhos é O(n))."""
+        conexao = self._conexao()
+        with conexao:
+            conexao.execute('BEGIN IMMEDIATE')
+            removidos = conexao.execute('DELETE FROM itens WHERE expira <= ?', (time.time(),)).rowcount
+            total = conexao.execute('SELECT COALESCE(SUM(tamanho), 0) FROM itens').fetchone()[0]
+            if total > self.limite_bytes:
+                acumulado = 0
+                corte = None
+                for criado, tamanho in conexao.execute('SELECT criado, tamanho FROM itens ORDER BY criado'):
+                    acumulado += tamanho
+                    corte = criado
+                    if total - acumulado <= self.limite_bytes:
+                        break
+                removidos += conexao.execute('DELETE FROM itens WHERE criado <= ?', (corte,)).rowcount
+        with self._trava:
+            self.despejos += removidos
+
+    # ============================
+    # 📊 Estado
+    # ============================
+    def estatisticas(self):
+        itens, total = self._conexao().execute('SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM itens').fetchone()
+        with self._trava:
+            consultas = self.acertos + self.faltas
+            return {
+                'itens': itens,
+                'bytes': total,
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'gravacoes': self.gravacoes,
+                'despejos': self.despejos,
+                'taxa_acerto': self.acertos / consultas if consultas else 0.0
+            }
+
+    def limpar(self, espaco=None):
+        conexao = self._conexao()
+        if espaco is None:
+            conexao.execute('DELETE FROM itens')
+        else:
+            conexao.execute('DELETE FROM itens WHERE espaco = ?', (espaco,))
+
+
+class EspacoCompartilhado:
+    """Visão de um armazém restrita a um espaço de chaves (ex.: figuras, predições de uma versão)."""
+
+    def __init__(self, armazem, nome, ttl_segundos=None):
+        self.armazem = armazem
+        self.nome = nome
+        self.ttl_segundos = ttl_segundos
+
+    def obter(self, chave):
+        return self.armazem.obter_varios(self.nome, [chave])[0]
+
+    def guardar(self, chave, valor):
+        self.armazem.guardar_varios(self.nome, [chave], [valor], self.ttl_segundos)
+
+    def obter_varios(self, chaves):
+        return self.armazem.obter_varios(self.nome, chaves)
+
+    def guardar_varios(self, chaves, valores):
+        self.armazem.guardar_varios(self.nome, chaves, valores, self.ttl_segundos)
+
+
+_armazem_padrao = None
+_trava_padrao = threading.Lock()
+
+
+def armazem_padrao():
+    """Armazém do processo em OBESIDADE_CACHE_DIR, ou None se o compartilhamento está desligado."""
+    global _armazem_padrao
+    if DIRETORIO_COMPARTILHADO is None:
+        return None
+    with _trava_padrao:
+        if _armazem_padrao is None:
+            _armazem_padrao = ArmazemCompartilhado(DIRETORIO_COMPARTILHADO)
+            metricas.registrar_estatisticas(
+                'cache_compartilhado', _armazem_padrao.estatisticas, 'Armazém compartilhado entre as réplicas do nó'
+            )
+        return _armazem_padrao
+
+
+def espaco_padrao(nome, ttl_segundos=None):
+    """Espaço `nome` no armazém do processo, ou None sem OBESIDADE_CACHE_DIR."""
+    armazem = armazem_padrao()
+    return None if armazem is None else armazem.espaco(nome, ttl_segundos)
@@ -0,0 +1,105 @@
+# ============================
+# 🖼️ Cache de Figuras — imagens renderizadas com LRU e teto de memória
+# ============================
+
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+from metricas import metricas
+
+# 🔒 pyplot mantém estado global: só uma thread desenha por vez
+_trava_desenho = threading.Lock()
+
+
+def renderizar_figura(fig, formato='png', dpi=200):
+    """Serializa a figura (mesmos parâmetros do `st.pyplot`) e libera a memória do matplotlib."""
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=formato, dpi=dpi, bbox_inches='tight')
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+class CacheFiguras:
+    """Guarda bytes PNG/SVG por chave (id do gráfico, versão dos dados, tema).
+
+    Despejo LRU quando o total ultrapassa `limite_bytes`; a figura mais recente é
+    sempre mantida, mesmo que sozinha exceda o limite. Com `compartilhado` (um
+    EspacoCompartilhado), as faltas locais consultam as figuras que outras réplicas já
+    desenharam antes de desenhar de novo.
+    """
+
+    def __init__(self, limite_bytes=64 * 1024 * 1024, formato='png', dpi=200, compartilhado=None):
+        self.limite_bytes = limite_bytes
+        self.formato = formato
+        self.dpi = dpi
+        self.compartilhado = compartilhado
+        self._itens = OrderedDict()
+        self._bytes = 0
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+        self.acertos_compartilhados = 0
+        self.despejos = 0
+
+    def __len__(self):
+        return len(self._itens)
+
+    @property
+    def bytes_em_uso(self):
+        return self._bytes
+
+    def obter(self, chave, desenhar):
+        """Devolve a imagem em cache ou chama `desenhar()` (que retorna uma Figure) e guarda."""
+        with self._trava:
+            imagem = self._itens.get(chave)
+            if imagem is not None:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return imagem
+            self.faltas += 1
+
+        chave_compartilhada = (chave, self.formato, self.dpi)
+        imagem = self.compartilhado.obter(chave_compartilhada) if self.compartilhado is not None else None
+        if imagem is not None:
+            with self._trava:
+                self.acertos_compartilhados += 1
+        else:
+            grafico = chave[0] if isinstance(chave, tuple) else chave
+            with _trava_desenho, matplotlib.rc_context(), metricas.medir('grafico', grafico=grafico):
+                imagem = renderizar_figura(desenhar(), self.formato, self.dpi)
+            if self.compartilhado is not None:
+                self.compartilhado.guardar(chave_compartilhada, imagem)
+
+        with self._trava:
+            if chave not in self._itens:
+                self._itens[chave] = imagem
+                self._bytes += len(imagem)
+                while self._bytes > self.limite_bytes and len(self._itens) > 1:
+                    _, antiga = self._itens.popitem(last=False)
+                    self._bytes -= len(antiga)
+                    self.despejos += 1
+        return imagem
+
+    def estatisticas(self):
+        with self._trava:
+            consultas = self.acertos + self.faltas
+            return {
+                'itens': len(self._itens),
+                'bytes': self._bytes,
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'acertos_compartilhados': self.acertos_compartilhados,
+                'despejos': self.despejos,
+                'taxa_acerto': self.acertos / consultas if consultas else 0.0
+            }
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
+            self._bytes = 0
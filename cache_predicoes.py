@@ -0,0 +1,91 @@
+# ============================
+# 🧠 Cache de Predições — LRU + TTL sobre o vetor de features já codificado
+# ============================
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachePredicoes:
+    """Memoiza rótulos previstos, chaveados pelos bytes do vetor codificado e escalado.
+
+    Seguro para acesso concorrente; uma instância por versão de modelo (o registro cria
+    uma nova a cada hot-swap, o que invalida tudo de uma vez). Com `compartilhado` (um
+    EspacoCompartilhado da mesma versão), as faltas locais são buscadas no armazém das
+    réplicas e tudo o que é guardado aqui também vai para lá.
+    """
+
+    def __init__(self, capacidade=10_000, ttl_segundos=3600.0, relogio=time.monotonic, compartilhado=None):
+        self.capacidade = capacidade
+        self.ttl_segundos = ttl_segundos
+        self._relogio = relogio
+        self.compartilhado = compartilhado
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+        self.acertos_compartilhados = 0
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter_varios(self, chaves, contar=True):
+        """Lista com o valor em cache de cada chave, ou None nas faltas/expiradas."""
+        agora = self._relogio()
+        resultados = []
+        with self._trava:
+            for chave in chaves:
+                item = self._itens.get(chave)
+                if item is not None and item[0] > agora:
+                    self._itens.move_to_end(chave)
+                    resultados.append(item[1])
+                    self.acertos += contar
+                else:
+                    if item is not None:
+                        del self._itens[chave]
+                    resultados.append(None)
+                    self.faltas += contar
+
+        faltas = [i for i, valor in enumerate(resultados) if valor is None]
+        if faltas and self.compartilhado is not None:
+            encontrados = self.compartilhado.obter_varios([chaves[i] for i in faltas])
+            achados = [(i, valor) for i, valor in zip(faltas, encontrados) if valor is not None]
+            if achados:
+                self._guardar_local([chaves[i] for i, _ in achados], [valor for _, valor in achados])
+                for i, valor in achados:
+                    resultados[i] = valor
+                with self._trava:
+                    self.acertos_compartilhados += contar * len(achados)
+                    self.acertos += contar * len(achados)
+                    self.faltas -= contar * len(achados)
+        return resultados
+
+    def guardar_varios(self, chaves, valores):
+        self._guardar_local(chaves, valores)
+        if self.compartilhado is not None:
+            self.compartilhado.guardar_varios(chaves, valores)
+
+    def _guardar_local(self, chaves, valores):
+        expira_em = self._relogio() + self.ttl_segundos
+        with self._trava:
+            for chave, valor in zip(chaves, valores):
+                self._itens[chave] = (expira_em, valor)
+                self._itens.move_to_end(chave)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+
+    def estatisticas(self):
+        with self._trava:
+            consultas = self.acertos + self.faltas
+            return {
+                'itens': len(self._itens),
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'acertos_compartilhados': self.acertos_compartilhados,
+                'taxa_acerto': self.acertos / consultas if consultas else 0.0
+            }
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
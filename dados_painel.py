@@ -0,0 +1,238 @@
+# ============================
+# 📊 Dados do Painel Analítico — leitura única com tipos compactos
+# ============================
+
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+
+from metricas import metricas
+from preditor import MAPA_COLUNAS_BRUTAS
+
+CAMINHO_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Obesity.csv')
+
+# 🗄️ Cache colunar (Feather/Arrow IPC) da visão traduzida; exige o pacote opcional pyarrow
+DIRETORIO_CACHE = os.environ.get(
+    'OBESIDADE_DADOS_CACHE_DIR', os.path.join(os.path.dirname(CAMINHO_CSV), '.cache_dados')
+)
+
+COLUNA_NIVEL = 'Obesity_Label'
+
+# ============================
+# 🧮 Tipos Compactos
+# ============================
+COLUNAS_CATEGORICAS_BRUTAS = [
+    'Gender', 'family_history', 'FAVC', 'CAEC', 'SMOKE', 'SCC', 'CALC', 'MTRANS', 'Obesity'
+]
+COLUNAS_NUMERICAS_BRUTAS = ['Age', 'Height', 'Weight', 'FCVC', 'NCP', 'CH2O', 'FAF', 'TUE']
+
+DTYPES_BRUTOS = {
+    **{col: 'category' for col in COLUNAS_CATEGORICAS_BRUTAS},
+    **{col: 'float32' for col in COLUNAS_NUMERICAS_BRUTAS}
+}
+
+# ============================
+# 🔠 Mapeamento de Labels
+# ============================
+ordem_obesidade = [
+    'Insufficient_Weight', 'Normal_Weight', 'Overweight_Level_I',
+    'Overweight_Level_II', 'Obesity_Type_I', 'Obesity_Type_II', 'Obesity_Type_III'
+]
+
+mapeamento_obesidade = {
+    'Insufficient_Weight': 'Abaixo do Peso',
+    'Normal_Weight': 'Peso Normal',
+    'Overweight_Level_I': 'Sobrepeso I',
+    'Overweight_Level_II': 'Sobrepeso II',
+    'Obesity_Type_I': 'Obesidade I',
+    'Obesity_Type_II': 'Obesidade II',
+    'Obesity_Type_III': 'Obesidade III'
+}
+
+ordem_rotulos_obesidade = [mapeamento_obesidade[k] for k in ordem_obesidade]
+
+_sim_nao = {'yes': 'Sim', 'no': 'Não'}
+_frequencia = {'no': 'Não', 'Sometimes': 'Às vezes', 'Frequently': 'Frequente', 'Always': 'Sempre'}
+
+ROTULOS_PAINEL = {
+    'genero': {'Male': 'Masculino', 'Female': 'Feminino'},
+    'historico_familiar': _sim_nao,
+    'consome_alta_calorias_frequente': _sim_nao,
+    'fuma': _sim_nao,
+    'monitora_calorias': _sim_nao,
+    'alimentacao_entre_refeicoes': _frequencia,
+    'freq_consumo_alcool': _frequencia,
+    'meio_transporte_contumaz': {
+        'Walking': 'Caminhada',
+        'Bike': 'Bicicleta',
+        'Public_Transportation': 'Transporte Público',
+        'Automobile': 'Automóvel',
+        'Motorbike': 'Moto'
+    }
+}
+
+
+def _por_ordem_de_aparicao(serie):
+    # Os gráficos ordenam categorias como os dados de origem (ordem de aparição),
+    # não em ordem alfabética como o `category` do read_csv.
+    return serie.cat.reorder_categories(list(serie.dropna().unique()))
+
+
+def _traduzir_categorias(serie, mapa):
+    # Tradução O(nº de categorias): só os rótulos mudam, os códigos são reaproveitados.
+    return serie.cat.rename_categories({k: v for k, v in mapa.items() if k in serie.cat.categories})
+
+
+# ============================
+# 📂 Carga
+# ============================
+def versao_arquivo(caminho=CAMINHO_CSV):
+    """Hash curto do conteúdo do CSV — identifica a versão dos dados nos caches."""
+    digest = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 24), b''):
+            digest.update(bloco)
+    return digest.hexdigest()[:12]
+
+
+def _versao_memorizada(caminho, diretorio):
+    # O hash de um CSV de GBs custa segundos: memoriza por (caminho, mtime, tamanho) e só
+    # recalcula quando o arquivo muda. A chave do cache continua sendo o conteúdo.
+    info = os.stat(caminho)
+    chave = f'{os.path.abspath(caminho)}|{info.st_mtime_ns}|{info.st_size}'
+    caminho_indice = os.path.join(diretorio, 'indice.json')
+    try:
+        with open(caminho_indice, encoding='utf-8') as arquivo:
+            indice = json.load(arquivo)
+    except (OSError, ValueError):
+        indice = {}
+    if chave not in indice:
+        indice = {k: v for k, v in indice.items() if not k.startswith(f'{os.path.abspath(caminho)}|')}
+        indice[chave] = versao_arquivo(caminho)
+        temporario = f'{caminho_indice}.{os.getpid()}.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(indice, arquivo)
+        os.replace(temporario, caminho_indice)
+    return indice[chave]
+
+
+def _com_nivel(colunas):
+    return list(dict.fromkeys([*colunas, COLUNA_NIVEL]))
+
+
+def _ler_csv(caminho, colunas=None):
+    # Visão traduzida direto do texto; com `colunas`, só elas (e o nível) são parseadas.
+    brutas = {destino: origem for origem, destino in MAPA_COLUNAS_BRUTAS.items()}
+    usecols = None
+    if colunas is not None:
+        usecols = [brutas[col] for col in colunas if col in brutas] + ['Obesity']
+    df = pd.read_csv(caminho, dtype=DTYPES_BRUTOS, usecols=usecols).rename(columns=MAPA_COLUNAS_BRUTAS)
+
+    for col in df.select_dtypes('category').columns:
+        df[col] = _por_ordem_de_aparicao(df[col])
+    for col, mapa in ROTULOS_PAINEL.items():
+        if col in df:
+            df[col] = _traduzir_categorias(df[col], mapa)
+
+    df[COLUNA_NIVEL] = _traduzir_categorias(df['nivel_obesidade'], mapeamento_obesidade)
+    return df if colunas is None else df[_com_nivel(colunas)]
+
+
+def ler_acrescimos(caminho, deslocamento, colunas=None):
+    """Linhas completas gravadas no CSV depois do byte `deslocamento`, já na visão traduzida.
+
+    Retorna (DataFrame ou None, novo deslocamento); uma última linha ainda sem quebra de
+    linha fica para a próxima leitura.
+    """
+    with open(caminho, 'rb') as arquivo:
+        cabecalho = arquivo.readline()
+        arquivo.seek(deslocamento)
+        bloco = arquivo.read()
+    fim = bloco.rfind(b'\n') + 1
+    if not bloco[:fim].strip():
+        return None, deslocamento + fim
+    return _ler_csv(io.BytesIO(cabecalho + bloco[:fim]), colunas), deslocamento + fim
+
+
+def ler_ate(caminho, tamanho, colunas=None):
+    """Linhas completas dos primeiros `tamanho` bytes do CSV, já na visão traduzida.
+
+    Retorna (DataFrame, deslocamento do fim da última linha completa), o ponto de partida
+    de `ler_acrescimos`.
+    """
+    with open(caminho, 'rb') as arquivo:
+        bloco = arquivo.read(tamanho)
+    fim = bloco.rfind(b'\n') + 1
+    df = _ler_csv(io.BytesIO(bloco[:fim]), colunas)
+    df.attrs['versao'] = hashlib.sha256(bloco[:fim]).hexdigest()[:12]
+    return df, fim
+
+
+def caminho_cache(caminho, versao, diretorio=DIRETORIO_CACHE):
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    return os.path.join(diretorio, f'{nome}_{versao}.feather')
+
+
+def construir_cache_colunar(caminho=CAMINHO_CSV, diretorio=DIRETORIO_CACHE, versao=None):
+    """Parseia o CSV uma vez e grava a visão traduzida em Feather, com categorias como dicionários.
+
+    Caches antigos do mesmo arquivo de origem são removidos. Retorna o caminho do cache.
+    """
+    import pyarrow.feather as feather
+
+    os.makedirs(diretorio, exist_ok=True)
+    versao = versao or _versao_memorizada(caminho, diretorio)
+    destino = caminho_cache(caminho, versao, diretorio)
+    # Sem compressão: o arquivo pode ser mapeado em memória e lido coluna a coluna
+    temporario = f'{destino}.{os.getpid()}.tmp'
+    feather.write_feather(_ler_csv(caminho), temporario, compression='uncompressed')
+    os.replace(temporario, destino)
+
+    prefixo = os.path.splitext(os.path.basename(caminho))[0] + '_'
+    for antigo in os.listdir(diretorio):
+        completo = os.path.join(diretorio, antigo)
+        if antigo.startswith(prefixo) and antigo.endswith('.feather') and completo != destino:
+            os.remove(completo)
+    return destino
+
+
+def carregar_dados_painel(caminho=CAMINHO_CSV, colunas=None, diretorio_cache=DIRETORIO_CACHE):
+    """Devolve a visão já traduzida usada pelas sub-abas; com `colunas`, só elas e o nível.
+
+    Todas as colunas nominais são `category` e as numéricas `float32`. Com pyarrow
+    instalado, a primeira leitura grava um cache Feather chaveado pelo hash do CSV e as
+    seguintes leem só as colunas pedidas do arquivo mapeado em memória; sem pyarrow (ou
+    com `diretorio_cache=None`) o CSV é parseado a cada chamada. O resultado é
+    compartilhado entre reruns e sessões: trate-o como somente leitura (com o
+    copy-on-write do pandas, qualquer alteração acidental gera uma cópia local).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+    except ImportError:
+        pa = None
+
+    if pa is None or diretorio_cache is None:
+        with metricas.medir('etapa', etapa='carga_dados_csv'):
+            df = _ler_csv(caminho, colunas)
+        df.attrs['versao'] = versao_arquivo(caminho)
+        return df
+
+    os.makedirs(diretorio_cache, exist_ok=True)
+    versao = _versao_memorizada(caminho, diretorio_cache)
+    destino = caminho_cache(caminho, versao, diretorio_cache)
+    if not os.path.exists(destino):
+        with metricas.medir('etapa', etapa='construcao_cache_colunar'):
+            construir_cache_colunar(caminho, diretorio_cache, versao)
+    # Leitura zero-copy do arquivo mapeado; só as páginas das colunas selecionadas são lidas
+    # (o feather.read_table com `columns` copiaria todas as colunas antes de filtrar)
+    with metricas.medir('etapa', etapa='carga_dados_colunar'):
+        tabela = ipc.open_file(pa.memory_map(destino)).read_all()
+        if colunas is not None:
+            tabela = tabela.select(_com_nivel(colunas))
+        df = tabela.to_pandas()
+    df.attrs['versao'] = versao
+    return df
@@ -0,0 +1,449 @@
+# ============================
+# 📐 Estatísticas do Painel — resumos incrementais que os gráficos leem no lugar das linhas
+# ============================
+
+import copy
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from agregacoes_painel import COLUNAS_CONTAGEM, TabelasContingencia
+from dados_painel import (
+    CAMINHO_CSV, COLUNA_NIVEL, DIRETORIO_CACHE, carregar_dados_painel, ler_acrescimos, ler_ate
+)
+
+# 📋 Variáveis dos histogramas (Distribuição Geral) e dos boxplots (Estilo de Vida)
+COLUNAS_HISTOGRAMA = ['altura', 'peso', 'idade']
+COLUNAS_BOXPLOT = ['consumo_vegetais', 'freq_atividade_fisica', 'qtde_agua_diaria']
+
+# 📏 Domínio fixo de cada variável: cobre os limites do formulário com folga; valores fora
+# dele caem no primeiro/último bin (mínimo e máximo exatos são guardados à parte)
+DOMINIOS = {
+    'altura': (1.0, 2.5),
+    'peso': (20.0, 250.0),
+    'idade': (0.0, 120.0),
+    'consumo_vegetais': (0.0, 5.0),
+    'freq_atividade_fisica': (0.0, 5.0),
+    'qtde_agua_diaria': (0.0, 5.0)
+}
+RESOLUCAO = 4096
+
+# 🎲 Amostra estratificada por nível (reservatório): enquanto nenhum nível passa da
+# capacidade, ela contém todas as linhas e os gráficos podem ser desenhados exatamente
+CAPACIDADE_AMOSTRA = int(os.environ.get('OBESIDADE_CAPACIDADE_AMOSTRA', '20000'))
+
+COLUNAS_ESTATISTICAS = COLUNAS_CONTAGEM + COLUNAS_HISTOGRAMA + COLUNAS_BOXPLOT
+
+# Bytes finais já lidos: detectam um CSV reescrito (e não só acrescido) entre atualizações
+TAMANHO_ASSINATURA = 4096
+
+# Formato do objeto gravado no espaço compartilhado: muda a chave quando o layout muda
+FORMATO_COMPARTILHADO = 2
+
+
+class ResumoNumerico:
+    """Histograma fino de largura fixa por nível, com mínimo, máximo, média e variância.
+
+    Serve de sketch de quantis com erro da ordem de uma largura de bin
+    ((máx − mín do domínio) / resolução) e é somável: ingerir N linhas novas custa
+    O(N) e não depende do que já foi visto. Cada atualização troca os arrays por novos
+    (em vez de alterá-los no lugar), então leitores concorrentes nunca veem meia soma.
+    """
+
+    def __init__(self, minimo, maximo, n_niveis, resolucao=RESOLUCAO):
+        self.minimo = float(minimo)
+        self.maximo = float(maximo)
+        self.resolucao = resolucao
+        self.largura = (self.maximo - self.minimo) / resolucao
+        self.contagens = np.zeros((n_niveis, resolucao), dtype='int64')
+        self.menor = np.full(n_niveis, np.inf)
+        self.maior = np.full(n_niveis, -np.inf)
+        self.n = np.zeros(n_niveis, dtype='int64')
+        self.media = np.zeros(n_niveis)
+        self.m2 = np.zeros(n_niveis)  # soma dos quadrados dos desvios (Welford/Chan)
+
+    @property
+    def centros(self):
+        return self.minimo + (np.arange(self.resolucao) + 0.5) * self.largura
+
+    # ============================
+    # ➕ Ingestão
+    # ============================
+    def _expandir(self, n_niveis):
+        faltam = n_niveis - len(self.n)
+        if faltam > 0:
+            self.contagens = np.pad(self.contagens, ((0, faltam), (0, 0)))
+            self.menor = np.pad(self.menor, (0, faltam), constant_values=np.inf)
+            self.maior = np.pad(self.maior, (0, faltam), constant_values=-np.inf)
+            self.n, self.media, self.m2 = (np.pad(a, (0, faltam)) for a in (self.n, self.media, self.m2))
+
+    def adicionar(self, valores, codigos_nivel, n_niveis):
+        """Soma `valores` (float) com seus códigos de nível (−1 = nível ausente)."""
+        self._expandir(n_niveis)
+        validos = np.isfinite(valores) & (codigos_nivel >= 0)
+        valores, codigos = valores[validos], codigos_nivel[validos]
+        if len(valores) == 0:
+            return
+
+        posicoes = np.clip(((valores - self.minimo) / self.largura).astype('int64'), 0, self.resolucao - 1)
+        novas = np.bincount(codigos * self.resolucao + posicoes, minlength=n_niveis * self.resolucao)
+        menor, maior = self.menor.copy(), self.maior.copy()
+        np.minimum.at(menor, codigos, valores)
+        np.maximum.at(maior, codigos, valores)
+
+        # Média e variância do bloco por nível, combinadas às acumuladas (Chan et al.)
+        n_bloco = np.bincount(codigos, minlength=n_niveis)
+        com_dados = n_bloco > 0
+        media_bloco = np.zeros(n_niveis)
+        media_bloco[com_dados] = np.bincount(codigos, valores, n_niveis)[com_dados] / n_bloco[com_dados]
+        m2_bloco = np.bincount(codigos, (valores - media_bloco[codigos]) ** 2, n_niveis)
+        n_total = self.n + n_bloco
+        delta = media_bloco - self.media
+        peso = np.divide(n_bloco, n_total, out=np.zeros(n_niveis), where=n_total > 0)
+        media = self.media + delta * peso
+        m2 = self.m2 + m2_bloco + delta ** 2 * self.n * peso
+
+        self.contagens = self.contagens + novas.reshape(n_niveis, self.resolucao)
+        self.menor, self.maior = menor, maior
+        self.n, self.media, self.m2 = n_total, media, m2
+
+    # ============================
+    # 📤 Consultas (nivel=None agrega todos os níveis)
+    # ============================
+    def _selecionar(self, nivel):
+        if nivel is None:
+            return (self.contagens.sum(axis=0), self.menor.min(), self.maior.max(),
+                    *self._momentos_combinados())
+        return (self.contagens[nivel], self.menor[nivel], self.maior[nivel],
+                self.n[nivel], self.media[nivel], self.m2[nivel])
+
+    def _momentos_combinados(self):
+        n = self.n.sum()
+        if n == 0:
+            return 0, 0.0, 0.0
+        media = (self.media * self.n).sum() / n
+        return n, media, self.m2.sum() + (self.n * (self.media - media) ** 2).sum()
+
+    def desvio_padrao(self, nivel=None):
+        _, _, _, n, _, m2 = self._selecionar(nivel)
+        return float(np.sqrt(m2 / (n - 1))) if n > 1 else 0.0
+
+    def limites(self, nivel=None):
+        """(mínimo, máximo) exatos observados."""
+        return self._selecionar(nivel)[1:3]
+
+    def banda(self, nivel=None):
+        """Banda do KDE pela regra de Scott (a do seaborn), sobre todas as linhas vistas."""
+        n = self._selecionar(nivel)[3]
+        return self.desvio_padrao(nivel) * n ** (-1 / 5) if n > 1 else 0.0
+
+    def quantis(self, qs, nivel=None):
+        """Quantis (interpolação linear, como `np.percentile`), com erro da ordem de um bin."""
+        contagens, menor, maior, n, _, _ = self._selecionar(nivel)
+        if n == 0:
+            return np.full(len(qs), np.nan)
+        acumulado = np.cumsum(contagens)
+        alvos = np.asarray(qs, dtype='float64') * (n - 1) + 0.5
+        bins = np.searchsorted(acumulado, alvos, side='left').clip(0, self.resolucao - 1)
+        anteriores = np.where(bins > 0, acumulado[bins - 1], 0)
+        fracao = (alvos - anteriores) / np.maximum(contagens[bins], 1)
+        valores = self.minimo + (bins + fracao) * self.largura
+        return np.clip(valores, menor, maior)
+
+    def estatisticas_boxplot(self, nivel=None, whis=1.5):
+        """Dict no formato de `matplotlib.cbook.boxplot_stats`, pronto para `ax.bxp`."""
+        contagens, menor, maior, n, media, _ = self._selecionar(nivel)
+        q1, mediana, q3 = self.quantis([0.25, 0.5, 0.75], nivel)
+        iqr = q3 - q1
+        cerca_baixa, cerca_alta = q1 - whis * iqr, q3 + whis * iqr
+        centros = np.clip(self.centros, menor, maior)
+        ocupados = centros[contagens > 0]
+        dentro = ocupados[(ocupados >= cerca_baixa) & (ocupados <= cerca_alta)]
+        bigode_baixo = menor if menor >= cerca_baixa else (dentro.min() if len(dentro) else q1)
+        bigode_alto = maior if maior <= cerca_alta else (dentro.max() if len(dentro) else q3)
+        # Um ponto por bin ocupado fora das cercas (visualmente igual a desenhar cada linha)
+        fora = ocupados[(ocupados < cerca_baixa) | (ocupados > cerca_alta)]
+        return {
+            'med': mediana, 'q1': q1, 'q3': q3, 'iqr': iqr, 'mean': media,
+            'whislo': bigode_baixo, 'whishi': bigode_alto, 'fliers': fora
+        }
+
+    def histograma(self, bins=20, nivel=None):
+        """(contagens, bordas) com `bins` bins iguais entre o mínimo e o máximo observados."""
+        contagens, menor, maior, n, _, _ = self._selecionar(nivel)
+        bordas = np.linspace(menor, maior, bins + 1) if n else np.linspace(self.minimo, self.maximo, bins + 1)
+        centros = np.clip(self.centros, bordas[0], bordas[-1])
+        return np.histogram(centros, bins=bordas, weights=contagens)[0], bordas
+
+    def densidade(self, pontos=200, nivel=None):
+        """KDE gaussiano (banda de Scott, como o seaborn) avaliado sobre os bins finos.
+
+        Devolve (suporte, densidade) entre o mínimo e o máximo observados; o custo é
+        O(pontos × bins ocupados), independente do número de linhas.
+        """
+        contagens, menor, maior, n, _, _ = self._selecionar(nivel)
+        suporte = np.linspace(menor, maior, pontos)
+        banda = self.banda(nivel)
+        if banda <= 0:
+            return suporte, np.zeros(pontos)
+        ocupados = contagens > 0
+        z = (suporte[:, None] - self.centros[ocupados][None, :]) / banda
+        densidade = (np.exp(-0.5 * z ** 2) @ contagens[ocupados]) / (n * banda * np.sqrt(2 * np.pi))
+        return suporte, densidade
+
+
+class AmostraEstratificada:
+    """Reservatório (algoritmo R) de até `capacidade` linhas por nível, vetorizado por lote.
+
+    Cada nível é amostrado de forma uniforme e independente; `pesos` (linhas vistas ÷
+    linhas guardadas no nível) devolvem a cada linha a proporção real do seu nível.
+    Como em ResumoNumerico, cada ingestão troca os arrays em vez de alterá-los no lugar.
+    """
+
+    def __init__(self, colunas, capacidade=CAPACIDADE_AMOSTRA, semente=0):
+        self.colunas = list(colunas)
+        self.capacidade = capacidade
+        self._gerador = np.random.default_rng(semente)
+        self.valores = np.empty((0, len(self.colunas)))
+        self.codigos = np.empty(0, dtype='int64')
+        self.vistos = np.zeros(0, dtype='int64')
+
+    @property
+    def completa(self):
+        """True enquanto a amostra guarda todas as linhas vistas."""
+        return bool((self.vistos <= self.capacidade).all())
+
+    def adicionar(self, valores, codigos_nivel, n_niveis):
+        """Ingere `valores` (linhas × colunas) com seus códigos de nível (−1 = ausente)."""
+        self.vistos = np.pad(self.vistos, (0, max(0, n_niveis - len(self.vistos))))
+        validos = codigos_nivel >= 0
+        valores, codigos_nivel = valores[validos], codigos_nivel[validos]
+        blocos_valores, blocos_codigos = [], []
+        vistos = self.vistos.copy()
+        for nivel in np.unique(codigos_nivel):
+            novos = valores[codigos_nivel == nivel]
+            atuais = self.valores[self.codigos == nivel]
+            vagas = max(0, self.capacidade - len(atuais))
+            atuais = np.concatenate([atuais, novos[:vagas]])
+            if len(novos) > vagas:
+                # Linha de índice global i substitui a posição j ~ U[0, i] se j < capacidade;
+                # a atribuição em ordem mantém a semântica sequencial do algoritmo R
+                indices = vistos[nivel] + np.arange(vagas, len(novos))
+                sorteios = (self._gerador.random(len(indices)) * (indices + 1)).astype('int64')
+                aceitos = sorteios < self.capacidade
+                atuais[sorteios[aceitos]] = novos[vagas:][aceitos]
+            vistos[nivel] += len(novos)
+            blocos_valores.append(atuais)
+            blocos_codigos.append(np.full(len(atuais), nivel, dtype='int64'))
+        if not blocos_valores:
+            return
+        mantidos = ~np.isin(self.codigos, np.unique(codigos_nivel))
+        self.valores = np.concatenate([self.valores[mantidos], *blocos_valores])
+        self.codigos = np.concatenate([self.codigos[mantidos], *blocos_codigos])
+        self.vistos = vistos
+
+    @property
+    def pesos(self):
+        guardados = np.bincount(self.codigos, minlength=len(self.vistos))
+        return (self.vistos / np.maximum(guardados, 1))[self.codigos]
+
+    def dataframe(self, niveis, coluna_nivel=COLUNA_NIVEL):
+        """A amostra como DataFrame no formato do painel (colunas + rótulo do nível)."""
+        df = pd.DataFrame(self.valores, columns=self.colunas)
+        df[coluna_nivel] = pd.Categorical.from_codes(self.codigos, categories=niveis)
+        return df
+
+    def densidade(self, coluna, suporte, banda):
+        """KDE gaussiano ponderado da amostra em `suporte`: O(pontos × amostra)."""
+        valores = self.valores[:, self.colunas.index(coluna)]
+        pesos = self.pesos
+        finitos = np.isfinite(valores)
+        valores, pesos = valores[finitos], pesos[finitos]
+        if banda <= 0 or len(valores) == 0:
+            return np.zeros(len(suporte))
+        densidade = np.zeros(len(suporte))
+        for inicio in range(0, len(valores), 8192):  # blocos limitam a matriz pontos × amostra
+            z = (suporte[:, None] - valores[None, inicio:inicio + 8192]) / banda
+            densidade += np.exp(-0.5 * z ** 2) @ pesos[inicio:inicio + 8192]
+        return densidade / (pesos.sum() * banda * np.sqrt(2 * np.pi))
+
+
+class RetratoEstatisticas:
+    """Tabelas, resumos, amostra e versão de um mesmo instante da base, trocados juntos.
+
+    Nada aqui muda depois de montado: quem desenha a partir de um retrato usa a versão
+    dele como chave do cache de figuras e nunca mistura dados de duas ingestões.
+    """
+
+    def __init__(self, tabelas, resumos, amostra, versao_base):
+        self.tabelas = tabelas
+        self.resumos = resumos
+        self.amostra = amostra
+        self.total_linhas = tabelas.total_linhas
+        self.versao = f'{versao_base}+{self.total_linhas}'
+
+    @property
+    def niveis(self):
+        return self.tabelas.niveis
+
+
+class EstatisticasPainel:
+    """Contagens por nível e categoria, histogramas e sketches de quantis da base do painel.
+
+    Monta tudo uma vez a partir do CSV (ou do cache colunar) e depois `atualizar()` lê
+    só as linhas acrescentadas ao arquivo desde a última leitura. Cada ingestão monta um
+    `RetratoEstatisticas` novo e o troca por atribuição: leia `retrato` uma vez e desenhe
+    a partir dele. O objeto é serializável (pickle), o que permite às réplicas partirem
+    das estatísticas que outra já montou.
+    """
+
+    def __init__(self, df, coluna_nivel=COLUNA_NIVEL, resolucao=RESOLUCAO, capacidade_amostra=CAPACIDADE_AMOSTRA):
+        self.coluna_nivel = coluna_nivel
+        tabelas = TabelasContingencia(df, coluna_nivel=coluna_nivel)
+        resumos = {
+            col: ResumoNumerico(*DOMINIOS[col], len(tabelas.niveis), resolucao)
+            for col in COLUNAS_HISTOGRAMA + COLUNAS_BOXPLOT if col in df
+        }
+        amostra = AmostraEstratificada(resumos, capacidade_amostra)
+        self._adicionar_resumos(df, tabelas.niveis, resumos, amostra)
+        self.versao_base = df.attrs.get('versao')
+        self.retrato = RetratoEstatisticas(tabelas, resumos, amostra, self.versao_base)
+        self.caminho = None
+        self.deslocamento = None
+        self._assinatura = None
+        self._trava = threading.Lock()
+
+    # Atalhos para o retrato atual; leituras separadas podem cair em retratos diferentes
+    @property
+    def tabelas(self):
+        return self.retrato.tabelas
+
+    @property
+    def resumos(self):
+        return self.retrato.resumos
+
+    @property
+    def amostra(self):
+        return self.retrato.amostra
+
+    @property
+    def niveis(self):
+        return self.retrato.niveis
+
+    @property
+    def total_linhas(self):
+        return self.retrato.total_linhas
+
+    @property
+    def versao(self):
+        """Muda a cada ingestão: serve de chave para o cache de figuras."""
+        return self.retrato.versao
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        del estado['_trava']
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._trava = threading.Lock()
+
+    @classmethod
+    def de_csv(cls, caminho=CAMINHO_CSV, diretorio_cache=DIRETORIO_CACHE, compartilhado=None):
+        """Estatísticas do CSV. Com `compartilhado` (EspacoCompartilhado), parte do último
+        retrato gravado por outra réplica e lê só o que o arquivo ganhou desde então."""
+        if compartilhado is not None:
+            estatisticas = compartilhado.obter(_chave_compartilhada(caminho))
+            if estatisticas is not None:
+                novas = estatisticas.atualizar()
+                if novas is not None:
+                    if novas:
+                        estatisticas.publicar(compartilhado)
+                    return estatisticas
+
+        # 📏 O deslocamento é o tamanho anotado antes da leitura; se o arquivo mudou durante a
+        # carga (ou termina no meio de uma linha), relê só até ali e atualizar() pega o resto
+        antes = os.stat(caminho)
+        df = carregar_dados_painel(caminho, colunas=COLUNAS_ESTATISTICAS, diretorio_cache=diretorio_cache)
+        depois = os.stat(caminho)
+        deslocamento = antes.st_size
+        if (depois.st_size, depois.st_mtime_ns) != (antes.st_size, antes.st_mtime_ns) \
+                or not _termina_em_linha(caminho, antes.st_size):
+            df, deslocamento = ler_ate(caminho, antes.st_size, COLUNAS_ESTATISTICAS)
+        estatisticas = cls(df)
+        estatisticas.caminho = caminho
+        estatisticas.deslocamento = deslocamento
+        estatisticas._assinatura = _assinatura(caminho, deslocamento)
+        estatisticas.publicar(compartilhado)
+        return estatisticas
+
+    def publicar(self, compartilhado):
+        """Grava este retrato no espaço compartilhado (None: nada a fazer), para que as outras
+        réplicas partam dele. Serializa sob a trava: nunca no meio de uma ingestão."""
+        if compartilhado is None or self.caminho is None:
+            return
+        with self._trava:
+            compartilhado.guardar(_chave_compartilhada(self.caminho), self)
+
+    # ============================
+    # ➕ Ingestão
+    # ============================
+    def _adicionar_resumos(self, df_novo, niveis, resumos, amostra):
+        codigos = pd.Categorical(df_novo[self.coluna_nivel], categories=niveis).codes.astype('int64')
+        for col, resumo in resumos.items():
+            resumo.adicionar(df_novo[col].to_numpy(dtype='float64'), codigos, len(niveis))
+        amostra.adicionar(df_novo[list(resumos)].to_numpy(dtype='float64'), codigos, len(niveis))
+
+    def _ingerir(self, df_novo):
+        # Cópias rasas bastam: as ingestões trocam os arrays em vez de alterá-los no lugar,
+        # então o retrato atual continua intacto até a troca no fim (feita sob a trava)
+        atual = self.retrato
+        tabelas = copy.copy(atual.tabelas)
+        tabelas.adicionar(df_novo)  # anexa níveis novos antes dos resumos
+        resumos = {col: copy.copy(resumo) for col, resumo in atual.resumos.items()}
+        amostra = copy.copy(atual.amostra)
+        self._adicionar_resumos(df_novo, tabelas.niveis, resumos, amostra)
+        self.retrato = RetratoEstatisticas(tabelas, resumos, amostra, self.versao_base)
+
+    def adicionar(self, df_novo):
+        """Ingere novas linhas (visão traduzida do painel) em O(linhas novas)."""
+        if len(df_novo) == 0:
+            return
+        with self._trava:
+            self._ingerir(df_novo)
+
+    def atualizar(self):
+        """Ingere as linhas acrescentadas ao CSV. Retorna o nº de linhas novas, ou None se
+        o arquivo foi reescrito (e não só acrescido) — aí é preciso reconstruir do zero."""
+        if self.caminho is None:
+            return 0
+        with self._trava:
+            tamanho = os.path.getsize(self.caminho)
+            if tamanho == self.deslocamento:
+                return 0
+            if tamanho < self.deslocamento or _assinatura(self.caminho, self.deslocamento) != self._assinatura:
+                return None
+            df_novo, deslocamento = ler_acrescimos(self.caminho, self.deslocamento, COLUNAS_ESTATISTICAS)
+            if df_novo is not None and len(df_novo):
+                self._ingerir(df_novo)
+            self.deslocamento = deslocamento
+            self._assinatura = _assinatura(self.caminho, deslocamento)
+            return 0 if df_novo is None else len(df_novo)
+
+
+def _chave_compartilhada(caminho):
+    return ('estatisticas', FORMATO_COMPARTILHADO, os.path.abspath(caminho))
+
+
+def _termina_em_linha(caminho, tamanho):
+    with open(caminho, 'rb') as arquivo:
+        arquivo.seek(max(0, tamanho - 1))
+        return arquivo.read(1) == b'\n'
+
+
+def _assinatura(caminho, ate):
+    with open(caminho, 'rb') as arquivo:
+        arquivo.seek(max(0, ate - TAMANHO_ASSINATURA))
+        return arquivo.read(min(ate, TAMANHO_ASSINATURA))
@@ -0,0 +1,184 @@
+# ============================
+# 📈 Gráficos do Painel Analítico — cada função devolve uma Figure pronta
+# ============================
+
+import colorsys
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+from matplotlib.patches import Patch
+
+from dados_painel import mapeamento_obesidade, ordem_obesidade
+
+# 🧮 Modo dos histogramas/boxplots: 'auto' desenha com o seaborn sobre as linhas enquanto a
+# amostra estratificada ainda contém a base inteira e, acima disso, a partir dos resumos
+# binados; 'binado' usa sempre os resumos
+MODO_GRAFICOS = os.environ.get('OBESIDADE_MODO_GRAFICOS', 'auto')
+# 〰️ KDE do modo binado: 'grade' (sobre os bins finos) ou 'amostra' (amostra estratificada)
+KDE_BINADO = os.environ.get('OBESIDADE_KDE', 'grade')
+
+
+def distribuicao_niveis(tabelas):
+    fig, ax = plt.subplots(figsize=(6, 4))
+    contagem = tabelas.contagem_niveis().reindex(
+        [mapeamento_obesidade[k] for k in ordem_obesidade]
+    )
+    sns.barplot(x=contagem.values, y=contagem.index, color='red', ax=ax)
+    ax.set_title('Distribuição dos Níveis de Obesidade', fontsize=12, fontweight='bold')
+    ax.set_xlabel('Quantidade', fontsize=9)
+    ax.set_ylabel('Nível de Obesidade', fontsize=9)
+    ax.tick_params(axis='both', labelsize=8)
+    return fig
+
+
+def histograma(df, coluna, cor, titulo, rotulo_x):
+    fig, ax = plt.subplots(figsize=(4, 3))
+    sns.histplot(df[coluna], kde=True, bins=20, color=cor, ax=ax)
+    ax.set_title(titulo, fontsize=12, fontweight='bold')
+    ax.set_xlabel(rotulo_x, fontsize=9)
+    ax.set_ylabel('Frequência', fontsize=9)
+    ax.tick_params(axis='both', labelsize=8)
+    return fig
+
+
+def boxplot_por_nivel(df, coluna, titulo, rotulo_y):
+    fig, ax = plt.subplots(figsize=(4, 3))
+    sns.boxplot(
+        data=df,
+        x='Obesity_Label',
+        y=coluna,
+        palette='Reds',
+        order=[mapeamento_obesidade[k] for k in ordem_obesidade],
+        ax=ax
+    )
+    ax.set_title(titulo, fontsize=12, fontweight='bold')
+    ax.set_xlabel('Nível de Obesidade', fontsize=9)
+    ax.set_ylabel(rotulo_y, fontsize=9)
+    ax.tick_params(axis='both', labelsize=8)
+    plt.xticks(rotation=45)
+    return fig
+
+
+def histograma_de_resumo(resumo, cor, titulo, rotulo_x, bins=20, densidade=None):
+    """O mesmo gráfico de `histograma`, desenhado a partir de um ResumoNumerico.
+
+    `densidade` (suporte, valores) substitui o KDE sobre os bins finos do resumo.
+    """
+    contagens, bordas = resumo.histograma(bins)
+    fig, ax = plt.subplots(figsize=(4, 3))
+    sns.histplot(
+        x=(bordas[:-1] + bordas[1:]) / 2, weights=contagens,
+        bins=len(contagens), binrange=(bordas[0], bordas[-1]), color=cor, alpha=.5, ax=ax
+    )
+    # KDE na escala das contagens, como o `kde=True` do seaborn (densidade × área das barras;
+    # com kde=True o seaborn também usa alpha 0,5 nas barras)
+    suporte, densidade = densidade if densidade is not None else resumo.densidade()
+    ax.plot(suporte, densidade * contagens.sum() * (bordas[1] - bordas[0]), color=cor)
+    ax.set_title(titulo, fontsize=12, fontweight='bold')
+    ax.set_xlabel(rotulo_x, fontsize=9)
+    ax.set_ylabel('Frequência', fontsize=9)
+    ax.tick_params(axis='both', labelsize=8)
+    return fig
+
+
+def boxplot_de_resumo(resumo, niveis, titulo, rotulo_y):
+    """O mesmo gráfico de `boxplot_por_nivel`, com as caixas vindas dos quantis do resumo."""
+    ordem = [mapeamento_obesidade[k] for k in ordem_obesidade]
+    paleta = sns.color_palette('Reds', n_colors=len(ordem))
+    # Cores como o sns.boxplot: saturação 0,75 no preenchimento e linhas cinza escuro
+    luminancia = min(colorsys.rgb_to_hls(*cor)[1] for cor in paleta) * .6
+    cor_linha = (luminancia, luminancia, luminancia)
+
+    fig, ax = plt.subplots(figsize=(4, 3))
+    for posicao, (rotulo, cor) in enumerate(zip(ordem, paleta)):
+        if rotulo not in niveis or resumo.n[niveis.index(rotulo)] == 0:
+            continue
+        ax.bxp(
+            [resumo.estatisticas_boxplot(niveis.index(rotulo))], positions=[posicao],
+            widths=.8, capwidths=.4, patch_artist=True, manage_ticks=False,
+            boxprops={'facecolor': sns.desaturate(cor, .75), 'edgecolor': cor_linha},
+            medianprops={'color': cor_linha, 'solid_capstyle': 'butt'},
+            whiskerprops={'color': cor_linha, 'solid_capstyle': 'butt'},
+            capprops={'color': cor_linha},
+            flierprops={'markeredgecolor': cor_linha, 'markersize': 5}
+        )
+    ax.set_xticks(np.arange(len(ordem)), ordem)
+    ax.set_xlim(-.5, len(ordem) - .5)
+    ax.set_title(titulo, fontsize=12, fontweight='bold')
+    ax.set_xlabel('Nível de Obesidade', fontsize=9)
+    ax.set_ylabel(rotulo_y, fontsize=9)
+    ax.tick_params(axis='both', labelsize=8)
+    plt.xticks(rotation=45)
+    return fig
+
+
+def _exato(estatisticas, modo):
+    return modo == 'auto' and estatisticas.amostra.completa
+
+
+def histograma_painel(estatisticas, coluna, cor, titulo, rotulo_x, modo=MODO_GRAFICOS, kde=KDE_BINADO):
+    """Histograma com KDE pelo caminho que cabe no tamanho da base (ver MODO_GRAFICOS)."""
+    if _exato(estatisticas, modo):
+        return histograma(estatisticas.amostra.dataframe(estatisticas.niveis), coluna, cor, titulo, rotulo_x)
+    resumo = estatisticas.resumos[coluna]
+    densidade = None
+    if kde == 'amostra':
+        suporte = np.linspace(*resumo.limites(), 200)
+        densidade = suporte, estatisticas.amostra.densidade(coluna, suporte, resumo.banda())
+    return histograma_de_resumo(resumo, cor, titulo, rotulo_x, densidade=densidade)
+
+
+def boxplot_painel(estatisticas, coluna, titulo, rotulo_y, modo=MODO_GRAFICOS):
+    """Boxplot por nível pelo caminho que cabe no tamanho da base (ver MODO_GRAFICOS)."""
+    if _exato(estatisticas, modo):
+        return boxplot_por_nivel(estatisticas.amostra.dataframe(estatisticas.niveis), coluna, titulo, rotulo_y)
+    return boxplot_de_resumo(estatisticas.resumos[coluna], estatisticas.niveis, titulo, rotulo_y)
+
+
+def contagem_por_nivel(tabelas, coluna, titulo, rotulo_x=None, figsize=(4, 3)):
+    """Barras agrupadas por nível; sem `rotulo_x`, oculta o eixo X e gira os rótulos."""
+    fig, ax = plt.subplots(figsize=figsize)
+    sns.barplot(
+        data=tabelas.tabela(coluna),
+        x=coluna,
+        y='quantidade',
+        hue='Obesity_Label',
+        palette='Reds',
+        hue_order=[mapeamento_obesidade[k] for k in ordem_obesidade],
+        errorbar=None,
+        ax=ax
+    )
+    ax.set_title(titulo, fontsize=12, fontweight='bold')
+    ax.set_ylabel('Quantidade', fontsize=9)
+    ax.tick_params(axis='both', labelsize=8)
+    if rotulo_x is None:
+        ax.set_xlabel('')
+        plt.xticks(rotation=45)
+    else:
+        ax.set_xlabel(rotulo_x, fontsize=9)
+    ax.get_legend().remove()
+    return fig
+
+
+def legenda_niveis():
+    # 🔸 Legenda única
+    cores = sns.color_palette("Reds", n_colors=7)
+    legenda_patches = [
+        Patch(color=cores[i], label=mapeamento_obesidade[k])
+        for i, k in enumerate(ordem_obesidade)
+    ]
+
+    fig, ax = plt.subplots(figsize=(6, 1))
+    ax.axis('off')
+    ax.legend(
+        handles=legenda_patches,
+        title='Nível de Obesidade',
+        loc='center',
+        ncol=4,
+        fontsize=8,
+        title_fontsize=9,
+        frameon=False
+    )
+    return fig
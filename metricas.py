@@ -0,0 +1,209 @@
+# ============================
+# 📈 Métricas — temporizadores, contadores e medidores em texto Prometheus
+# ============================
+
+import bisect
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# 🔌 OBESIDADE_METRICAS=0 desliga toda a instrumentação (os pontos de medição viram no-op)
+ATIVO_PADRAO = os.environ.get('OBESIDADE_METRICAS', '1') != '0'
+PREFIXO = 'obesidade_'
+
+# ⏱️ Limites dos buckets de latência, em segundos
+BUCKETS_SEGUNDOS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_NULO = nullcontext()
+
+
+class _Temporizador:
+    # Classe com __slots__ em vez de @contextmanager: ~5x mais barata por medição
+    __slots__ = ('metricas', 'chave', 'inicio')
+
+    def __init__(self, metricas, chave):
+        self.metricas = metricas
+        self.chave = chave
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        self.metricas._acumular(self.chave, time.perf_counter() - self.inicio)
+
+
+def _chave(nome, rotulos):
+    # A ordem dos rótulos não pode criar séries distintas; com um rótulo só, dispensa o sort
+    itens = tuple(rotulos.items())
+    return (nome, itens if len(itens) < 2 else tuple(sorted(itens)))
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _rotulos(rotulos):
+    if not rotulos:
+        return ''
+    return '{' + ','.join(f'{chave}="{_escapar(valor)}"' for chave, valor in rotulos) + '}'
+
+
+def memoria_processo():
+    """RSS atual em bytes (psutil) ou, sem psutil, o pico de RSS do processo; None se indisponível."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        import resource
+        import sys
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico if sys.platform == 'darwin' else pico * 1024
+    except ImportError:
+        return None
+
+
+class Metricas:
+    """Registro de métricas do processo, seguro para várias threads.
+
+    - `medir(nome, **rotulos)`: temporizador (histograma em segundos) como context manager;
+    - `incrementar(nome, valor, **rotulos)`: contador monotônico;
+    - `registrar_medidor(nome, funcao, ajuda)`: valor lido só na exportação; `funcao()`
+      devolve um número, ou um dict {rótulos (tupla de pares) ou None: número}.
+
+    Com `ativo=False` nada é registrado e `medir` devolve um context manager vazio.
+    """
+
+    def __init__(self, ativo=ATIVO_PADRAO, buckets=BUCKETS_SEGUNDOS):
+        self.ativo = ativo
+        self.buckets = tuple(buckets)
+        self._trava = threading.Lock()
+        self._contadores = {}
+        self._histogramas = {}
+        self._medidores = {}
+        self._ajudas = {}
+
+    # ============================
+    # 📝 Registro
+    # ============================
+    def _acumular(self, chave, segundos):
+        indice = bisect.bisect_left(self.buckets, segundos)
+        with self._trava:
+            histograma = self._histogramas.get(chave)
+            if histograma is None:
+                # contagens por bucket (+Inf no fim), soma e total
+                histograma = self._histogramas[chave] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histograma[0][indice] += 1
+            histograma[1] += segundos
+            histograma[2] += 1
+
+    def observar(self, nome, segundos, **rotulos):
+        if self.ativo:
+            self._acumular(_chave(nome, rotulos), segundos)
+
+    def medir(self, nome, **rotulos):
+        if not self.ativo:
+            return _NULO
+        return _Temporizador(self, _chave(nome, rotulos))
+
+    def incrementar(self, nome, valor=1, **rotulos):
+        if not self.ativo:
+            return
+        chave = _chave(nome, rotulos)
+        with self._trava:
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def registrar_medidor(self, nome, funcao, ajuda=None):
+        """Registra (ou substitui) um medidor calculado na hora da exportação."""
+        with self._trava:
+            self._medidores[nome] = funcao
+            if ajuda:
+                self._ajudas[nome] = ajuda
+
+    def registrar_estatisticas(self, nome, funcao, ajuda=None):
+        """Medidor a partir de um dict de estatísticas (ex.: `cache.estatisticas()`), um rótulo por chave."""
+        def medidor():
+            estatisticas = funcao()
+            if estatisticas is None:
+                return None
+            return {(('estatistica', chave),): valor for chave, valor in estatisticas.items()}
+        self.registrar_medidor(nome, medidor, ajuda)
+
+    def descrever(self, nome, ajuda):
+        """Texto de ajuda (# HELP) de um temporizador ou contador."""
+        self._ajudas[nome] = ajuda
+
+    def limpar(self):
+        with self._trava:
+            self._contadores.clear()
+            self._histogramas.clear()
+
+    # ============================
+    # 📤 Exportação
+    # ============================
+    def resumo(self):
+        """Temporizadores agregados: {(nome, rótulos): (chamadas, total_s, média_ms)}."""
+        with self._trava:
+            return {
+                chave: (total, soma, soma / total * 1000 if total else 0.0)
+                for chave, (_, soma, total) in self._histogramas.items()
+            }
+
+    def exportar_prometheus(self):
+        """Todas as métricas no formato de exposição em texto do Prometheus (0.0.4)."""
+        with self._trava:
+            contadores = sorted(self._contadores.items())
+            histogramas = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._histogramas.items())
+            medidores = sorted(self._medidores.items())
+
+        linhas = []
+        cabecalhos = set()
+
+        def cabecalho(nome, tipo):
+            if nome not in cabecalhos:
+                cabecalhos.add(nome)
+                base = nome[len(PREFIXO):]
+                if base in self._ajudas:
+                    linhas.append(f'# HELP {nome} {self._ajudas[base]}')
+                linhas.append(f'# TYPE {nome} {tipo}')
+
+        for (nome, rotulos), valor in contadores:
+            completo = f'{PREFIXO}{nome}_total'
+            cabecalho(completo, 'counter')
+            linhas.append(f'{completo}{_rotulos(rotulos)} {valor}')
+
+        for (nome, rotulos), (contagens, soma, total) in histogramas:
+            completo = f'{PREFIXO}{nome}_segundos'
+            cabecalho(completo, 'histogram')
+            acumulado = 0
+            for limite, contagem in zip(self.buckets + ('+Inf',), contagens):
+                acumulado += contagem
+                linhas.append(f'{completo}_bucket{_rotulos(rotulos + (("le", limite),))} {acumulado}')
+            linhas.append(f'{completo}_sum{_rotulos(rotulos)} {soma:.9g}')
+            linhas.append(f'{completo}_count{_rotulos(rotulos)} {total}')
+
+        for nome, funcao in medidores:
+            try:
+                valores = funcao()
+            except Exception:
+                continue  # um medidor quebrado não derruba a exportação
+            if valores is None:
+                continue
+            if not isinstance(valores, dict):
+                valores = {None: valores}
+            completo = f'{PREFIXO}{nome}'
+            cabecalho(completo, 'gauge')
+            for rotulos, valor in valores.items():
+                if valor is not None:
+                    linhas.append(f'{completo}{_rotulos(rotulos or ())} {float(valor):.9g}')
+        return '\n'.join(linhas) + '\n'
+
+
+# 🌍 Instância única do processo, compartilhada por app, serviço HTTP e scripts
+metricas = Metricas()
+metricas.registrar_medidor('memoria_rss_bytes', memoria_processo, 'Memória residente do processo')
+metricas.descrever('etapa_segundos', 'Duração de cada etapa de carga, pré-processamento e inferência')
+metricas.descrever('grafico_segundos', 'Desenho + serialização de cada gráfico do painel (faltas do cache)')
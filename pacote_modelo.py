@@ -0,0 +1,211 @@
+# ============================
+# 📦 Pacote do Modelo — arquivo único versionado, mapeado em memória somente leitura
+# Uso: python pacote_modelo.py [--modelo-dir . --saida modelo.obpkg]
+# ============================
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from arvores_compiladas import ArvoresCompiladas, ArvoresReduzidas
+from preprocessamento_fundido import PreprocessadorFundido
+
+# 🧾 Layout: MAGICA | tamanho do cabeçalho (uint32 LE) | cabeçalho JSON | arrays alinhados
+MAGICA = b'OBESPKG\x00'
+VERSAO_FORMATO = 1
+VERSAO_FORMATO_REDUZIDO = 2  # árvores de ArvoresReduzidas (ver reduzir_modelo.py)
+ALINHAMENTO = 64
+EXTENSAO = '.obpkg'
+
+ARRAYS_ARVORES = ('feature', 'limiar', 'valor_folha', 'valor_no', 'inicios_classes', 'bordas', 'inicios_bordas')
+
+
+class ErroPacote(ValueError):
+    """Pacote truncado, corrompido ou de uma versão de formato desconhecida."""
+
+
+def _alinhar(posicao):
+    return -(-posicao // ALINHAMENTO) * ALINHAMENTO
+
+
+# ============================
+# 💾 Escrita
+# ============================
+def salvar_pacote(caminho, arvores, preprocessador, classes, versao_modelo, reducao=None):
+    """Grava o pacote de forma atômica (arquivo temporário + os.replace).
+
+    `reducao` descreve uma variante reduzida (estágios, limiares, paridade com o modelo
+    completo); o registro a confere antes de servir a variante.
+    """
+    reduzidas = isinstance(arvores, ArvoresReduzidas)
+    arrays = {
+        nome: np.ascontiguousarray(getattr(arvores, nome))
+        for nome in ARRAYS_ARVORES if getattr(arvores, nome, None) is not None
+    }
+    descritores, deslocamento = {}, 0
+    for nome, array in arrays.items():
+        descritores[nome] = {
+            'deslocamento': deslocamento, 'dtype': array.dtype.str, 'forma': list(array.shape)
+        }
+        deslocamento = _alinhar(deslocamento + array.nbytes)
+
+    dados = bytearray(deslocamento)
+    for nome, array in arrays.items():
+        inicio = descritores[nome]['deslocamento']
+        dados[inicio:inicio + array.nbytes] = array.tobytes()
+
+    cabecalho = {
+        'versao_formato': VERSAO_FORMATO_REDUZIDO if reduzidas else VERSAO_FORMATO,
+        'versao_modelo': versao_modelo,
+        'sha256': hashlib.sha256(dados).hexdigest(),
+        'tamanho_dados': len(dados),
+        'features': preprocessador.features,
+        'classes': [str(c) for c in classes],
+        'arvores': {
+            'tipo': 'reduzidas' if reduzidas else 'compiladas',
+            'n_estagios': arvores.n_estagios,
+            'n_classes': arvores.n_classes,
+            'taxa_aprendizado': arvores.taxa_aprendizado,
+            'decisao_inicial': arvores.decisao_inicial.tolist(),
+            'arrays': descritores
+        },
+        'preprocessamento': {
+            'categorias': preprocessador.categorias,
+            'codigos': {col: codigos.tolist() for col, codigos in preprocessador.codigos.items()},
+            'medias': preprocessador.medias,
+            'escalas': preprocessador.escalas
+        },
+        'reducao': reducao
+    }
+    bruto = json.dumps(cabecalho, ensure_ascii=False).encode('utf-8')
+    inicio_dados = _alinhar(len(MAGICA) + 4 + len(bruto))
+
+    temporario = f'{caminho}.tmp'
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(MAGICA + struct.pack('<I', len(bruto)) + bruto)
+        arquivo.write(b'\x00' * (inicio_dados - arquivo.tell()))
+        arquivo.write(dados)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def converter_artefatos(diretorio, caminho):
+    """Gera o pacote a partir dos cinco artefatos joblib (apenas GradientBoostingClassifier)."""
+    # Import local: só o conversor precisa do sklearn para ler os pickles
+    from registro_modelos import carregar_versao
+
+    versao = carregar_versao(diretorio, backend='compilado', variante='')
+    preditor = versao.preditor
+    return salvar_pacote(caminho, preditor.motor, preditor.preprocessador, preditor.classes, versao.versao)
+
+
+# ============================
+# 📖 Leitura Mapeada
+# ============================
+class PacoteModelo:
+    """Pacote aberto: as árvores apontam direto para as páginas do arquivo mapeado.
+
+    Os arrays são somente leitura e vêm do page cache do sistema; processos que mapeiam
+    o mesmo arquivo compartilham uma única cópia física das árvores.
+    """
+
+    def __init__(self, caminho, cabecalho, mapa, inicio_dados):
+        self.caminho = caminho
+        self.cabecalho = cabecalho
+        self.versao = cabecalho['versao_modelo']
+        self.features = cabecalho['features']
+        self.classes = np.array(cabecalho['classes'], dtype=object)
+        self.reducao = cabecalho.get('reducao')
+        self._mapa = mapa
+
+        meta = cabecalho['arvores']
+        arrays = {}
+        for nome, descritor in meta['arrays'].items():
+            dtype = np.dtype(descritor['dtype'])
+            arrays[nome] = np.frombuffer(
+                mapa, dtype=dtype, count=int(np.prod(descritor['forma'])),
+                offset=inicio_dados + descritor['deslocamento']
+            ).reshape(descritor['forma'])
+        # O motor devolve códigos 0 … n−1; o preditor os traduz com `classes`
+        comuns = dict(
+            n_estagios=meta['n_estagios'],
+            n_classes=meta['n_classes'],
+            taxa_aprendizado=meta['taxa_aprendizado'],
+            decisao_inicial=meta['decisao_inicial'],
+            classes=np.arange(len(self.classes)),
+            valor_no=arrays.get('valor_no')
+        )
+        if meta.get('tipo') == 'reduzidas':
+            self.arvores = ArvoresReduzidas(
+                arrays['feature'], arrays['limiar'], arrays['valor_folha'], arrays['inicios_classes'],
+                bordas=arrays.get('bordas'), inicios_bordas=arrays.get('inicios_bordas'), **comuns
+            )
+        else:
+            self.arvores = ArvoresCompiladas(arrays['feature'], arrays['limiar'], arrays['valor_folha'], **comuns)
+
+        prep = cabecalho['preprocessamento']
+        self.preprocessador = PreprocessadorFundido(
+            self.features, prep['categorias'],
+            {col: np.array(codigos, dtype='float32') for col, codigos in prep['codigos'].items()},
+            prep['medias'], prep['escalas']
+        )
+
+
+def carregar_pacote(caminho, verificar=True):
+    """Mapeia o pacote somente leitura; com `verificar=True` confere o checksum dos arrays."""
+    with open(caminho, 'rb') as arquivo:
+        try:
+            mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # o mmap recusa arquivo vazio
+            raise ErroPacote(f'Pacote vazio: {caminho}') from None
+
+    inicio_cabecalho = len(MAGICA) + 4
+    if len(mapa) < inicio_cabecalho or mapa[:len(MAGICA)] != MAGICA:
+        raise ErroPacote(f'{caminho} não é um pacote de modelo.')
+    tamanho, = struct.unpack_from('<I', mapa, len(MAGICA))
+    try:
+        cabecalho = json.loads(bytes(mapa[inicio_cabecalho:inicio_cabecalho + tamanho]))
+    except ValueError as erro:
+        raise ErroPacote(f'Cabeçalho ilegível em {caminho}: {erro}') from None
+    if not isinstance(cabecalho, dict):
+        raise ErroPacote(f'Cabeçalho ilegível em {caminho}')
+    if cabecalho.get('versao_formato') not in (VERSAO_FORMATO, VERSAO_FORMATO_REDUZIDO):
+        raise ErroPacote(f'Versão de formato não suportada: {cabecalho.get("versao_formato")}')
+
+    # Cabeçalho sem algum campo (ou com tipo errado) é pacote corrompido, não erro de programa
+    try:
+        inicio_dados = _alinhar(inicio_cabecalho + tamanho)
+        if len(mapa) - inicio_dados != cabecalho['tamanho_dados']:
+            raise ErroPacote(f'Pacote truncado: {caminho}')
+        if verificar:
+            digest = hashlib.sha256(memoryview(mapa)[inicio_dados:]).hexdigest()
+            if digest != cabecalho['sha256']:
+                raise ErroPacote(f'Checksum inválido em {caminho}')
+        return PacoteModelo(caminho, cabecalho, mapa, inicio_dados)
+    except ErroPacote:
+        raise
+    except (KeyError, TypeError, ValueError) as erro:
+        raise ErroPacote(f'Cabeçalho incompleto em {caminho}: {erro!r}') from None
+
+
+def main():
+    from registro_modelos import DIRETORIO_PADRAO
+
+    parser = argparse.ArgumentParser(description='Converte os artefatos joblib em um pacote único')
+    parser.add_argument('--modelo-dir', default=DIRETORIO_PADRAO)
+    parser.add_argument('--saida', default='modelo' + EXTENSAO)
+    args = parser.parse_args()
+
+    converter_artefatos(args.modelo_dir, args.saida)
+    pacote = carregar_pacote(args.saida)
+    print(f'Pacote {pacote.versao} salvo em {os.path.abspath(args.saida)} '
+          f'({os.path.getsize(args.saida) / 1024:,.0f} KB)')
+
+
+if __name__ == '__main__':
+    main()
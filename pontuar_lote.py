@@ -0,0 +1,288 @@
+# ============================
+# 📦 Pontuação em Lote — CSV/Parquet no formato do Obesity.csv, em streaming
+# Uso: python pontuar_lote.py entrada.csv saida.parquet [--tamanho-chunk 200000 --processos 4]
+#      [--validacao substituir|descartar|erro|desligada --deriva relatorio.json]
+# ============================
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+from dados_painel import COLUNAS_NUMERICAS_BRUTAS
+from preditor import MAPA_COLUNAS_BRUTAS, traduzir_codigos_brutos
+from registro_modelos import DIRETORIO_PADRAO, carregar_versao
+from validacao_entrada import (
+    CAMINHO_REFERENCIA, POLITICA_PADRAO, POLITICAS, MonitorEntrada, PerfilReferencia, ValidadorEntrada,
+    resumo_relatorio
+)
+
+COLUNAS_BRUTAS = [col for col in MAPA_COLUNAS_BRUTAS if col != 'Obesity']
+
+
+# ============================
+# 📥 Leitura em Chunks
+# ============================
+def _formato(caminho, formato=None):
+    if formato:
+        return formato
+    return 'parquet' if caminho.lower().endswith(('.parquet', '.pq')) else 'csv'
+
+
+def ler_chunks(caminho, tamanho_chunk, formato=None):
+    """Gera DataFrames de até `tamanho_chunk` linhas sem carregar o arquivo inteiro."""
+    if _formato(caminho, formato) == 'parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            sys.exit('Leitura de Parquet requer o pacote opcional pyarrow.')
+        arquivo = pq.ParquetFile(caminho)
+        for lote in arquivo.iter_batches(batch_size=tamanho_chunk):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(caminho, chunksize=tamanho_chunk)
+
+
+# ============================
+# 📤 Escrita Incremental
+# ============================
+def _tipo_parquet(pa, col, df):
+    # Colunas conhecidas têm tipo fixo; as demais (colunas extras da entrada) seguem o 1º chunk
+    if col == 'linha':
+        return pa.int64()
+    if col in COLUNAS_NUMERICAS_BRUTAS or col.startswith('prob_'):
+        return pa.float64()
+    if col in MAPA_COLUNAS_BRUTAS or col in ('nivel_obesidade_previsto', 'problemas_entrada'):
+        return pa.string()
+    tipo = pa.Schema.from_pandas(df[[col]], preserve_index=False).field(col).type
+    return pa.string() if pa.types.is_null(tipo) else tipo
+
+
+def _conformar(pa, df, esquema):
+    # Chunk com um tipo pandas diferente do esquema (coluna toda vazia vira float, números
+    # numa coluna de texto...) é convertido antes do cast, em vez de abortar a escrita
+    df = df.copy(deep=False)
+    for campo in esquema:
+        serie = df[campo.name]
+        if pa.types.is_string(campo.type) and (pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie)):
+            df[campo.name] = serie.astype('string')
+        elif pa.types.is_floating(campo.type) and not pd.api.types.is_numeric_dtype(serie):
+            df[campo.name] = pd.to_numeric(serie, errors='coerce')
+    return pa.Table.from_pandas(df, schema=esquema, preserve_index=False)
+
+
+class EscritorIncremental:
+    """Acrescenta chunks ao CSV ou ao Parquet de saída à medida que ficam prontos.
+
+    No Parquet o esquema é montado uma vez, com os tipos das colunas brutas e das colunas
+    de saída, e todo chunk é convertido para ele: dtypes diferentes entre chunks não
+    interrompem a escrita no meio do arquivo.
+    """
+
+    def __init__(self, caminho, formato=None):
+        self.caminho = caminho
+        self.formato = _formato(caminho, formato)
+        self._escritor_parquet = None
+        self._esquema = None
+        self._primeiro = True
+
+    def escrever(self, df):
+        if self.formato == 'parquet':
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                sys.exit('Escrita de Parquet requer o pacote opcional pyarrow.')
+            if self._esquema is None:
+                self._esquema = pa.schema([(col, _tipo_parquet(pa, col, df)) for col in df.columns])
+                self._escritor_parquet = pq.ParquetWriter(self.caminho, self._esquema)
+            self._escritor_parquet.write_table(_conformar(pa, df, self._esquema))
+        else:
+            df.to_csv(self.caminho, mode='w' if self._primeiro else 'a', header=self._primeiro, index=False)
+        self._primeiro = False
+
+    def fechar(self):
+        if self._escritor_parquet is not None:
+            self._escritor_parquet.close()
+
+
+# ============================
+# 🧠 Pontuação
+# ============================
+_preditor = None
+_validador = None
+_monitor = None
+
+
+def _inicializar_worker(diretorio_modelo, perfil=None, politica=None, monitorar=False):
+    global _preditor, _validador, _monitor
+    _preditor = carregar_versao(diretorio_modelo).preditor
+    _validador = ValidadorEntrada(perfil, politica) if politica else None
+    _monitor = MonitorEntrada(perfil) if monitorar else None
+
+
+def _espalhar(valores, validas, vazio):
+    # Linhas descartadas pela validação voltam à saída sem predição, na posição original
+    # (rótulo vazio em vez de None: o tipo da coluna no Parquet não muda entre chunks)
+    if validas.all():
+        return valores
+    completo = np.full(len(validas), vazio, dtype=object if isinstance(vazio, str) else 'float64')
+    completo[validas] = valores
+    return completo
+
+
+def pontuar_chunk(argumentos):
+    """Pontua um chunk bruto; roda no processo principal ou num worker do Pool.
+
+    Retorna a saída do chunk e as contagens de validação/deriva (None sem monitor).
+    """
+    inicio_linha, chunk, probabilidades, incluir_entrada = argumentos
+    dados = traduzir_codigos_brutos(chunk[COLUNAS_BRUTAS])
+    validacao = _validador.validar(dados) if _validador is not None else None
+    parcial = _monitor.contar(dados, validacao) if _monitor is not None else None
+    validas = validacao.validas if validacao is not None else np.ones(len(chunk), dtype=bool)
+    if validacao is not None:
+        dados = validacao.dados
+
+    saida = chunk.copy() if incluir_entrada else pd.DataFrame(index=chunk.index)
+    saida.insert(0, 'linha', range(inicio_linha, inicio_linha + len(chunk)))
+    if not len(dados):  # chunk inteiro descartado pela validação
+        rotulos, proba = np.array([], dtype=object), pd.DataFrame(columns=_preditor.classes, dtype='float64')
+    elif probabilidades:
+        rotulos, proba = _preditor.prever_com_proba(dados)
+    else:
+        rotulos = _preditor.prever(dados)
+    saida['nivel_obesidade_previsto'] = _espalhar(rotulos, validas, '')
+    if probabilidades:
+        for classe in proba.columns:
+            saida[f'prob_{classe}'] = _espalhar(proba[classe].to_numpy(), validas, np.nan)
+    if validacao is not None:
+        saida['problemas_entrada'] = validacao.descricoes()
+    return saida.reset_index(drop=True), parcial
+
+
+def _tarefas(chunks, probabilidades, incluir_entrada):
+    inicio_linha = 0
+    for chunk in chunks:
+        yield inicio_linha, chunk, probabilidades, incluir_entrada
+        inicio_linha += len(chunk)
+
+
+def _conferir_colunas(chunks, entrada):
+    # Falta de coluna bruta vira mensagem aqui, e não KeyError do pandas dentro de um worker
+    for i, chunk in enumerate(chunks):
+        if i == 0:
+            faltantes = [col for col in COLUNAS_BRUTAS if col not in chunk.columns]
+            if faltantes:
+                sys.exit(f'{entrada} não tem as colunas brutas: {", ".join(faltantes)}')
+        yield chunk
+
+
+def pico_rss_mb():
+    """Pico de memória residente (processo + workers já encerrados), em MB; None sem `resource`."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    proprio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    filhos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss vem em bytes no macOS e em KB no Linux
+    return max(proprio, filhos) / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def pontuar_arquivo(entrada, saida, tamanho_chunk=200_000, processos=1, probabilidades=False,
+                    incluir_entrada=False, diretorio_modelo=DIRETORIO_PADRAO,
+                    formato_entrada=None, formato_saida=None, validacao=None, monitor=None, perfil=None):
+    """Pontua `entrada` em streaming e grava em `saida`. Retorna o total de linhas.
+
+    `validacao` é uma das POLITICAS de validacao_entrada (None desliga); com um
+    MonitorEntrada em `monitor`, as contagens de cada chunk são somadas nele.
+    """
+    if perfil is None and (validacao or monitor is not None):
+        perfil = monitor.perfil if monitor is not None else PerfilReferencia.carregar()
+    inicializacao = (diretorio_modelo, perfil, validacao, monitor is not None)
+    chunks = _conferir_colunas(ler_chunks(entrada, tamanho_chunk, formato_entrada), entrada)
+    tarefas = _tarefas(chunks, probabilidades, incluir_entrada)
+    escritor = EscritorIncremental(saida, formato_saida)
+    total = 0
+
+    def concluir(resultado):
+        nonlocal total
+        chunk, parcial = resultado
+        escritor.escrever(chunk)
+        if parcial is not None:
+            monitor.acumular(parcial)
+        total += len(chunk)
+
+    try:
+        if processos > 1:
+            with Pool(processos, initializer=_inicializar_worker, initargs=inicializacao) as pool:
+                # No máximo 2 chunks por worker em trânsito: a leitura acompanha a escrita,
+                # e a saída sai na mesma ordem da entrada.
+                pendentes = deque()
+                for tarefa in tarefas:
+                    pendentes.append(pool.apply_async(pontuar_chunk, (tarefa,)))
+                    if len(pendentes) >= 2 * processos:
+                        concluir(pendentes.popleft().get())
+                while pendentes:
+                    concluir(pendentes.popleft().get())
+        else:
+            _inicializar_worker(*inicializacao)
+            for tarefa in tarefas:
+                concluir(pontuar_chunk(tarefa))
+    finally:
+        escritor.fechar()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pontua arquivos no formato do Obesity.csv em streaming')
+    parser.add_argument('entrada', help='CSV ou Parquet com as colunas brutas (Gender, Age, FAVC, ...)')
+    parser.add_argument('saida', help='arquivo de saída (.csv ou .parquet)')
+    parser.add_argument('--tamanho-chunk', type=int, default=200_000)
+    parser.add_argument('--processos', type=int, default=1, help='workers para pontuar chunks em paralelo')
+    parser.add_argument('--probabilidades', action='store_true', help='inclui uma coluna por classe')
+    parser.add_argument('--incluir-entrada', action='store_true', help='repete as colunas de entrada na saída')
+    parser.add_argument('--modelo-dir', default=DIRETORIO_PADRAO)
+    parser.add_argument('--formato-entrada', choices=['csv', 'parquet'])
+    parser.add_argument('--formato-saida', choices=['csv', 'parquet'])
+    parser.add_argument('--validacao', choices=[*POLITICAS, 'desligada'], default=POLITICA_PADRAO,
+                        help='o que fazer com valores fora da faixa ou categorias desconhecidas')
+    parser.add_argument('--deriva', metavar='RELATORIO_JSON',
+                        help='mede PSI/KS por coluna contra a referência e grava o relatório')
+    parser.add_argument('--referencia', default=CAMINHO_REFERENCIA, help='CSV bruto ou perfil .json')
+    args = parser.parse_args()
+
+    if os.path.exists(args.saida):
+        os.remove(args.saida)
+
+    validacao = None if args.validacao == 'desligada' else args.validacao
+    perfil = PerfilReferencia.carregar(args.referencia) if validacao or args.deriva else None
+    monitor = MonitorEntrada(perfil) if args.deriva else None
+
+    inicio = time.perf_counter()
+    total = pontuar_arquivo(
+        args.entrada, args.saida, args.tamanho_chunk, args.processos, args.probabilidades,
+        args.incluir_entrada, args.modelo_dir, args.formato_entrada, args.formato_saida,
+        validacao, monitor, perfil
+    )
+    duracao = time.perf_counter() - inicio
+    pico = pico_rss_mb()
+    print(f'{total:,} linhas em {duracao:.1f} s — {total / duracao:,.0f} linhas/s'
+          + (f' — pico de RSS {pico:,.0f} MB' if pico is not None else ''))
+    if monitor is not None:
+        relatorio = monitor.relatorio()
+        with open(args.deriva, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+        print(f'Deriva contra {perfil.linhas:,} linhas da referência (relatório em {args.deriva}):')
+        print('\n'.join(resumo_relatorio(relatorio)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,442 @@
+# ============================
+# 🧠 Preditor de Obesidade — inferência em lote, sem Streamlit
+# ============================
+
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.special import softmax
+
+from arvores_compiladas import ArvoresCompiladas
+from metricas import metricas
+
+# ============================
+# 📋 Esquema de Entrada
+# ============================
+COLUNAS_ENTRADA = [
+    'genero', 'idade', 'altura', 'peso',
+    'historico_familiar', 'consome_alta_calorias_frequente',
+    'consumo_vegetais', 'qtde_refeicoes_principais',
+    'alimentacao_entre_refeicoes', 'fuma', 'qtde_agua_diaria',
+    'monitora_calorias', 'freq_atividade_fisica',
+    'tempo_uso_dispositivos', 'freq_consumo_alcool',
+    'meio_transporte_contumaz'
+]
+
+COLUNAS_CATEGORICAS = [
+    'genero', 'historico_familiar',
+    'consome_alta_calorias_frequente',
+    'fuma', 'monitora_calorias',
+    'meio_transporte_contumaz'
+]
+
+COLUNAS_NUMERICAS = [
+    'idade', 'altura', 'peso',
+    'qtde_refeicoes_principais', 'qtde_agua_diaria',
+    'tempo_uso_dispositivos'
+]
+
+# 📏 Faixas aceitas pelo formulário; valores fora delas não têm suporte nos dados de treino
+LIMITES_NUMERICOS = {
+    'idade': (10.0, 100.0),
+    'altura': (1.20, 2.30),
+    'peso': (30.0, 200.0),
+    'qtde_refeicoes_principais': (1.0, 4.0),
+    'qtde_agua_diaria': (0.0, 5.0),
+    'tempo_uso_dispositivos': (0.0, 16.0)
+}
+
+# 🔧 Mapeamento das variáveis ordinais
+mapeamento_atividade = {'Nunca': 0, 'Pouquíssima': 1, 'Moderada': 2, 'Frequente': 3}
+mapeamento_alimentacao = {'Não': 0, 'Às vezes': 1, 'Frequente': 2, 'Sempre': 3}
+mapeamento_vegetais = {'Nunca ou Raramente': 0, 'Às vezes': 1, 'Sempre': 2}
+mapeamento_alcool = {'Não Aplicável': 0, 'Às vezes': 1, 'Frequente': 2, 'Sempre': 3}
+
+MAPEAMENTOS_ORDINAIS = {
+    'alimentacao_entre_refeicoes': mapeamento_alimentacao,
+    'freq_consumo_alcool': mapeamento_alcool,
+    'freq_atividade_fisica': mapeamento_atividade,
+    'consumo_vegetais': mapeamento_vegetais
+}
+
+# ============================
+# 🌐 Códigos Brutos do Obesity.csv
+# ============================
+MAPA_COLUNAS_BRUTAS = {
+    'Gender': 'genero',
+    'Age': 'idade',
+    'Height': 'altura',
+    'Weight': 'peso',
+    'family_history': 'historico_familiar',
+    'FAVC': 'consome_alta_calorias_frequente',
+    'FCVC': 'consumo_vegetais',
+    'NCP': 'qtde_refeicoes_principais',
+    'CAEC': 'alimentacao_entre_refeicoes',
+    'SMOKE': 'fuma',
+    'CH2O': 'qtde_agua_diaria',
+    'SCC': 'monitora_calorias',
+    'FAF': 'freq_atividade_fisica',
+    'TUE': 'tempo_uso_dispositivos',
+    'CALC': 'freq_consumo_alcool',
+    'MTRANS': 'meio_transporte_contumaz',
+    'Obesity': 'nivel_obesidade'
+}
+
+_sim_nao = {'yes': 'Sim', 'no': 'Não'}
+
+TRADUCOES_BRUTAS = {
+    'genero': {'Male': 'Masculino', 'Female': 'Feminino'},
+    'historico_familiar': _sim_nao,
+    'consome_alta_calorias_frequente': _sim_nao,
+    'fuma': _sim_nao,
+    'monitora_calorias': _sim_nao,
+    'alimentacao_entre_refeicoes': {
+        'no': 'Não', 'Sometimes': 'Às vezes', 'Frequently': 'Frequente', 'Always': 'Sempre'
+    },
+    'freq_consumo_alcool': {
+        'no': 'Não Aplicável', 'Sometimes': 'Às vezes', 'Frequently': 'Frequente', 'Always': 'Sempre'
+    },
+    'meio_transporte_contumaz': {
+        'Walking': 'Caminhada',
+        'Bike': 'Bicicleta',
+        'Public_Transportation': 'Transporte Público',
+        'Automobile': 'Automóvel',
+        'Motorbike': 'Moto'
+    }
+}
+
+# 🎯 Alvo bruto → classes do labelencoder_target, em ordem crescente de gravidade
+TRADUCOES_ALVO_BRUTO = {
+    'Insufficient_Weight': 'Abaixo do Peso',
+    'Normal_Weight': 'Peso Normal',
+    'Overweight_Level_I': 'Sobrepeso - Nível I',
+    'Overweight_Level_II': 'Sobrepeso - Nível II',
+    'Obesity_Type_I': 'Obesidade - Nível I',
+    'Obesity_Type_II': 'Obesidade - Nível II',
+    'Obesity_Type_III': 'Obesidade - Nível III'
+}
+
+ORDEM_CLASSES = list(TRADUCOES_ALVO_BRUTO.values())
+
+# 🔢 Escalas numéricas do CSV (FCVC 1–3, FAF 0–3) → rótulos do formulário
+TRADUCOES_ESCALAS_BRUTAS = {
+    'consumo_vegetais': {1: 'Nunca ou Raramente', 2: 'Às vezes', 3: 'Sempre'},
+    'freq_atividade_fisica': {0: 'Nunca', 1: 'Pouquíssima', 2: 'Moderada', 3: 'Frequente'}
+}
+
+# ✅ Opções válidas de cada coluna não numérica, na ordem do formulário
+OPCOES_ENTRADA = {
+    col: list(MAPEAMENTOS_ORDINAIS[col]) if col in MAPEAMENTOS_ORDINAIS else list(TRADUCOES_BRUTAS[col].values())
+    for col in COLUNAS_ENTRADA if col not in COLUNAS_NUMERICAS
+}
+
+
+def _manter_desconhecidos(traduzida, original):
+    if not traduzida.isna().any():
+        return traduzida
+    return traduzida.astype(object).where(traduzida.notna(), original)
+
+
+def traduzir_codigos_brutos(df_bruto):
+    """Converte um DataFrame no formato do Obesity.csv para o vocabulário do formulário.
+
+    Códigos fora do dicionário passam como vieram, sem erro: quem decide o que fazer com
+    eles é a validação (ver validacao_entrada.py) ou o preprocessamento.
+    """
+    dados = df_bruto.rename(columns=MAPA_COLUNAS_BRUTAS)
+    for col, mapa in TRADUCOES_BRUTAS.items():
+        dados[col] = _manter_desconhecidos(dados[col].map(mapa), dados[col])
+    for col, mapa in TRADUCOES_ESCALAS_BRUTAS.items():
+        dados[col] = _manter_desconhecidos(pd.to_numeric(dados[col], errors='coerce').round().map(mapa), dados[col])
+    return dados
+
+
+# ============================
+# 📥 Normalização das Entradas
+# ============================
+def para_dataframe(registros):
+    """Aceita DataFrame, lista de dicts, dict único ou array 2D (ordem de COLUNAS_ENTRADA)."""
+    if isinstance(registros, pd.DataFrame):
+        dados = registros
+    elif isinstance(registros, dict):
+        dados = pd.DataFrame([registros])
+    elif isinstance(registros, np.ndarray):
+        matriz = registros.reshape(1, -1) if registros.ndim == 1 else registros
+        if matriz.shape[1] != len(COLUNAS_ENTRADA):
+            raise ValueError(
+                f'Esperadas {len(COLUNAS_ENTRADA)} colunas na ordem de COLUNAS_ENTRADA, '
+                f'recebidas {matriz.shape[1]}.'
+            )
+        dados = pd.DataFrame(matriz, columns=COLUNAS_ENTRADA)
+    else:
+        dados = pd.DataFrame(list(registros))
+
+    faltantes = [col for col in COLUNAS_ENTRADA if col not in dados.columns]
+    if faltantes:
+        raise ValueError(f'Colunas ausentes na entrada: {faltantes}')
+    return dados
+
+
+class ErroExplicacao(ValueError):
+    """O modelo carregado não expõe as árvores usadas nas contribuições por feature."""
+
+
+# ============================
+# 🚀 Preditor
+# ============================
+class PreditorObesidade:
+    """Encapsula os artefatos treinados e aplica o pipeline do app a N registros de uma vez."""
+
+    # Lotes maiores que isso não passam pelo cache: montar as chaves custaria mais que prever.
+    LIMITE_LOTE_CACHE = 1024
+
+    BACKENDS = ('sklearn', 'compilado', 'pacote')
+
+    # Acima disso o Cython do sklearn vence a travessia em NumPy; o backend compilado delega
+    LIMITE_LOTE_COMPILADO = 256
+
+    def __init__(self, modelo, scaler, label_encoders, label_encoder_target, features, cache=None,
+                 backend='sklearn', motor=None, preprocessador=None, classes=None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f'Backend desconhecido: {backend!r} (opções: {self.BACKENDS})')
+        if backend == 'pacote' and motor is None:
+            raise ValueError('O backend pacote recebe motor, pré-processador e classes prontos.')
+        if backend == 'compilado' and not hasattr(modelo, 'estimators_'):
+            raise ValueError('O backend compilado só suporta GradientBoostingClassifier.')
+        self.modelo = modelo
+        self.scaler = scaler
+        self.label_encoders = label_encoders
+        self.label_encoder_target = label_encoder_target
+        self.features = list(features)
+        self.cache = cache
+        self.tabela = None  # TabelaPredicoes opcional (ver tabela_predicoes.py)
+        self.backend = backend
+        # 🌲 Motor de inferência: o próprio modelo sklearn ou as árvores achatadas
+        if motor is None:
+            motor = ArvoresCompiladas.de_modelo(modelo) if backend == 'compilado' else modelo
+        self.motor = motor
+
+        if preprocessador is None:
+            # Import local: preprocessamento_fundido depende das constantes deste módulo
+            from preprocessamento_fundido import PreprocessadorFundido
+            preprocessador = PreprocessadorFundido.de_artefatos(label_encoders, scaler, self.features)
+        self.preprocessador = preprocessador
+        self._classes = np.asarray(label_encoder_target.classes_ if classes is None else classes)
+        self._arvores = None
+
+    @classmethod
+    def carregar(cls, diretorio='.', backend='sklearn'):
+        """Carrega os cinco artefatos joblib a partir de um diretório."""
+        return cls(
+            joblib.load(os.path.join(diretorio, 'modelo_obesidade.joblib')),
+            joblib.load(os.path.join(diretorio, 'scaler.joblib')),
+            joblib.load(os.path.join(diretorio, 'labelencoders.joblib')),
+            joblib.load(os.path.join(diretorio, 'labelencoder_target.joblib')),
+            joblib.load(os.path.join(diretorio, 'features.joblib')),
+            backend=backend
+        )
+
+    @classmethod
+    def de_pacote(cls, pacote, cache=None):
+        """Preditor servido por um pacote mapeado em memória (ver pacote_modelo.py), sem sklearn."""
+        if isinstance(pacote, (str, os.PathLike)):
+            from pacote_modelo import carregar_pacote
+            pacote = carregar_pacote(pacote)
+        return cls(
+            None, None, None, None, pacote.features, cache=cache, backend='pacote',
+            motor=pacote.arvores, preprocessador=pacote.preprocessador, classes=pacote.classes
+        )
+
+    @property
+    def classes(self):
+        return self._classes
+
+    def preprocessar_matriz(self, registros, saida=None):
+        """Matriz float32 (n, features) pronta para o motor, via pré-processamento fundido."""
+        with metricas.medir('etapa', etapa='preprocessamento'):
+            return self.preprocessador.transformar(registros, saida)
+
+    def preprocessar(self, registros):
+        """Mesma matriz de `preprocessar_matriz`, como DataFrame com os nomes das features."""
+        return pd.DataFrame(self.preprocessar_matriz(registros), columns=self.features)
+
+    def _motor_para(self, n_linhas):
+        if self.backend == 'compilado' and n_linhas > self.LIMITE_LOTE_COMPILADO:
+            return self.modelo
+        return self.motor
+
+    def _entrada_motor(self, motor, matriz):
+        # O sklearn foi treinado com nomes de colunas; o motor compilado usa o array direto.
+        if motor is self.modelo:
+            return pd.DataFrame(matriz, columns=self.features, copy=False)
+        return matriz
+
+    def _predict_proba(self, matriz):
+        motor = self._motor_para(len(matriz))
+        metricas.incrementar('registros_previstos', len(matriz))
+        with metricas.medir('etapa', etapa='inferencia'):
+            return motor.predict_proba(self._entrada_motor(motor, matriz))
+
+    def _prever_matriz(self, matriz):
+        motor = self._motor_para(len(matriz))
+        metricas.incrementar('registros_previstos', len(matriz))
+        with metricas.medir('etapa', etapa='inferencia'):
+            pred = motor.predict(self._entrada_motor(motor, matriz))
+        # Códigos do LabelEncoder são as posições em classes_ (mesmo que inverse_transform)
+        return self.classes[pred]
+
+    def _chaves_entrada(self, registros):
+        # Entrada crua normalizada → permite pular até a codificação em reenvios idênticos.
+        if isinstance(registros, dict):
+            registros = [registros]
+        if not isinstance(registros, list) or len(registros) > self.LIMITE_LOTE_CACHE:
+            return None
+        try:
+            return [
+                ('entrada',) + tuple(
+                    float(registro[col]) if col in COLUNAS_NUMERICAS else registro[col]
+                    for col in COLUNAS_ENTRADA
+                )
+                for registro in registros
+            ]
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _memoizar_linhas(self, registros, tipo, calcular):
+        """Resultados por linha de `calcular(registros)`, memoizados pela entrada crua.
+
+        Devolve None quando a entrada não é cacheável (DataFrame ou lote grande); aí o
+        chamador segue pelo caminho vetorizado de sempre.
+        """
+        if self.cache is None and self.tabela is None:
+            return None
+        chaves = self._chaves_entrada(registros)
+        if chaves is None:
+            return None
+        registros = [registros] if isinstance(registros, dict) else registros
+        if self.cache is None:
+            return self._calcular_linhas(registros, tipo, calcular)
+        chaves = [(tipo,) + chave[1:] for chave in chaves]
+        linhas = self.cache.obter_varios(chaves)
+        faltas = [i for i, linha in enumerate(linhas) if linha is None]
+        if faltas:
+            novas = self._calcular_linhas([registros[i] for i in faltas], tipo, calcular)
+            self.cache.guardar_varios([chaves[i] for i in faltas], novas)
+            for i, linha in zip(faltas, novas):
+                linhas[i] = linha
+        return linhas
+
+    def _calcular_linhas(self, registros, tipo, calcular):
+        # 🗂️ Células da tabela pré-computada respondem sem travessia; o resto vai ao modelo
+        if self.tabela is None:
+            return calcular(registros)
+        linhas = self.tabela.linhas(registros, tipo)
+        faltas = [i for i, linha in enumerate(linhas) if linha is None]
+        metricas.incrementar('consultas_tabela', len(linhas) - len(faltas), resultado='acerto')
+        metricas.incrementar('consultas_tabela', len(faltas), resultado='falta')
+        if faltas:
+            for i, linha in zip(faltas, calcular([registros[i] for i in faltas])):
+                linhas[i] = linha
+        return linhas
+
+    def prever(self, registros):
+        """Retorna os rótulos previstos (array de str) para todos os registros."""
+        chaves_entrada = self._chaves_entrada(registros) if self.cache is not None else None
+        if chaves_entrada is not None:
+            chaves = self.cache.obter_varios(chaves_entrada, contar=False)
+            if None not in chaves:
+                resultados = self.cache.obter_varios(chaves)
+                if None not in resultados:
+                    return np.array(resultados, dtype=object)
+
+        dados = self.preprocessar_matriz(registros)
+        if self.cache is None or len(dados) > self.LIMITE_LOTE_CACHE:
+            return self._prever_matriz(dados)
+
+        # ♻️ Vetores codificados já vistos pulam a travessia das árvores
+        chaves = [linha.tobytes() for linha in dados]
+        if chaves_entrada is not None:
+            self.cache.guardar_varios(chaves_entrada, chaves)
+        resultados = self.cache.obter_varios(chaves)
+        faltas = [i for i, rotulo in enumerate(resultados) if rotulo is None]
+        if faltas:
+            novos = self._prever_matriz(dados[faltas])
+            self.cache.guardar_varios([chaves[i] for i in faltas], novos)
+            for i, rotulo in zip(faltas, novos):
+                resultados[i] = rotulo
+        return np.array(resultados, dtype=object)
+
+    def prever_proba(self, registros):
+        """Retorna as probabilidades por classe como DataFrame (colunas = rótulos do alvo)."""
+        proba = self._predict_proba(self.preprocessar_matriz(registros))
+        return pd.DataFrame(proba, columns=self.classes)
+
+    def _arvores_explicacao(self):
+        # As contribuições saem das árvores achatadas; no backend sklearn são montadas na 1ª chamada
+        if isinstance(self.motor, ArvoresCompiladas):
+            return self.motor
+        if self._arvores is None:
+            if not hasattr(self.modelo, 'estimators_'):
+                raise ErroExplicacao('Contribuições por feature exigem um GradientBoostingClassifier.')
+            self._arvores = ArvoresCompiladas.de_modelo(self.modelo)
+        return self._arvores
+
+    def prever_explicado(self, registros):
+        """Rótulos, probabilidades (colunas em ORDEM_CLASSES) e contribuições da classe prevista.
+
+        Tudo sai de uma única travessia das árvores. As contribuições (uma coluna por
+        feature) estão na escala da decisão bruta: somadas ao viés da classe, reproduzem-na.
+        """
+        linhas = self._memoizar_linhas(
+            registros, 'explicado', lambda faltas: list(zip(*self._explicar_matrizes(faltas)))
+        )
+        if linhas:
+            rotulos, probabilidades, contribuicoes = zip(*linhas)
+        else:
+            rotulos, probabilidades, contribuicoes = self._explicar_matrizes(registros)
+        return (
+            np.array(rotulos, dtype=self.classes.dtype),
+            pd.DataFrame(np.vstack(probabilidades), columns=ORDEM_CLASSES),
+            pd.DataFrame(np.vstack(contribuicoes), columns=self.features)
+        )
+
+    def _explicar_matrizes(self, registros):
+        # (rótulos, probabilidades em ORDEM_CLASSES, contribuições da classe prevista) como arrays
+        matriz = self.preprocessar_matriz(registros)
+        metricas.incrementar('registros_previstos', len(matriz))
+        with metricas.medir('etapa', etapa='inferencia_explicada'):
+            decisao, contribuicoes, _ = self._arvores_explicacao().decisao_e_contribuicoes(matriz)
+        prevista = np.argmax(decisao, axis=1)
+        ordem = [list(self.classes).index(classe) for classe in ORDEM_CLASSES]
+        return (
+            self.classes[prevista],
+            softmax(decisao, axis=1)[:, ordem],
+            contribuicoes[np.arange(len(matriz)), prevista]
+        )
+
+    def prever_com_proba(self, registros):
+        """Rótulos e probabilidades a partir de uma única chamada ao modelo."""
+        linhas = self._memoizar_linhas(
+            registros, 'rotulo_proba', lambda faltas: list(zip(*self._rotulos_e_proba(faltas)))
+        )
+        if linhas:
+            rotulos, proba = zip(*linhas)
+            rotulos, proba = np.array(rotulos, dtype=self.classes.dtype), np.vstack(proba)
+        else:
+            rotulos, proba = self._rotulos_e_proba(registros)
+        return rotulos, pd.DataFrame(proba, columns=self.classes)
+
+    def _rotulos_e_proba(self, registros):
+        # O rótulo vem junto da linha: tabela e cache não o recalculam de probabilidades arredondadas
+        proba = self._predict_proba(self.preprocessar_matriz(registros))
+        return self.classes[np.argmax(proba, axis=1)], proba
+
+
+def principais_contribuicoes(contribuicoes, k=3):
+    """As `k` features de maior |contribuição| em cada linha: [[(feature, valor), ...], ...]."""
+    valores = contribuicoes.to_numpy()
+    ordem = np.argsort(-np.abs(valores), axis=1)[:, :k]
+    nomes = np.asarray(contribuicoes.columns)
+    return [list(zip(nomes[o].tolist(), valores[i, o].tolist())) for i, o in enumerate(ordem)]
@@ -0,0 +1,140 @@
+# ============================
+# ⚡ Pré-processamento Fundido — encoders, ordinais e scaler em uma só transformação
+# Uso: python preprocessamento_fundido.py [--saida preprocessador.joblib]
+# ============================
+
+import argparse
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from preditor import COLUNAS_CATEGORICAS, COLUNAS_NUMERICAS, MAPEAMENTOS_ORDINAIS, para_dataframe
+
+# Até este tamanho, um laço Python sobre dicts bate o custo fixo das operações do pandas
+LIMITE_CAMINHO_ESCALAR = 32
+
+
+class PreprocessadorFundido:
+    """Transforma registros do formulário direto na matriz float32 esperada pelo modelo.
+
+    Cada coluna de `features` vira uma tabela de consulta (nominais e ordinais) ou um par
+    (média, escala) (numéricas). A saída é preenchida em uma matriz pré-alocada, já na
+    ordem de `features`, sem criar colunas intermediárias. O resultado é idêntico ao
+    caminho LabelEncoder → mapeamentos → StandardScaler após a conversão para float32
+    que o próprio sklearn faz antes de percorrer as árvores.
+    """
+
+    def __init__(self, features, categorias, codigos, medias, escalas):
+        self.features = list(features)
+        self.categorias = categorias
+        self.codigos = codigos
+        self.medias = medias
+        self.escalas = escalas
+        self._consultas = {
+            col: dict(zip(categorias[col], codigos[col].tolist())) for col in categorias
+        }
+
+    @classmethod
+    def de_artefatos(cls, label_encoders, scaler, features):
+        categorias, codigos = {}, {}
+        for col in COLUNAS_CATEGORICAS:
+            classes = list(label_encoders[col].classes_)
+            categorias[col] = classes
+            codigos[col] = np.arange(len(classes), dtype='float32')
+        for col, mapa in MAPEAMENTOS_ORDINAIS.items():
+            categorias[col] = list(mapa)
+            codigos[col] = np.array(list(mapa.values()), dtype='float32')
+
+        nomes_scaler = list(getattr(scaler, 'feature_names_in_', COLUNAS_NUMERICAS))
+        medias = {col: float(scaler.mean_[i]) for i, col in enumerate(nomes_scaler)}
+        escalas = {col: float(scaler.scale_[i]) for i, col in enumerate(nomes_scaler)}
+        return cls(features, categorias, codigos, medias, escalas)
+
+    def salvar(self, caminho):
+        joblib.dump(self, caminho)
+
+    @staticmethod
+    def carregar(caminho):
+        return joblib.load(caminho)
+
+    # ============================
+    # 🔄 Transformação
+    # ============================
+    def _desconhecidos(self, col, valores):
+        conhecidos = set(self.categorias[col])
+        return sorted({str(v) for v in valores if v not in conhecidos})
+
+    def _transformar_escalar(self, registros, saida):
+        for i, registro in enumerate(registros):
+            for j, col in enumerate(self.features):
+                valor = registro[col]
+                if col in self._consultas:
+                    try:
+                        saida[i, j] = self._consultas[col][valor]
+                    except (KeyError, TypeError):
+                        raise ValueError(f'Valores desconhecidos em {col}: {[str(valor)]}') from None
+                else:
+                    saida[i, j] = (float(valor) - self.medias[col]) / self.escalas[col]
+        return saida
+
+    def _transformar_vetorizado(self, dados, saida):
+        for j, col in enumerate(self.features):
+            valores = dados[col]
+            if col in self.categorias:
+                posicoes = pd.Categorical(valores, categories=self.categorias[col]).codes
+                if (posicoes < 0).any():
+                    raise ValueError(
+                        f'Valores desconhecidos em {col}: {self._desconhecidos(col, valores)}'
+                    )
+                saida[:, j] = self.codigos[col][posicoes]
+            else:
+                # Mesma sequência de operações do StandardScaler (float64), depois float32
+                saida[:, j] = (valores.to_numpy(dtype='float64') - self.medias[col]) / self.escalas[col]
+        return saida
+
+    def transformar(self, registros, saida=None):
+        """Matriz (n, len(features)) float32; `saida` permite reaproveitar um buffer."""
+        if isinstance(registros, dict):
+            registros = [registros]
+        escalar = (
+            isinstance(registros, list) and len(registros) <= LIMITE_CAMINHO_ESCALAR
+            and all(isinstance(r, dict) for r in registros)
+        )
+        if escalar:
+            faltantes = [col for col in self.features if any(col not in r for r in registros)]
+            if faltantes:
+                raise ValueError(f'Colunas ausentes na entrada: {faltantes}')
+            n = len(registros)
+        else:
+            registros = para_dataframe(registros)
+            n = len(registros)
+
+        if saida is None:
+            saida = np.empty((n, len(self.features)), dtype='float32')
+        elif saida.shape != (n, len(self.features)) or saida.dtype != np.float32:
+            raise ValueError(f'Buffer de saída deve ser float32 com forma {(n, len(self.features))}')
+
+        if escalar:
+            return self._transformar_escalar(registros, saida)
+        return self._transformar_vetorizado(registros, saida)
+
+
+def main():
+    from registro_modelos import DIRETORIO_PADRAO, carregar_versao
+
+    parser = argparse.ArgumentParser(description='Gera o artefato único de pré-processamento')
+    parser.add_argument('--modelo-dir', default=DIRETORIO_PADRAO)
+    parser.add_argument('--saida', default='preprocessador.joblib')
+    args = parser.parse_args()
+
+    preditor = carregar_versao(args.modelo_dir).preditor
+    PreprocessadorFundido.de_artefatos(
+        preditor.label_encoders, preditor.scaler, preditor.features
+    ).salvar(args.saida)
+    print(f'Pré-processador salvo em {os.path.abspath(args.saida)}')
+
+
+if __name__ == '__main__':
+    main()
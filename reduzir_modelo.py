@@ -0,0 +1,223 @@
+# ============================
+# 🪶 Modelo Reduzido — variantes menores do GradientBoosting para contêineres pequenos
+# Uso: python reduzir_modelo.py [--estagios 20 40 60 100 --limiares exato float16 int8]
+#      [--tolerancia 0.01 --saida modelo_reduzido.obpkg]
+# Depois: OBESIDADE_VARIANTE=modelo_reduzido.obpkg (ver registro_modelos.py)
+# ============================
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.special import softmax
+
+from arvores_compiladas import ArvoresReduzidas
+from pacote_modelo import salvar_pacote
+from preditor import TRADUCOES_ALVO_BRUTO, traduzir_codigos_brutos
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+CAMINHO_AVALIACAO = os.path.join(RAIZ, 'Obesity.csv')
+
+LIMIARES = ('exato', 'float16', 'int8')
+
+# Códigos uint8: 0 … 254 para os valores de X, 255 para as folhas rasas (sempre à esquerda)
+MAX_LIMIARES_INT8 = 254
+CODIGO_FOLHA_RASA = 255
+
+ESTAGIOS_PADRAO = [10, 20, 30, 40, 50, 60, 80, 100]
+
+
+# ============================
+# ✂️ Redução
+# ============================
+def _agrupar_limiares(distintos, maximo):
+    # Funde os pares de limiares vizinhos mais próximos (no ponto médio) até caberem em `maximo`
+    distintos = list(distintos)
+    while len(distintos) > maximo:
+        i = int(np.argmin(np.diff(distintos)))
+        distintos[i:i + 2] = [(distintos[i] + distintos[i + 1]) / 2]
+    return np.array(distintos, dtype='float64')
+
+
+def _quantizar_int8(feature, limiar, n_features):
+    """Códigos uint8 dos limiares, tabela de bordas por feature e onde começa cada tabela."""
+    codigos = np.full(limiar.shape, CODIGO_FOLHA_RASA, dtype='uint8')
+    finitos = np.isfinite(limiar)
+    tabelas = []
+    for j in range(n_features):
+        mascara = finitos & (feature == j)
+        bordas = _agrupar_limiares(np.unique(limiar[mascara]), MAX_LIMIARES_INT8)
+        if len(bordas):
+            # Cada limiar vai para a borda mais próxima (exato quando a feature tem ≤ 254 limiares)
+            valores = limiar[mascara]
+            direita = np.minimum(np.searchsorted(bordas, valores), len(bordas) - 1)
+            esquerda = np.maximum(direita - 1, 0)
+            mais_perto_esquerda = np.abs(valores - bordas[esquerda]) < np.abs(bordas[direita] - valores)
+            codigos[mascara] = np.where(mais_perto_esquerda, esquerda, direita)
+        tabelas.append(bordas)
+    inicios = np.cumsum([0] + [len(bordas) for bordas in tabelas])
+    return codigos, np.concatenate(tabelas), inicios
+
+
+def reduzir(arvores, estagios=None, limiares='exato', fundir=True, n_features=None):
+    """ArvoresReduzidas a partir das ArvoresCompiladas do modelo completo.
+
+    - `estagios`: mantém só os primeiros estágios do boosting (a soma é aditiva);
+    - `limiares`: 'exato' (float64), 'float16' ou 'int8' (códigos por feature, com os
+      limiares mais próximos fundidos quando a feature tem mais de 254);
+    - `fundir`: árvores da mesma classe com a mesma estrutura (features e limiares já
+      quantizados) viram uma só, com folhas e nós somados.
+    """
+    if limiares not in LIMIARES:
+        raise ValueError(f'Limiares desconhecidos: {limiares!r} (opções: {LIMIARES})')
+    estagios = min(estagios or arvores.n_estagios, arvores.n_estagios)
+    n = estagios * arvores.n_classes
+    feature = arvores.feature[:n]
+    limiar = arvores.limiar[:n]
+    valor_folha = arvores.valor_folha[:n].astype('float64')
+    valor_no = None if arvores.valor_no is None else arvores.valor_no[:n].astype('float64')
+    classe = np.tile(np.arange(arvores.n_classes), estagios)
+
+    bordas = inicios_bordas = None
+    if limiares == 'float16':
+        limiar = limiar.astype('float16')
+    elif limiares == 'int8':
+        limiar, bordas, inicios_bordas = _quantizar_int8(feature, limiar, n_features or int(feature.max()) + 1)
+
+    # 🔗 Grupos de árvores idênticas, na ordem (classe, primeira ocorrência)
+    grupos = {}
+    for i in range(n):
+        chave = (classe[i], feature[i].tobytes(), limiar[i].tobytes()) if fundir else (classe[i], i)
+        grupos.setdefault(chave, []).append(i)
+    ordem = sorted(grupos.values(), key=lambda membros: (classe[membros[0]], membros[0]))
+    primeiras = [membros[0] for membros in ordem]
+    folhas = np.array([valor_folha[membros].sum(axis=0) for membros in ordem])
+    nos = None if valor_no is None else np.array([valor_no[membros].sum(axis=0) for membros in ordem])
+    classes_grupos = classe[primeiras]
+
+    return ArvoresReduzidas(
+        feature[primeiras].astype('uint8'), limiar[primeiras], folhas.astype('float32'),
+        inicios_classes=np.searchsorted(classes_grupos, np.arange(arvores.n_classes)),
+        n_estagios=estagios,
+        n_classes=arvores.n_classes,
+        taxa_aprendizado=arvores.taxa_aprendizado,
+        decisao_inicial=arvores.decisao_inicial,
+        classes=arvores.classes_,
+        valor_no=None if nos is None else nos.astype('float32'),
+        bordas=bordas,
+        inicios_bordas=inicios_bordas
+    )
+
+
+def tamanho_arrays(arvores):
+    """Bytes ocupados pelos arrays do motor (o que vai para o pacote e para a memória)."""
+    nomes = ('feature', 'limiar', 'valor_folha', 'valor_no', 'inicios_classes', 'bordas', 'inicios_bordas')
+    return sum(getattr(arvores, nome).nbytes for nome in nomes if getattr(arvores, nome, None) is not None)
+
+
+# ============================
+# 📏 Avaliação
+# ============================
+def dados_avaliacao(preditor, caminho=CAMINHO_AVALIACAO):
+    """Matriz pré-processada e índice da classe verdadeira de cada linha do CSV bruto."""
+    bruto = pd.read_csv(caminho)
+    matriz = preditor.preprocessar_matriz(traduzir_codigos_brutos(bruto))
+    posicoes = {classe: i for i, classe in enumerate(preditor.classes)}
+    verdadeiro = np.array([posicoes[TRADUCOES_ALVO_BRUTO[rotulo]] for rotulo in bruto['Obesity']])
+    return matriz, verdadeiro
+
+
+def _latencia_ms(motor, X, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        motor.predict_proba(X)
+        tempos.append(time.perf_counter() - inicio)
+    return float(np.median(tempos)) * 1000
+
+
+def avaliar(motor, X, verdadeiro, decisao_completa):
+    """Paridade com o modelo completo, acurácia, tamanho e latência de um motor."""
+    decisao = motor.decision_function(X)
+    previsto = np.argmax(decisao, axis=1)
+    completo = np.argmax(decisao_completa, axis=1)
+    return {
+        'arvores': int(motor.n_arvores),
+        'bytes': tamanho_arrays(motor),
+        'divergencia': float(np.mean(previsto != completo)),
+        'acuracia': float(np.mean(previsto == verdadeiro)),
+        'desvio_proba': float(np.abs(softmax(decisao, axis=1) - softmax(decisao_completa, axis=1)).max()),
+        'latencia_1_ms': _latencia_ms(motor, X[:1], 200),
+        'latencia_1000_ms': _latencia_ms(motor, X[:1000], 5)
+    }
+
+
+def main():
+    from registro_modelos import DIRETORIO_PADRAO, TOLERANCIA_VARIANTE, carregar_versao
+
+    parser = argparse.ArgumentParser(description='Gera e compara variantes reduzidas do modelo')
+    parser.add_argument('--modelo-dir', default=DIRETORIO_PADRAO)
+    parser.add_argument('--estagios', type=int, nargs='+', default=ESTAGIOS_PADRAO)
+    parser.add_argument('--limiares', nargs='+', choices=LIMIARES, default=list(LIMIARES))
+    parser.add_argument('--sem-fusao', action='store_true', help='não funde árvores idênticas')
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_VARIANTE,
+                        help='fração máxima de rótulos diferentes do modelo completo no Obesity.csv')
+    parser.add_argument('--avaliacao', default=CAMINHO_AVALIACAO, help='CSV bruto com a coluna Obesity')
+    parser.add_argument('--saida', default='modelo_reduzido.obpkg',
+                        help='grava a menor variante dentro da tolerância')
+    args = parser.parse_args()
+
+    versao = carregar_versao(args.modelo_dir, backend='compilado', variante='')
+    preditor = versao.preditor
+    completo = preditor.motor
+    X, verdadeiro = dados_avaliacao(preditor, args.avaliacao)
+    decisao_completa = completo.decision_function(X)
+    acuracia_completo = float(np.mean(np.argmax(decisao_completa, axis=1) == verdadeiro))
+
+    print(f'Modelo {versao.versao}: {completo.n_arvores} árvores, {tamanho_arrays(completo) / 1024:,.0f} KB de arrays, '
+          f'acurácia {acuracia_completo:.2%} em {len(X):,} linhas de {os.path.basename(args.avaliacao)}')
+    print(f'{"limiares":<9}{"estágios":>9}{"árvores":>9}{"KB":>8}{"divergência":>13}{"Δacurácia":>11}'
+          f'{"Δproba máx":>12}{"1 linha (ms)":>14}{"1000 (ms)":>11}')
+    referencia = avaliar(completo, X, verdadeiro, decisao_completa)
+    print(f'{"completo":<9}{completo.n_estagios:>9}{referencia["arvores"]:>9}{referencia["bytes"] / 1024:>8.1f}'
+          f'{0:>13.2%}{0:>+11.2%}{0:>12.1e}{referencia["latencia_1_ms"]:>14.3f}{referencia["latencia_1000_ms"]:>11.1f}')
+
+    escolhida = None
+    for limiares in args.limiares:
+        for estagios in sorted(set(args.estagios)):
+            motor = reduzir(completo, estagios, limiares, fundir=not args.sem_fusao, n_features=X.shape[1])
+            r = avaliar(motor, X, verdadeiro, decisao_completa)
+            dentro = r['divergencia'] <= args.tolerancia
+            print(f'{limiares:<9}{motor.n_estagios:>9}{r["arvores"]:>9}{r["bytes"] / 1024:>8.1f}'
+                  f'{r["divergencia"]:>13.2%}{r["acuracia"] - acuracia_completo:>+11.2%}{r["desvio_proba"]:>12.1e}'
+                  f'{r["latencia_1_ms"]:>14.3f}{r["latencia_1000_ms"]:>11.1f}{"" if dentro else "  ✗"}')
+            if dentro and (escolhida is None or r['bytes'] < escolhida[2]['bytes']):
+                escolhida = (motor, limiares, r)
+
+    if escolhida is None:
+        print(f'\nNenhuma variante dentro da tolerância de {args.tolerancia:.2%}; nada gravado.')
+        return
+    motor, limiares, r = escolhida
+    reducao = {
+        'modelo_base': versao.versao,
+        'estagios': motor.n_estagios,
+        'limiares': limiares,
+        'arvores': r['arvores'],
+        'divergencia': r['divergencia'],
+        'acuracia': r['acuracia'],
+        'acuracia_completo': acuracia_completo,
+        'desvio_proba': r['desvio_proba'],
+        'linhas_avaliacao': len(X)
+    }
+    salvar_pacote(
+        args.saida, motor, preditor.preprocessador, preditor.classes,
+        f'{versao.versao}-{limiares}-e{motor.n_estagios}', reducao
+    )
+    print(f'\nVariante {limiares}/{motor.n_estagios} estágios gravada em {os.path.abspath(args.saida)} '
+          f'({os.path.getsize(args.saida) / 1024:,.0f} KB)')
+
+
+if __name__ == '__main__':
+    main()
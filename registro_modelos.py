@@ -0,0 +1,351 @@
+# ============================
+# 📦 Registro de Modelos — artefatos carregados uma vez por processo
+# ============================
+
+import hashlib
+import os
+import threading
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.exceptions import InconsistentVersionWarning
+
+from arvores_compiladas import verificar_paridade
+from cache_compartilhado import espaco_padrao
+from cache_predicoes import CachePredicoes
+from metricas import metricas
+from pacote_modelo import ErroPacote, carregar_pacote
+from preditor import (
+    COLUNAS_CATEGORICAS, COLUNAS_ENTRADA, COLUNAS_NUMERICAS, PreditorObesidade, traduzir_codigos_brutos
+)
+from tabela_predicoes import carregar_tabela_da_versao
+
+# Diretório com os cinco joblib ou caminho de um pacote .obpkg (ver pacote_modelo.py)
+DIRETORIO_PADRAO = os.environ.get(
+    'OBESIDADE_MODELO_DIR', os.path.dirname(os.path.abspath(__file__))
+)
+
+# 🌲 'sklearn' (padrão) ou 'compilado' — ver arvores_compiladas.py
+BACKEND_PADRAO = os.environ.get('OBESIDADE_BACKEND', 'sklearn')
+
+# 🪶 Variante reduzida (pacote gerado por reduzir_modelo.py) servida no lugar do modelo completo
+VARIANTE_PADRAO = os.environ.get('OBESIDADE_VARIANTE') or None
+# Fração máxima de rótulos diferentes do modelo completo, medida na carga sobre a amostra abaixo
+TOLERANCIA_VARIANTE = float(os.environ.get('OBESIDADE_TOLERANCIA_VARIANTE', '0.01'))
+AMOSTRA_VARIANTE = os.environ.get(
+    'OBESIDADE_AMOSTRA_VARIANTE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Obesity.csv')
+)
+# 'completo': variante ausente, de outro modelo ou fora da tolerância → modelo completo; 'erro': falha
+FALLBACK_VARIANTE = os.environ.get('OBESIDADE_FALLBACK_VARIANTE', 'completo')
+
+ARQUIVOS_ARTEFATOS = {
+    'modelo': 'modelo_obesidade.joblib',
+    'scaler': 'scaler.joblib',
+    'label_encoders': 'labelencoders.joblib',
+    'label_encoder_target': 'labelencoder_target.joblib',
+    'features': 'features.joblib'
+}
+
+
+class ErroArtefato(RuntimeError):
+    """Artefato ausente, incompatível com o scikit-learn instalado ou inconsistente."""
+
+
+# catch_warnings troca o estado global do módulo warnings: uma carga por vez no processo
+_TRAVA_AVISOS = threading.Lock()
+
+
+# ============================
+# 🔍 Carga e Validação
+# ============================
+def impressao_digital(diretorio):
+    """(mtime_ns, tamanho) de cada artefato — barato o suficiente para checar a cada rerun."""
+    if os.path.isfile(diretorio):
+        info = os.stat(diretorio)
+        return ((os.path.basename(diretorio), info.st_mtime_ns, info.st_size),)
+    impressao = []
+    for arquivo in ARQUIVOS_ARTEFATOS.values():
+        info = os.stat(os.path.join(diretorio, arquivo))
+        impressao.append((arquivo, info.st_mtime_ns, info.st_size))
+    return tuple(impressao)
+
+
+def _impressao_variante(caminho):
+    # Variante ausente também entra na impressão: criá-la no disco dispara a recarga
+    try:
+        return impressao_digital(caminho)
+    except FileNotFoundError:
+        return ((os.path.basename(caminho), None, None),)
+
+
+def _carregar_artefatos(diretorio):
+    artefatos = {}
+    with _TRAVA_AVISOS:
+        with warnings.catch_warnings(record=True) as avisos:
+            warnings.simplefilter('always', InconsistentVersionWarning)
+            for nome, arquivo in ARQUIVOS_ARTEFATOS.items():
+                caminho = os.path.join(diretorio, arquivo)
+                if not os.path.exists(caminho):
+                    raise ErroArtefato(f'Artefato não encontrado: {caminho}')
+                artefatos[nome] = joblib.load(caminho)
+
+    # Avisos de outras threads capturados durante a carga voltam ao fluxo normal
+    for aviso in avisos:
+        if not issubclass(aviso.category, InconsistentVersionWarning):
+            warnings.warn_explicit(aviso.message, aviso.category, aviso.filename, aviso.lineno)
+    versoes = {
+        str(aviso.message.original_sklearn_version)
+        for aviso in avisos
+        if issubclass(aviso.category, InconsistentVersionWarning)
+    }
+    if versoes:
+        raise ErroArtefato(
+            f'Artefatos gerados com scikit-learn {sorted(versoes)}, '
+            f'mas o ambiente tem {sklearn.__version__}.'
+        )
+    return artefatos
+
+
+def validar_artefatos(artefatos):
+    """Confere se modelo, scaler, encoders e lista de features descrevem o mesmo esquema."""
+    features = list(artefatos['features'])
+    modelo = artefatos['modelo']
+
+    if sorted(features) != sorted(COLUNAS_ENTRADA):
+        raise ErroArtefato(f'features.joblib não corresponde ao formulário: {features}')
+    nomes_modelo = list(getattr(modelo, 'feature_names_in_', features))
+    if nomes_modelo != features:
+        raise ErroArtefato(f'Ordem de features do modelo difere de features.joblib: {nomes_modelo}')
+    nomes_scaler = list(getattr(artefatos['scaler'], 'feature_names_in_', COLUNAS_NUMERICAS))
+    if nomes_scaler != COLUNAS_NUMERICAS:
+        raise ErroArtefato(f'Colunas do scaler inesperadas: {nomes_scaler}')
+    faltantes = [col for col in COLUNAS_CATEGORICAS if col not in artefatos['label_encoders']]
+    if faltantes:
+        raise ErroArtefato(f'LabelEncoders ausentes para: {faltantes}')
+    if len(modelo.classes_) != len(artefatos['label_encoder_target'].classes_):
+        raise ErroArtefato('Número de classes do modelo difere do encoder do alvo.')
+
+
+class VersaoModelo:
+    """Uma versão carregada e validada dos artefatos, pronta para inferência."""
+
+    def __init__(self, versao, diretorio, preditor, impressao, duracao_carga, variante=None):
+        self.versao = versao
+        self.diretorio = diretorio
+        self.preditor = preditor
+        self.impressao = impressao
+        self.duracao_carga = duracao_carga
+        self.variante = variante  # caminho da variante reduzida em uso, se houver
+        self.variante_pedida = variante  # variante configurada, mesmo se recusada na carga
+        self.carregado_em = time.time()
+        metricas.observar('etapa', duracao_carga, etapa='carga_artefatos')
+
+
+def _cache_predicoes(versao):
+    # 🤝 Com OBESIDADE_CACHE_DIR, as réplicas do nó compartilham as predições da mesma versão
+    cache = CachePredicoes()
+    cache.compartilhado = espaco_padrao(f'predicoes:{versao}', cache.ttl_segundos)
+    return cache
+
+
+def _carregar_versao_pacote(caminho, versao, inicio):
+    # 📦 Pacote único mapeado em memória: o sklearn não participa da inferência
+    impressao = impressao_digital(caminho)
+    try:
+        pacote = carregar_pacote(caminho)
+    except ErroPacote as erro:
+        raise ErroArtefato(str(erro)) from erro
+    versao = versao or pacote.versao
+    preditor = PreditorObesidade.de_pacote(pacote, cache=_cache_predicoes(versao))
+    preditor.tabela = carregar_tabela_da_versao(versao)
+    return VersaoModelo(versao, caminho, preditor, impressao, time.perf_counter() - inicio)
+
+
+def _versao_base(diretorio):
+    # Mesma versão que carregar_versao atribuiria ao modelo completo, sem desserializá-lo
+    if os.path.isfile(diretorio):
+        return carregar_pacote(diretorio, verificar=False).versao
+    with open(os.path.join(diretorio, ARQUIVOS_ARTEFATOS['modelo']), 'rb') as arquivo:
+        return hashlib.sha256(arquivo.read()).hexdigest()[:12]
+
+
+def _conferir_variante(completo, reduzido, tolerancia, amostra=AMOSTRA_VARIANTE):
+    """Mede, na carga, a divergência da variante contra o modelo completo nas linhas da amostra."""
+    try:
+        dados = traduzir_codigos_brutos(pd.read_csv(amostra))
+    except (OSError, ValueError) as erro:
+        raise ErroArtefato(f'Amostra de conferência {amostra} ilegível: {erro}') from erro
+    X = completo.preprocessar_matriz(dados)
+    if not np.array_equal(X, reduzido.preprocessar_matriz(dados)):
+        raise ErroArtefato('Pré-processamento da variante difere do modelo completo.')
+    try:
+        # Árvores achatadas do completo: mesmas predições do sklearn, sem DataFrame por chamada
+        return verificar_paridade(
+            completo._arvores_explicacao(), reduzido.motor, X, tolerancia=1.0, tolerancia_rotulos=tolerancia
+        )
+    except AssertionError as erro:
+        raise ErroArtefato(f'Variante: {erro}') from None
+
+
+def _carregar_variante(completa, variante, inicio, tolerancia, fallback):
+    """Versão servida pela variante reduzida, ou None para seguir com o modelo completo."""
+    try:
+        pacote = carregar_pacote(variante)
+        reducao = pacote.reducao
+        if reducao is None:
+            raise ErroArtefato(f'{variante} não é uma variante reduzida (gere com reduzir_modelo.py).')
+        base = _versao_base(completa.diretorio)
+        if reducao['modelo_base'] != base:
+            raise ErroArtefato(f'Variante gerada para o modelo {reducao["modelo_base"]}, mas o completo é {base}.')
+        preditor = PreditorObesidade.de_pacote(pacote)
+        # 🔬 Não confia na divergência gravada no cabeçalho: mede de novo contra o completo
+        _conferir_variante(completa.preditor, preditor, tolerancia)
+    except (ErroPacote, ErroArtefato, OSError) as erro:
+        if fallback == 'erro':
+            raise ErroArtefato(str(erro)) from erro
+        # 🛟 Modelo completo no lugar da variante
+        warnings.warn(f'{erro} Usando o modelo completo.', RuntimeWarning, stacklevel=3)
+        metricas.incrementar('fallback_variante')
+        return None
+    preditor.cache = _cache_predicoes(pacote.versao)
+    impressao = completa.impressao + _impressao_variante(variante)
+    return VersaoModelo(pacote.versao, completa.diretorio, preditor, impressao, time.perf_counter() - inicio, variante)
+
+
+def _carregar_completa(diretorio, versao, backend, inicio):
+    if os.path.isfile(diretorio):
+        return _carregar_versao_pacote(diretorio, versao, inicio)
+    impressao = impressao_digital(diretorio)
+    artefatos = _carregar_artefatos(diretorio)
+    validar_artefatos(artefatos)
+    if versao is None:
+        versao = _versao_base(diretorio)
+    preditor = PreditorObesidade(
+        **artefatos, cache=_cache_predicoes(versao), backend=backend or BACKEND_PADRAO
+    )
+    preditor.tabela = carregar_tabela_da_versao(versao)
+    return VersaoModelo(versao, diretorio, preditor, impressao, time.perf_counter() - inicio)
+
+
+def carregar_versao(diretorio, versao=None, backend=None, variante=None,
+                    tolerancia=TOLERANCIA_VARIANTE, fallback=FALLBACK_VARIANTE):
+    """Carrega e valida os artefatos de um diretório (ou pacote .obpkg), sem tocar no registro.
+
+    Com uma `variante` (padrão: OBESIDADE_VARIANTE; '' desliga), serve o pacote reduzido se
+    ele foi gerado para este modelo e, medido na carga sobre AMOSTRA_VARIANTE, diverge dele
+    no máximo `tolerancia`; senão, conforme `fallback`, segue com o modelo completo ou
+    levanta ErroArtefato.
+    """
+    inicio = time.perf_counter()
+    variante = VARIANTE_PADRAO if variante is None else variante
+    if variante and fallback not in ('completo', 'erro'):
+        raise ValueError(f'Fallback desconhecido: {fallback!r} (opções: completo, erro)')
+    completa = _carregar_completa(diretorio, versao, backend, inicio)
+    if variante:
+        # O completo é carregado de qualquer forma: é a referência da conferência e o fallback
+        versao_variante = _carregar_variante(completa, variante, inicio, tolerancia, fallback)
+        if versao_variante is not None:
+            return versao_variante
+        # 👀 A variante recusada continua vigiada: corrigi-la no disco dispara a recarga
+        completa.impressao += _impressao_variante(variante)
+        completa.variante_pedida = variante
+    return completa
+
+
+# ============================
+# 🗂️ Registro
+# ============================
+class RegistroModelos:
+    """Mantém as versões carregadas e a versão ativa, compartilhadas entre sessões e threads.
+
+    Leituras não bloqueiam: a versão ativa é trocada por atribuição atômica depois que
+    a nova versão foi totalmente carregada e validada.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_PADRAO):
+        self.diretorio = diretorio
+        self._versoes = {}
+        self._ativa = None
+        self._trava = threading.Lock()
+
+    @property
+    def ativa(self):
+        ativa = self._ativa
+        if ativa is None:
+            with self._trava:
+                if self._ativa is None:
+                    self._registrar(carregar_versao(self.diretorio), ativar=True)
+                ativa = self._ativa
+        return ativa
+
+    @property
+    def preditor(self):
+        return self.ativa.preditor
+
+    def versoes(self):
+        return sorted(self._versoes)
+
+    def _registrar(self, versao_modelo, ativar):
+        self._versoes[versao_modelo.versao] = versao_modelo
+        if ativar:
+            self._ativa = versao_modelo
+
+    def carregar(self, diretorio, versao=None, ativar=False, backend=None):
+        """Carrega uma nova versão; com `ativar=True` faz o hot-swap sem reiniciar o servidor."""
+        versao_modelo = carregar_versao(diretorio, versao, backend)
+        with self._trava:
+            self._registrar(versao_modelo, ativar)
+        return versao_modelo
+
+    def ativar(self, versao):
+        with self._trava:
+            if versao not in self._versoes:
+                raise KeyError(f'Versão não registrada: {versao}')
+            self._ativa = self._versoes[versao]
+
+    def atualizar_se_modificado(self):
+        """Recarrega a versão ativa se os arquivos no disco mudaram. Retorna True se trocou."""
+        ativa = self.ativa
+        try:
+            impressao = impressao_digital(ativa.diretorio)
+            if ativa.variante_pedida:
+                impressao += _impressao_variante(ativa.variante_pedida)
+        except FileNotFoundError:
+            return False
+        if impressao == ativa.impressao:
+            return False
+        with self._trava:
+            if self._ativa is not ativa:
+                return True
+            # A variante é servida pelo backend 'pacote'; o completo volta ao backend padrão
+            backend = None if ativa.variante else ativa.preditor.backend
+            try:
+                self._registrar(
+                    carregar_versao(ativa.diretorio, backend=backend, variante=ativa.variante_pedida or ''), ativar=True
+                )
+            except (ErroArtefato, OSError, EOFError):
+                # 🛟 Arquivos em escrita ou inválidos: mantém a versão atual
+                return False
+        return True
+
+
+registro = RegistroModelos()
+
+
+def _estatisticas_cache_ativo():
+    ativa = registro._ativa
+    if ativa is None or ativa.preditor.cache is None:
+        return None
+    return ativa.preditor.cache.estatisticas()
+
+
+metricas.registrar_estatisticas('cache_predicoes', _estatisticas_cache_ativo, 'Cache de predições da versão ativa')
+
+
+def obter_preditor():
+    """Preditor da versão ativa do registro global do processo."""
+    return registro.preditor
@@ -0,0 +1,152 @@
+# ============================
+# 🌐 Serviço HTTP de Predição — sem Streamlit, só biblioteca padrão
+# Uso: python servico_http.py [--host 0.0.0.0 --porta 8000 --workers 4]
+# ============================
+
+import argparse
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agrupador_predicoes import JANELA_MS_PADRAO, MAX_LOTE_PADRAO, AgrupadorPredicoes
+from metricas import metricas
+from registro_modelos import registro
+
+TAMANHO_MAXIMO_CORPO = 32 * 1024 * 1024
+
+
+def _resultados(rotulos, proba):
+    return [
+        {'classe': rotulo, 'probabilidades': dict(zip(proba.columns, map(float, linha)))}
+        for rotulo, linha in zip(rotulos, proba.to_numpy())
+    ]
+
+
+def prever_registros(registros):
+    """Classe + probabilidades por registro, via o mesmo preditor do app."""
+    registro.atualizar_se_modificado()
+    rotulos, proba = registro.preditor.prever_com_proba(registros)
+    return _resultados(rotulos, proba)
+
+
+class ManipuladorPredicao(BaseHTTPRequestHandler):
+    """Rotas: GET /health, GET /metrics, POST /predict (um registro) e POST /predict/batch (lista)."""
+
+    pool = None
+    agrupador = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, formato, *args):
+        pass
+
+    def _responder(self, status, corpo, tipo='application/json; charset=utf-8'):
+        if isinstance(corpo, str):
+            dados = corpo.encode('utf-8')
+        else:
+            dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+        self._status = status
+        self.send_response(status)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _ler_json(self):
+        tamanho = int(self.headers.get('Content-Length') or 0)
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ValueError('Corpo da requisição muito grande.')
+        return json.loads(self.rfile.read(tamanho) or b'null')
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._responder(200, {'status': 'ok', 'versao_modelo': registro.ativa.versao})
+        elif self.path == '/metrics':
+            if not metricas.ativo:
+                self._responder(404, {'erro': 'Métricas desligadas (OBESIDADE_METRICAS=0).'})
+            else:
+                self._responder(200, metricas.exportar_prometheus(), 'text/plain; version=0.0.4; charset=utf-8')
+        else:
+            self._responder(404, {'erro': f'Rota não encontrada: {self.path}'})
+
+    def do_POST(self):
+        # Rotas desconhecidas num só rótulo, para não multiplicar séries
+        rota = self.path if self.path in ('/predict', '/predict/batch') else 'outra'
+        self._status = 500  # se nem a resposta de erro sair (cliente desconectado), conta como 500
+        try:
+            with metricas.medir('requisicao_http', rota=rota):
+                self._atender_post()
+        finally:
+            metricas.incrementar('requisicoes_http', rota=rota, status=self._status)
+
+    def _atender_post(self):
+        if self.path not in ('/predict', '/predict/batch'):
+            self._responder(404, {'erro': f'Rota não encontrada: {self.path}'})
+            return
+        try:
+            corpo = self._ler_json()
+            if self.path == '/predict':
+                if not isinstance(corpo, dict):
+                    raise ValueError('Esperado um objeto JSON com os campos do formulário.')
+                registros = [corpo]
+            else:
+                registros = corpo.get('registros') if isinstance(corpo, dict) else corpo
+                if not isinstance(registros, list) or not registros:
+                    raise ValueError('Esperada uma lista não vazia em "registros".')
+
+            if self.agrupador is not None and self.path == '/predict':
+                resultados = [self.agrupador.prever(corpo)]
+            else:
+                resultados = self.pool.submit(prever_registros, registros).result()
+        except (ValueError, TypeError) as erro:
+            self._responder(400, {'erro': str(erro)})
+            return
+        except Exception as erro:
+            # 🧯 Troca de artefatos, worker ou agrupador falhou: o cliente ainda recebe uma resposta
+            self._responder(500, {'erro': f'Erro interno: {type(erro).__name__}: {erro}'})
+            return
+
+        if self.path == '/predict':
+            self._responder(200, {**resultados[0], 'versao_modelo': registro.ativa.versao})
+        else:
+            self._responder(200, {'resultados': resultados, 'versao_modelo': registro.ativa.versao})
+
+
+def criar_servidor(host='127.0.0.1', porta=8000, workers=4, janela_ms=JANELA_MS_PADRAO,
+                   max_lote=MAX_LOTE_PADRAO):
+    """Servidor pronto para `serve_forever()`; o modelo é carregado antes de aceitar conexões.
+
+    Com `janela_ms > 0`, requisições simultâneas em /predict são agrupadas em lotes.
+    """
+    registro.ativa
+    agrupador = AgrupadorPredicoes(prever_registros, janela_ms, max_lote) if janela_ms > 0 else None
+    if agrupador is not None:
+        metricas.registrar_estatisticas('agrupador', agrupador.estatisticas, 'Micro-lotes de /predict')
+    manipulador = type('Manipulador', (ManipuladorPredicao,), {
+        'pool': ThreadPoolExecutor(max_workers=workers, thread_name_prefix='inferencia'),
+        'agrupador': agrupador
+    })
+    return ThreadingHTTPServer((host, porta), manipulador)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serviço HTTP de predição de obesidade')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=4, help='inferências simultâneas')
+    parser.add_argument('--janela-ms', type=float, default=JANELA_MS_PADRAO,
+                        help='janela de agrupamento de /predict (0 desliga)')
+    parser.add_argument('--max-lote', type=int, default=MAX_LOTE_PADRAO)
+    args = parser.parse_args()
+
+    servidor = criar_servidor(args.host, args.porta, args.workers, args.janela_ms, args.max_lote)
+    print(f'Servindo em http://{args.host}:{args.porta} (modelo {registro.ativa.versao})')
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
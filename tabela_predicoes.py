@@ -0,0 +1,281 @@
+# ============================
+# 🗂️ Tabela de Predições — respostas pré-computadas nas células de uma grade quantizada
+# Uso: python tabela_predicoes.py [--saida tabela_predicoes.npz --vizinhanca 2]
+# ============================
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from preditor import (
+    COLUNAS_ENTRADA, LIMITES_NUMERICOS, OPCOES_ENTRADA, ORDEM_CLASSES, traduzir_codigos_brutos
+)
+
+# 📂 Com OBESIDADE_TABELA apontando para uma tabela da versão ativa, o app e o serviço HTTP
+# respondem pelas células da grade e só caem na inferência fora dela
+CAMINHO_TABELA = os.environ.get('OBESIDADE_TABELA') or None
+
+# 🎯 Distância máxima (em passos) até o ponto da grade. 0 = só entradas exatamente na grade;
+# 0.5 arredonda qualquer entrada para a célula mais próxima (aproximação opcional)
+TOLERANCIA_GRADE = float(os.environ.get('OBESIDADE_TABELA_TOLERANCIA', '0'))
+
+# 📏 Grade: limites do formulário e passo de cada numérica (os mesmos passos dos widgets)
+PASSOS = {
+    'idade': 1.0,
+    'altura': 0.01,
+    'peso': 0.1,
+    'qtde_refeicoes_principais': 1.0,
+    'qtde_agua_diaria': 0.1,
+    'tempo_uso_dispositivos': 0.5
+}
+GRADE = {col: (*LIMITES_NUMERICOS[col], passo) for col, passo in PASSOS.items()}
+OPCOES = OPCOES_ENTRADA
+
+# Vizinhança materializada em volta de cada perfil observado: as numéricas com mais limiares
+# nas árvores (onde a predição muda mais depressa)
+COLUNAS_VIZINHANCA = ['peso', 'altura', 'idade']
+
+VERSAO_FORMATO = 2
+
+
+def _tamanhos():
+    return [
+        int(round((GRADE[col][1] - GRADE[col][0]) / GRADE[col][2])) + 1 if col in GRADE else len(OPCOES[col])
+        for col in COLUNAS_ENTRADA
+    ]
+
+
+_TAMANHOS = _tamanhos()
+_CODIGOS_OPCOES = {col: {opcao: i for i, opcao in enumerate(opcoes)} for col, opcoes in OPCOES.items()}
+
+
+def indices_grade(dados, tolerancia=TOLERANCIA_GRADE):
+    """Índice de cada registro em cada eixo da grade; −1 fora dela (categoria desconhecida,
+    numérica fora dos limites ou a mais de `tolerancia` passos do ponto da grade)."""
+    indices = np.empty((len(dados), len(COLUNAS_ENTRADA)), dtype='int64')
+    for j, col in enumerate(COLUNAS_ENTRADA):
+        if col in GRADE:
+            minimo, maximo, passo = GRADE[col]
+            posicao = (pd.to_numeric(dados[col], errors='coerce').to_numpy(dtype='float64') - minimo) / passo
+            indice = np.rint(np.nan_to_num(posicao, nan=-1.0))
+            fora = (
+                ~np.isfinite(posicao) | (indice < 0) | (indice > round((maximo - minimo) / passo))
+                | (np.abs(posicao - indice) > tolerancia + 1e-9)
+            )
+            indices[:, j] = np.where(fora, -1, indice)
+        else:
+            indices[:, j] = pd.Categorical(dados[col], categories=OPCOES[col]).codes
+    return indices
+
+
+def _chave_registro(registro, tolerancia=TOLERANCIA_GRADE):
+    # Mesma chave de `_chaves(indices_grade(...))`, em Python puro: para um registro, o
+    # pandas custaria milissegundos só de montagem
+    chave = 0
+    for col, tamanho in zip(COLUNAS_ENTRADA, _TAMANHOS):
+        if col in GRADE:
+            minimo, _, passo = GRADE[col]
+            try:
+                posicao = (float(registro[col]) - minimo) / passo
+            except (KeyError, TypeError, ValueError):
+                return None
+            indice = round(posicao) if posicao == posicao and abs(posicao) != float('inf') else -1
+            if indice < 0 or indice >= tamanho or abs(posicao - indice) > tolerancia + 1e-9:
+                return None
+        else:
+            indice = _CODIGOS_OPCOES[col].get(registro.get(col), -1)
+            if indice < 0:
+                return None
+        chave = chave * tamanho + indice
+    return chave
+
+
+def _chaves(indices):
+    # Raiz mista: cabe em int64 (o produto dos tamanhos dos eixos é ~10^15)
+    chaves = np.zeros(len(indices), dtype='int64')
+    for j, tamanho in enumerate(_tamanhos()):
+        chaves = chaves * tamanho + indices[:, j]
+    return chaves
+
+
+def _centros(chaves):
+    """Registros (DataFrame) no ponto da grade de cada chave."""
+    colunas = {}
+    for col, tamanho in reversed(list(zip(COLUNAS_ENTRADA, _tamanhos()))):
+        indice = chaves % tamanho
+        chaves = chaves // tamanho
+        if col in GRADE:
+            minimo, _, passo = GRADE[col]
+            colunas[col] = np.round(minimo + indice * passo, 6)
+        else:
+            colunas[col] = np.asarray(OPCOES[col], dtype=object)[indice]
+    return pd.DataFrame({col: colunas[col] for col in COLUNAS_ENTRADA})
+
+
+def celulas_da_populacao(dados, vizinhanca=2):
+    """Chaves das células ocupadas por `dados` e das vizinhas a ±`vizinhanca` passos em
+    COLUNAS_VIZINHANCA. O produto completo (opções × passos) passa de 10^14 células."""
+    indices = indices_grade(dados)
+    indices = np.unique(indices[(indices >= 0).all(axis=1)], axis=0)
+    deslocamentos = np.arange(-vizinhanca, vizinhanca + 1)
+    limites = dict(zip(COLUNAS_ENTRADA, _tamanhos()))
+    for col in COLUNAS_VIZINHANCA:
+        j = COLUNAS_ENTRADA.index(col)
+        expandidos = np.repeat(indices, len(deslocamentos), axis=0)
+        expandidos[:, j] += np.tile(deslocamentos, len(indices))
+        indices = expandidos[(expandidos[:, j] >= 0) & (expandidos[:, j] < limites[col])]
+    return np.unique(_chaves(indices))
+
+
+class TabelaPredicoes:
+    """Chaves ordenadas (int64) das células + código do rótulo (uint8), probabilidades e
+    contribuições (float32). O rótulo é o do modelo, não o argmax das probabilidades gravadas.
+
+    A consulta é uma busca binária vetorizada: O(log n) em C, alguns microssegundos por
+    registro, sem travessia das árvores. Células ausentes e entradas fora da grade voltam
+    como faltas, para a inferência ao vivo.
+    """
+
+    def __init__(self, chaves, rotulos, probabilidades, contribuicoes, classes, features, versao_modelo,
+                 tolerancia=TOLERANCIA_GRADE):
+        self.chaves = chaves
+        self.rotulos = rotulos
+        self.probabilidades = probabilidades
+        self.contribuicoes = contribuicoes
+        self.classes = np.asarray(classes, dtype=object)
+        self.features = list(features)
+        self.versao_modelo = versao_modelo
+        self.tolerancia = tolerancia
+        self._ordem = [list(self.classes).index(classe) for classe in ORDEM_CLASSES]
+
+    def __len__(self):
+        return len(self.chaves)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.chaves, self.rotulos, self.probabilidades, self.contribuicoes))
+
+    @classmethod
+    def construir(cls, preditor, chaves, versao_modelo, tamanho_lote=100_000):
+        """Pontua o ponto da grade de cada chave em lotes (travessia vetorizada das árvores)."""
+        chaves = np.unique(chaves)
+        rotulos = np.empty(len(chaves), dtype='uint8')
+        probabilidades = np.empty((len(chaves), len(preditor.classes)), dtype='float32')
+        contribuicoes = np.empty((len(chaves), len(preditor.features)), dtype='float32')
+        codigos = {classe: i for i, classe in enumerate(preditor.classes)}
+        ordem = [list(preditor.classes).index(classe) for classe in ORDEM_CLASSES]
+        for inicio in range(0, len(chaves), tamanho_lote):
+            fatia = slice(inicio, inicio + tamanho_lote)
+            rotulo, proba, contribuicao = preditor.prever_explicado(_centros(chaves[fatia]))
+            rotulos[fatia] = [codigos[r] for r in rotulo]
+            probabilidades[fatia][:, ordem] = proba.to_numpy()
+            contribuicoes[fatia] = contribuicao.to_numpy()
+        return cls(chaves, rotulos, probabilidades, contribuicoes, preditor.classes, preditor.features, versao_modelo)
+
+    # ============================
+    # 💾 Persistência
+    # ============================
+    def salvar(self, caminho):
+        metadados = {
+            'versao_formato': VERSAO_FORMATO, 'versao_modelo': self.versao_modelo,
+            'classes': list(self.classes), 'features': self.features,
+            'grade': GRADE, 'opcoes': OPCOES, 'colunas': COLUNAS_ENTRADA
+        }
+        temporario = f'{caminho}.{os.getpid()}.tmp.npz'
+        np.savez(
+            temporario, chaves=self.chaves, rotulos=self.rotulos, probabilidades=self.probabilidades,
+            contribuicoes=self.contribuicoes, metadados=np.array(json.dumps(metadados, ensure_ascii=False))
+        )
+        os.replace(temporario, caminho)
+        return caminho
+
+    @classmethod
+    def carregar(cls, caminho, tolerancia=TOLERANCIA_GRADE):
+        with np.load(caminho) as arquivo:
+            metadados = json.loads(str(arquivo['metadados']))
+            esperado = {'grade': GRADE, 'opcoes': OPCOES, 'colunas': COLUNAS_ENTRADA}
+            atual = {chave: metadados[chave] for chave in esperado}
+            if metadados['versao_formato'] != VERSAO_FORMATO or json.loads(json.dumps(esperado)) != atual:
+                raise ValueError(f'Tabela {caminho} foi gerada com outra grade ou outro formato.')
+            return cls(
+                arquivo['chaves'], arquivo['rotulos'], arquivo['probabilidades'], arquivo['contribuicoes'],
+                metadados['classes'], metadados['features'], metadados['versao_modelo'], tolerancia
+            )
+
+    # ============================
+    # 🔎 Consulta
+    # ============================
+    def localizar(self, dados):
+        """Posição de cada registro na tabela, ou −1 (fora da grade ou célula não materializada)."""
+        indices = indices_grade(dados, self.tolerancia)
+        validos = (indices >= 0).all(axis=1)
+        posicoes = np.full(len(dados), -1, dtype='int64')
+        if validos.any():
+            posicoes[validos] = self._posicoes(_chaves(indices[validos]))
+        return posicoes
+
+    def _posicoes(self, chaves):
+        encontradas = np.searchsorted(self.chaves, chaves).clip(0, len(self.chaves) - 1)
+        return np.where(self.chaves[encontradas] == chaves, encontradas, -1)
+
+    def linhas(self, registros, tipo):
+        """Resultados por registro no formato das linhas do preditor ('explicado' ou
+        'rotulo_proba'), com None nas faltas."""
+        chaves = [_chave_registro(registro, self.tolerancia) for registro in registros]
+        validas = [chave for chave in chaves if chave is not None]
+        encontradas = iter(self._posicoes(np.array(validas, dtype='int64')) if validas else ())
+        posicoes = [-1 if chave is None else next(encontradas) for chave in chaves]
+        resultado = []
+        for posicao in posicoes:
+            if posicao < 0:
+                resultado.append(None)
+            elif tipo == 'rotulo_proba':
+                resultado.append((self.classes[self.rotulos[posicao]], self.probabilidades[posicao].astype('float64')))
+            else:
+                resultado.append((
+                    self.classes[self.rotulos[posicao]],
+                    self.probabilidades[posicao, self._ordem].astype('float64'),
+                    self.contribuicoes[posicao].astype('float64')
+                ))
+        return resultado
+
+
+def carregar_tabela_da_versao(versao_modelo, caminho=CAMINHO_TABELA):
+    """Tabela em `caminho` se ela foi gerada para `versao_modelo`; senão None (inferência ao vivo)."""
+    if caminho is None or not os.path.exists(caminho):
+        return None
+    try:
+        tabela = TabelaPredicoes.carregar(caminho)
+    except (ValueError, KeyError, OSError):
+        return None  # 🛟 tabela de outra grade ou corrompida: segue só com a inferência
+    return tabela if tabela.versao_modelo == versao_modelo else None
+
+
+def main():
+    from registro_modelos import DIRETORIO_PADRAO, carregar_versao
+
+    parser = argparse.ArgumentParser(description='Pré-computa predições sobre a grade do formulário')
+    parser.add_argument('--modelo-dir', default=DIRETORIO_PADRAO)
+    parser.add_argument('--populacao', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Obesity.csv'),
+                        help='CSV no formato do Obesity.csv cujos perfis definem as células materializadas')
+    parser.add_argument('--vizinhanca', type=int, default=2, help='passos em volta de cada perfil (peso, altura, idade)')
+    parser.add_argument('--saida', default='tabela_predicoes.npz')
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    versao = carregar_versao(args.modelo_dir)
+    versao.preditor.cache = None
+    populacao = traduzir_codigos_brutos(pd.read_csv(args.populacao))
+    chaves = celulas_da_populacao(populacao, args.vizinhanca)
+    tabela = TabelaPredicoes.construir(versao.preditor, chaves, versao.versao)
+    tabela.salvar(args.saida)
+    print(f'{len(tabela):,} células, {os.path.getsize(args.saida) / 2 ** 20:.1f} MB em disco, '
+          f'versão {versao.versao}, {time.perf_counter() - inicio:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+# ============================
+# 🧪 Fixtures compartilhadas — artefatos do modelo e dados de conferência
+# ============================
+
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.sintetico import gerar_dataframe
+from preditor import PreditorObesidade, traduzir_codigos_brutos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def preditor_sklearn():
+    return PreditorObesidade.carregar(RAIZ)
+
+
+@pytest.fixture(scope='session')
+def base_obesity():
+    """Obesity.csv traduzido para o vocabulário do formulário, sem o alvo."""
+    base = traduzir_codigos_brutos(pd.read_csv(os.path.join(RAIZ, 'Obesity.csv')))
+    return base.drop(columns=['nivel_obesidade'])
+
+
+@pytest.fixture(scope='session')
+def sintetico():
+    """Perfis sintéticos com valores fora da grade do Obesity.csv."""
+    return traduzir_codigos_brutos(gerar_dataframe(20_000, 3))
@@ -0,0 +1,78 @@
+# ============================
+# 📦 Pacote de modelo e variantes reduzidas — arquivos corrompidos e fallback do registro
+# ============================
+
+import json
+import struct
+import warnings
+
+import pytest
+
+from pacote_modelo import MAGICA, ErroPacote, carregar_pacote, converter_artefatos
+from registro_modelos import ErroArtefato, RegistroModelos, carregar_versao
+from tests.conftest import RAIZ
+
+
+@pytest.fixture(scope='module')
+def caminho_pacote(tmp_path_factory):
+    return converter_artefatos(RAIZ, str(tmp_path_factory.mktemp('pacote') / 'modelo.obpkg'))
+
+
+def _cabecalho_sem(caminho_pacote, destino, campo):
+    # Reescreve o cabeçalho JSON sem `campo`, mantendo o resto do arquivo
+    with open(caminho_pacote, 'rb') as arquivo:
+        bruto = arquivo.read()
+    tamanho, = struct.unpack_from('<I', bruto, len(MAGICA))
+    inicio = len(MAGICA) + 4
+    cabecalho = json.loads(bruto[inicio:inicio + tamanho])
+    del cabecalho[campo]
+    novo = json.dumps(cabecalho).encode('utf-8').ljust(tamanho)
+    destino.write_bytes(bruto[:inicio] + novo + bruto[inicio + tamanho:])
+    return str(destino)
+
+
+def test_pacote_vazio(tmp_path):
+    caminho = tmp_path / 'vazio.obpkg'
+    caminho.write_bytes(b'')
+    with pytest.raises(ErroPacote):
+        carregar_pacote(str(caminho))
+
+
+@pytest.mark.parametrize('tamanho', [4, len(MAGICA) + 2, 200, 5000])
+def test_pacote_truncado(caminho_pacote, tmp_path, tamanho):
+    caminho = tmp_path / 'truncado.obpkg'
+    with open(caminho_pacote, 'rb') as arquivo:
+        caminho.write_bytes(arquivo.read(tamanho))
+    with pytest.raises(ErroPacote):
+        carregar_pacote(str(caminho))
+
+
+@pytest.mark.parametrize('campo', ['tamanho_dados', 'sha256', 'arvores', 'preprocessamento'])
+def test_cabecalho_incompleto(caminho_pacote, tmp_path, campo):
+    with pytest.raises(ErroPacote):
+        carregar_pacote(_cabecalho_sem(caminho_pacote, tmp_path / 'incompleto.obpkg', campo))
+
+
+def test_variante_vazia_cai_no_completo(caminho_pacote, tmp_path):
+    variante = tmp_path / 'variante.obpkg'
+    variante.write_bytes(b'')
+    with warnings.catch_warnings(record=True) as avisos:
+        warnings.simplefilter('always')
+        versao = carregar_versao(caminho_pacote, variante=str(variante), fallback='completo')
+    assert versao.variante is None
+    assert any('Usando o modelo completo' in str(aviso.message) for aviso in avisos)
+    with pytest.raises(ErroArtefato):
+        carregar_versao(caminho_pacote, variante=str(variante), fallback='erro')
+
+
+def test_variante_recusada_continua_vigiada(caminho_pacote, tmp_path):
+    variante = tmp_path / 'variante.obpkg'
+    variante.write_bytes(b'')
+    registro = RegistroModelos(caminho_pacote)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        registro._registrar(carregar_versao(caminho_pacote, variante=str(variante)), ativar=True)
+        assert not registro.atualizar_se_modificado()
+        variante.write_bytes(b'corrigida')
+        assert registro.atualizar_se_modificado()
+    assert registro.ativa.variante_pedida == str(variante)
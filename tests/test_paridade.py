@@ -0,0 +1,38 @@
+# ============================
+# ⚖️ Paridade dos caminhos otimizados com o sklearn
+# ============================
+
+import numpy as np
+
+from arvores_compiladas import ArvoresCompiladas, verificar_paridade
+from benchmarks.benchmark_preprocessamento import preprocessar_por_coluna
+
+
+def test_arvores_compiladas_iguais_ao_sklearn(preditor_sklearn, base_obesity, sintetico):
+    modelo = preditor_sklearn.modelo
+    compilado = ArvoresCompiladas.de_modelo(modelo)
+    for dados in (base_obesity, sintetico):
+        X = preditor_sklearn.preprocessar(dados)
+        assert verificar_paridade(modelo, compilado, X) <= 1e-12
+
+
+def test_contribuicoes_somam_a_decisao(preditor_sklearn, base_obesity):
+    compilado = ArvoresCompiladas.de_modelo(preditor_sklearn.modelo)
+    X = preditor_sklearn.preprocessar(base_obesity)
+    decisao, contribuicoes, vies = compilado.decisao_e_contribuicoes(X.to_numpy())
+    np.testing.assert_allclose(decisao, preditor_sklearn.modelo.decision_function(X), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(contribuicoes.sum(axis=2) + vies, decisao, rtol=0, atol=1e-9)
+
+
+def test_preprocessamento_fundido_igual_ao_por_coluna(preditor_sklearn, base_obesity, sintetico):
+    # O sklearn converte a entrada para float32: a matriz fundida tem que ser idêntica bit a bit
+    for dados in (base_obesity, sintetico):
+        esperado = preprocessar_por_coluna(preditor_sklearn, dados).to_numpy(dtype='float32')
+        assert np.array_equal(preditor_sklearn.preprocessar_matriz(dados), esperado)
+
+
+def test_preprocessamento_fundido_registro_unico(preditor_sklearn, base_obesity):
+    registros = base_obesity.head(50).to_dict('records')
+    lote = preditor_sklearn.preprocessar_matriz(base_obesity.head(50))
+    for i, registro in enumerate(registros):
+        assert np.array_equal(preditor_sklearn.preprocessar_matriz([registro])[0], lote[i])
@@ -0,0 +1,53 @@
+# ============================
+# 🎯 Predições do Obesity.csv vs. referência gravada, em todos os backends
+# ============================
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.suite import CAMINHO_PREDICOES, TOLERANCIA_PROBABILIDADE
+from pacote_modelo import converter_artefatos
+from preditor import PreditorObesidade
+from tests.conftest import RAIZ
+
+
+@pytest.fixture(scope='module')
+def referencia():
+    referencia = pd.read_csv(CAMINHO_PREDICOES)
+    return referencia.pop('classe').to_numpy(), referencia
+
+
+@pytest.fixture(scope='module')
+def caminho_pacote(tmp_path_factory):
+    return converter_artefatos(RAIZ, str(tmp_path_factory.mktemp('pacote') / 'modelo.obpkg'))
+
+
+def _preditor(backend, preditor_sklearn, caminho_pacote):
+    if backend == 'pacote':
+        return PreditorObesidade.de_pacote(caminho_pacote)
+    origem = preditor_sklearn
+    return PreditorObesidade(
+        origem.modelo, origem.scaler, origem.label_encoders, origem.label_encoder_target,
+        origem.features, backend=backend
+    )
+
+
+@pytest.mark.parametrize('backend', ['sklearn', 'compilado', 'pacote'])
+def test_predicoes_iguais_a_referencia(backend, referencia, preditor_sklearn, caminho_pacote, base_obesity):
+    esperado_rotulos, esperado_proba = referencia
+    rotulos, proba = _preditor(backend, preditor_sklearn, caminho_pacote).prever_com_proba(base_obesity)
+    assert (rotulos == esperado_rotulos).all()
+    desvio = np.abs(proba[esperado_proba.columns].to_numpy() - esperado_proba.to_numpy()).max()
+    assert desvio <= TOLERANCIA_PROBABILIDADE
+
+
+@pytest.mark.parametrize('backend', ['sklearn', 'compilado', 'pacote'])
+def test_registro_unico_igual_ao_lote(backend, preditor_sklearn, caminho_pacote, base_obesity):
+    preditor = _preditor(backend, preditor_sklearn, caminho_pacote)
+    lote = base_obesity.head(20)
+    rotulos, proba = preditor.prever_com_proba(lote)
+    for i, registro in enumerate(lote.to_dict('records')):
+        rotulo, proba_registro = preditor.prever_com_proba(registro)
+        assert rotulo[0] == rotulos[i]
+        np.testing.assert_allclose(proba_registro.to_numpy()[0], proba.to_numpy()[i], rtol=0, atol=1e-12)
@@ -0,0 +1,203 @@
+# ============================
+# 🏋️ Treinamento — reconstrói os cinco artefatos a partir do Obesity.csv
+# Uso: python treinar.py [--dados Obesity.csv --saida modelo_treinado --modelo melhor]
+# ============================
+
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from preditor import (
+    COLUNAS_CATEGORICAS, COLUNAS_ENTRADA, COLUNAS_NUMERICAS, TRADUCOES_ALVO_BRUTO, traduzir_codigos_brutos
+)
+from preprocessamento_fundido import PreprocessadorFundido
+from registro_modelos import ARQUIVOS_ARTEFATOS
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+# 🔍 Candidatos e grades da busca de hiperparâmetros
+CANDIDATOS = {
+    'gradient_boosting': (
+        GradientBoostingClassifier,
+        {'n_estimators': [100, 200], 'learning_rate': [0.05, 0.1], 'max_depth': [3, 4]}
+    ),
+    'hist_gradient_boosting': (
+        HistGradientBoostingClassifier,
+        {'max_iter': [100, 200], 'learning_rate': [0.05, 0.1], 'max_leaf_nodes': [15, 31]}
+    )
+}
+# Só estes viram artefatos: explicações, backend compilado, pacote .obpkg e redutor leem estimators_
+GERAM_ARTEFATOS = ('gradient_boosting',)
+
+
+# ============================
+# 📥 Base de Treino
+# ============================
+def carregar_base(caminho):
+    """Lê um CSV no esquema do Obesity.csv e devolve (entradas do formulário, rótulos do alvo)."""
+    bruto = pd.read_csv(caminho)
+    dados = traduzir_codigos_brutos(bruto)
+    alvo = dados['nivel_obesidade'].map(TRADUCOES_ALVO_BRUTO)
+    if alvo.isna().any():
+        desconhecidos = sorted(set(dados.loc[alvo.isna(), 'nivel_obesidade'].astype(str)))
+        raise ValueError(f'Rótulos de alvo desconhecidos: {desconhecidos}')
+    return dados[COLUNAS_ENTRADA], alvo
+
+
+def ajustar_preprocessamento(entradas, alvo):
+    """Encoders, scaler e encoder do alvo no mesmo formato que o app carrega."""
+    label_encoders = {col: LabelEncoder().fit(entradas[col]) for col in COLUNAS_CATEGORICAS}
+    scaler = StandardScaler().fit(entradas[COLUNAS_NUMERICAS].astype('float64'))
+    label_encoder_target = LabelEncoder().fit(alvo)
+    return label_encoders, scaler, label_encoder_target
+
+
+# ============================
+# 📏 Medições
+# ============================
+def latencia_inferencia(modelo, X, repeticoes=200):
+    """(ms por predição de 1 linha, linhas/s no lote inteiro)."""
+    linha = X.iloc[:1]
+    modelo.predict(linha)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        modelo.predict(linha)
+    ms_linha = (time.perf_counter() - inicio) / repeticoes * 1000
+
+    inicio = time.perf_counter()
+    modelo.predict(X)
+    return ms_linha, len(X) / (time.perf_counter() - inicio)
+
+
+def buscar(nome, X_treino, y_treino, X_teste, y_teste, dobras, semente, n_jobs):
+    classe, grade = CANDIDATOS[nome]
+    busca = GridSearchCV(
+        classe(random_state=semente), grade, scoring='accuracy', n_jobs=n_jobs,
+        cv=StratifiedKFold(n_splits=dobras, shuffle=True, random_state=semente)
+    )
+    inicio = time.perf_counter()
+    busca.fit(X_treino, y_treino)
+    tempo_busca = time.perf_counter() - inicio
+
+    # Tempo de um único ajuste com os melhores parâmetros, sem a busca em volta
+    inicio = time.perf_counter()
+    classe(random_state=semente, **busca.best_params_).fit(X_treino, y_treino)
+    tempo_ajuste = time.perf_counter() - inicio
+
+    ms_linha, linhas_s = latencia_inferencia(busca.best_estimator_, X_teste)
+    relatorio = {
+        'melhores_parametros': busca.best_params_,
+        'acuracia_cv': float(busca.best_score_),
+        'desvio_cv': float(busca.cv_results_['std_test_score'][busca.best_index_]),
+        'acuracia_teste': float(busca.best_estimator_.score(X_teste, y_teste)),
+        'tempo_busca_s': tempo_busca,
+        'tempo_ajuste_s': tempo_ajuste,
+        'latencia_1_linha_ms': ms_linha,
+        'lote_linhas_s': linhas_s
+    }
+    return busca.best_estimator_, relatorio
+
+
+# ============================
+# 🚀 Pipeline
+# ============================
+def treinar(caminho_dados, diretorio_saida, modelo='melhor', dobras=5, semente=42, n_jobs=-1,
+            fracao_teste=0.2):
+    """Treina os candidatos, grava os artefatos do escolhido (entre GERAM_ARTEFATOS) e devolve o relatório."""
+    entradas, alvo = carregar_base(caminho_dados)
+    ent_treino, ent_teste, alvo_treino, alvo_teste = train_test_split(
+        entradas, alvo, test_size=fracao_teste, stratify=alvo, random_state=semente
+    )
+
+    # 🔄 Mesmo pré-processamento do app, ajustado só na partição de treino
+    label_encoders, scaler, label_encoder_target = ajustar_preprocessamento(ent_treino, alvo_treino)
+    preprocessador = PreprocessadorFundido.de_artefatos(label_encoders, scaler, COLUNAS_ENTRADA)
+    X_treino = pd.DataFrame(preprocessador.transformar(ent_treino), columns=COLUNAS_ENTRADA)
+    X_teste = pd.DataFrame(preprocessador.transformar(ent_teste), columns=COLUNAS_ENTRADA)
+    y_treino = label_encoder_target.transform(alvo_treino)
+    y_teste = label_encoder_target.transform(alvo_teste)
+
+    nomes = list(CANDIDATOS) if modelo == 'melhor' else [modelo]
+    estimadores, candidatos = {}, {}
+    for nome in nomes:
+        estimadores[nome], candidatos[nome] = buscar(
+            nome, X_treino, y_treino, X_teste, y_teste, dobras, semente, n_jobs
+        )
+    elegiveis = [nome for nome in candidatos if nome in GERAM_ARTEFATOS]
+    if not elegiveis:
+        raise ValueError(f'Nenhum candidato gera artefatos; use um de {list(GERAM_ARTEFATOS)}')
+    escolhido = max(elegiveis, key=lambda nome: candidatos[nome]['acuracia_cv'])
+
+    os.makedirs(diretorio_saida, exist_ok=True)
+    artefatos = {
+        'modelo': estimadores[escolhido],
+        'scaler': scaler,
+        'label_encoders': label_encoders,
+        'label_encoder_target': label_encoder_target,
+        'features': list(COLUNAS_ENTRADA)
+    }
+    for nome, arquivo in ARQUIVOS_ARTEFATOS.items():
+        joblib.dump(artefatos[nome], os.path.join(diretorio_saida, arquivo))
+
+    with open(caminho_dados, 'rb') as arquivo:
+        hash_dados = hashlib.sha256(arquivo.read()).hexdigest()[:12]
+    relatorio = {
+        'dados': os.path.abspath(caminho_dados),
+        'hash_dados': hash_dados,
+        'linhas_treino': len(ent_treino),
+        'linhas_teste': len(ent_teste),
+        'semente': semente,
+        'dobras_cv': dobras,
+        'n_jobs': n_jobs,
+        'sklearn': sklearn.__version__,
+        'escolhido': escolhido,
+        'candidatos': candidatos
+    }
+    with open(os.path.join(diretorio_saida, 'relatorio_treino.json'), 'w', encoding='utf-8') as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2, default=str)
+    return relatorio
+
+
+def imprimir_relatorio(relatorio):
+    print(f'{"candidato":>24}  {"busca (s)":>9}  {"ajuste (s)":>10}  {"acc CV":>13}  '
+          f'{"acc teste":>9}  {"1 linha (ms)":>12}  {"lote linhas/s":>13}')
+    for nome, r in relatorio['candidatos'].items():
+        marca = ' *' if nome == relatorio['escolhido'] else '  '
+        print(f'{nome:>22}{marca}  {r["tempo_busca_s"]:>9.1f}  {r["tempo_ajuste_s"]:>10.2f}  '
+              f'{r["acuracia_cv"]:>6.4f} ± {r["desvio_cv"]:.3f}  {r["acuracia_teste"]:>9.4f}  '
+              f'{r["latencia_1_linha_ms"]:>12.3f}  {r["lote_linhas_s"]:>13,.0f}')
+    for nome, r in relatorio['candidatos'].items():
+        print(f'{nome}: {r["melhores_parametros"]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Treina o modelo e regrava os cinco artefatos')
+    parser.add_argument('--dados', default=os.path.join(RAIZ, 'Obesity.csv'),
+                        help='CSV no esquema do Obesity.csv')
+    parser.add_argument('--saida', default=os.path.join(RAIZ, 'modelo_treinado'),
+                        help='diretório dos artefatos (use com OBESIDADE_MODELO_DIR)')
+    parser.add_argument('--modelo', choices=['melhor', *GERAM_ARTEFATOS], default='melhor',
+                        help='candidato a treinar; "melhor" compara todos e grava o de maior acurácia '
+                             f'de CV entre {list(GERAM_ARTEFATOS)}')
+    parser.add_argument('--dobras', type=int, default=5)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--n-jobs', type=int, default=-1, help='processos da busca (-1 = todos os núcleos)')
+    args = parser.parse_args()
+
+    relatorio = treinar(args.dados, args.saida, args.modelo, args.dobras, args.semente, args.n_jobs)
+    imprimir_relatorio(relatorio)
+    print(f'Artefatos de {relatorio["escolhido"]} salvos em {os.path.abspath(args.saida)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,368 @@
+# ============================
+# 🛡️ Validação de Entrada e Deriva — checagens vetorizadas por lote, ao lado da pontuação
+# Uso: python validacao_entrada.py lote.csv [--referencia Obesity.csv --saida deriva.json]
+#      python validacao_entrada.py --salvar-perfil perfil_referencia.json
+# ============================
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from preditor import COLUNAS_ENTRADA, LIMITES_NUMERICOS, OPCOES_ENTRADA, traduzir_codigos_brutos
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+CAMINHO_REFERENCIA = os.path.join(RAIZ, 'Obesity.csv')
+
+# 🧯 O que fazer com linhas inválidas:
+#   'erro'       — ValueError com a contagem de problemas por coluna
+#   'substituir' — categoria desconhecida/ausente → moda da referência; numérica ausente →
+#                  mediana; numérica fora da faixa → recortada no limite (a linha é marcada)
+#   'descartar'  — a linha sai sem predição
+POLITICAS = ('erro', 'substituir', 'descartar')
+POLITICA_PADRAO = os.environ.get('OBESIDADE_VALIDACAO', 'substituir')
+
+# Códigos de problema por célula (matriz int8 linhas × COLUNAS_ENTRADA)
+OK, AUSENTE, DESCONHECIDA, FORA_DA_FAIXA = range(4)
+NOMES_PROBLEMAS = ['ok', 'ausente', 'desconhecida', 'fora_da_faixa']
+
+# 📏 Bins das numéricas: percentis da referência para o KS, agrupados em decis para o PSI
+PERCENTIS = np.linspace(0, 1, 101)[1:-1]
+
+# Faixas usuais do PSI: < 0,1 estável; 0,1–0,25 moderada; > 0,25 significativa
+PSI_MODERADO = 0.1
+PSI_SIGNIFICATIVO = 0.25
+_PISO_PROPORCAO = 1e-4  # bins vazios não levam o log a infinito
+
+VERSAO_FORMATO = 1
+
+
+def _bordas(distintos, quantis):
+    # Cada borda fica no meio do caminho entre o quantil e o próximo valor distinto: valores
+    # repetidos da referência (ex.: CH2O = 2) ficam dentro de um bin, e um pouco de ruído em
+    # volta deles não vira deriva
+    bordas = np.unique(quantis)
+    proximos = np.searchsorted(distintos, bordas, side='right')
+    return np.where(proximos < len(distintos), (bordas + distintos[np.minimum(proximos, len(distintos) - 1)]) / 2, bordas)
+
+
+def _codigos(serie, opcoes):
+    # Posição de cada valor em `opcoes`, −1 para desconhecidos e ausentes. Fatorar primeiro e
+    # buscar só os distintos sai ~8x mais barato que `Index.get_indexer` na coluna inteira
+    codigos, distintos = pd.factorize(serie)
+    return np.append(pd.Index(opcoes).get_indexer(distintos), -1)[codigos]
+
+
+def _bins(valores, bordas):
+    # Bordas internas: o 1º e o último bin são abertos, então valores além da faixa da
+    # referência caem nas pontas em vez de sumirem
+    return np.searchsorted(bordas, valores, side='right')
+
+
+# ============================
+# 📐 Perfil da Referência
+# ============================
+class PerfilReferencia:
+    """Histogramas, modas e medianas da base de referência, calculados uma vez.
+
+    Numéricas guardam as bordas dos percentis com as contagens da referência em cada bin
+    e onde começa cada decil (os decis são um subconjunto das bordas, então o PSI sai das
+    mesmas contagens); categóricas, a contagem de cada opção do formulário.
+    """
+
+    def __init__(self, numericas, categoricas, linhas):
+        self.numericas = numericas
+        self.categoricas = categoricas
+        self.linhas = linhas
+
+    @classmethod
+    def de_dados(cls, dados):
+        """Perfil de um DataFrame já no vocabulário do formulário."""
+        numericas = {}
+        for col in LIMITES_NUMERICOS:
+            valores = pd.to_numeric(dados[col], errors='coerce').dropna().to_numpy(dtype='float64')
+            distintos = np.unique(valores)
+            quantis = np.quantile(valores, PERCENTIS)
+            bordas = _bordas(distintos, quantis)
+            decis = _bordas(distintos, quantis[9::10])
+            numericas[col] = {
+                'mediana': float(np.median(valores)),
+                'bordas': bordas,
+                'contagens': np.bincount(_bins(valores, bordas), minlength=len(bordas) + 1),
+                'inicios_decis': np.concatenate([[0], np.searchsorted(bordas, decis) + 1])
+            }
+        categoricas = {}
+        for col, opcoes in OPCOES_ENTRADA.items():
+            codigos = _codigos(dados[col], opcoes)
+            contagens = np.bincount(codigos[codigos >= 0], minlength=len(opcoes))
+            categoricas[col] = {'contagens': contagens, 'moda': opcoes[int(np.argmax(contagens))]}
+        return cls(numericas, categoricas, len(dados))
+
+    @classmethod
+    def de_csv(cls, caminho=CAMINHO_REFERENCIA):
+        """Perfil de um CSV no formato bruto do Obesity.csv."""
+        return cls.de_dados(traduzir_codigos_brutos(pd.read_csv(caminho)))
+
+    @classmethod
+    def carregar(cls, caminho=CAMINHO_REFERENCIA):
+        """Lê um perfil salvo (.json) ou calcula a partir de um CSV bruto."""
+        if not caminho.lower().endswith('.json'):
+            return cls.de_csv(caminho)
+        with open(caminho, encoding='utf-8') as arquivo:
+            conteudo = json.load(arquivo)
+        if conteudo.get('versao_formato') != VERSAO_FORMATO:
+            raise ValueError(f'{caminho}: formato de perfil não suportado')
+        numericas = {
+            col: {chave: valor if chave == 'mediana' else np.asarray(valor) for chave, valor in perfil.items()}
+            for col, perfil in conteudo['numericas'].items()
+        }
+        categoricas = {
+            col: {'contagens': np.asarray(perfil['contagens']), 'moda': perfil['moda']}
+            for col, perfil in conteudo['categoricas'].items()
+        }
+        return cls(numericas, categoricas, conteudo['linhas'])
+
+    def salvar(self, caminho):
+        conteudo = {
+            'versao_formato': VERSAO_FORMATO,
+            'linhas': self.linhas,
+            'numericas': {
+                col: {chave: valor if chave == 'mediana' else valor.tolist() for chave, valor in perfil.items()}
+                for col, perfil in self.numericas.items()
+            },
+            'categoricas': {
+                col: {'contagens': perfil['contagens'].tolist(), 'moda': perfil['moda']}
+                for col, perfil in self.categoricas.items()
+            }
+        }
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(conteudo, arquivo, ensure_ascii=False, indent=2)
+
+
+# ============================
+# ✅ Validação
+# ============================
+class ResultadoValidacao:
+    """Lote pronto para o modelo, máscara das linhas pontuáveis e problemas por célula.
+
+    `codigos` guarda a posição de cada valor categórico original entre as opções (−1 se
+    inválido), para o monitor de deriva não fatorar as colunas de novo.
+    """
+
+    def __init__(self, dados, validas, problemas, codigos):
+        self.dados = dados
+        self.validas = validas
+        self.problemas = problemas
+        self.codigos = codigos
+
+    def contagens(self):
+        """Matriz (coluna × tipo de problema) com o número de células em cada caso."""
+        contagens = np.zeros((len(COLUNAS_ENTRADA), len(NOMES_PROBLEMAS)), dtype='int64')
+        if self.problemas.any():
+            for j in range(len(COLUNAS_ENTRADA)):
+                contagens[j] = np.bincount(self.problemas[:, j], minlength=len(NOMES_PROBLEMAS))
+        else:
+            contagens[:, OK] = len(self.problemas)
+        return contagens
+
+    def descricoes(self):
+        """Texto por linha ('peso:fora_da_faixa; genero:desconhecida'), vazio nas linhas limpas."""
+        descricoes = np.full(len(self.problemas), '', dtype=object)
+        for i in np.flatnonzero(self.problemas.any(axis=1)):
+            descricoes[i] = '; '.join(
+                f'{COLUNAS_ENTRADA[j]}:{NOMES_PROBLEMAS[codigo]}'
+                for j, codigo in enumerate(self.problemas[i]) if codigo
+            )
+        return descricoes
+
+
+class ValidadorEntrada:
+    """Faixas das numéricas e vocabulário das categóricas, checados coluna a coluna."""
+
+    def __init__(self, perfil, politica=POLITICA_PADRAO):
+        if politica not in POLITICAS:
+            raise ValueError(f'Política de validação desconhecida: {politica} (use {", ".join(POLITICAS)})')
+        self.perfil = perfil
+        self.politica = politica
+
+    def validar(self, dados):
+        problemas = np.zeros((len(dados), len(COLUNAS_ENTRADA)), dtype='int8')
+        codigos = {}
+        corrigidas = {}
+        for j, col in enumerate(COLUNAS_ENTRADA):
+            if col in LIMITES_NUMERICOS:
+                valores = pd.to_numeric(dados[col], errors='coerce').to_numpy(dtype='float64')
+                minimo, maximo = LIMITES_NUMERICOS[col]
+                ausente = np.isnan(valores)
+                fora = (valores < minimo) | (valores > maximo)
+                if not (ausente.any() or fora.any()):
+                    continue
+                problemas[ausente, j] = AUSENTE
+                problemas[fora, j] = FORA_DA_FAIXA
+                corrigidas[col] = np.where(ausente, self.perfil.numericas[col]['mediana'],
+                                           np.clip(valores, minimo, maximo))
+            else:
+                codigos[col] = _codigos(dados[col], OPCOES_ENTRADA[col])
+                invalida = codigos[col] < 0
+                if not invalida.any():
+                    continue
+                ausente = dados[col].isna().to_numpy()
+                problemas[invalida, j] = np.where(ausente[invalida], AUSENTE, DESCONHECIDA)
+                corrigidas[col] = dados[col].where(~invalida, self.perfil.categoricas[col]['moda'])
+
+        if not corrigidas:
+            return ResultadoValidacao(dados, np.ones(len(dados), dtype=bool), problemas, codigos)
+        resultado = ResultadoValidacao(dados, ~problemas.any(axis=1), problemas, codigos)
+        if self.politica == 'erro':
+            contagens = resultado.contagens()
+            detalhes = ', '.join(
+                f'{col}: {contagens[j, tipo]} {NOMES_PROBLEMAS[tipo]}'
+                for j, col in enumerate(COLUNAS_ENTRADA) for tipo in (AUSENTE, DESCONHECIDA, FORA_DA_FAIXA)
+                if contagens[j, tipo]
+            )
+            raise ValueError(f'{int((~resultado.validas).sum())} linhas inválidas ({detalhes})')
+        if self.politica == 'substituir':
+            resultado.dados = dados.assign(**corrigidas)
+            resultado.validas[:] = True
+        else:
+            resultado.dados = dados[resultado.validas]
+        return resultado
+
+
+# ============================
+# 📈 Monitor de Deriva
+# ============================
+class MonitorEntrada:
+    """Acumula, lote a lote, problemas de validação e contagens nos bins da referência.
+
+    `contar` não mexe no estado: workers devolvem só as contagens do chunk (alguns KB) e o
+    processo principal as soma com `acumular`. PSI e KS saem das contagens a qualquer momento;
+    o KS é avaliado nas bordas dos percentis da referência (um limite inferior do KS exato).
+    """
+
+    def __init__(self, perfil):
+        self.perfil = perfil
+        self.linhas = 0
+        self.problemas = np.zeros((len(COLUNAS_ENTRADA), len(NOMES_PROBLEMAS)), dtype='int64')
+        self.contagens = {
+            col: np.zeros_like(perfil_col['contagens'])
+            for col, perfil_col in (*perfil.numericas.items(), *perfil.categoricas.items())
+        }
+
+    def contar(self, dados, resultado=None):
+        """Contagens de um lote (valores originais, antes de qualquer substituição)."""
+        parcial = {'linhas': len(dados), 'contagens': {}}
+        if resultado is not None:
+            parcial['problemas'] = resultado.contagens()
+        for col, perfil_col in self.perfil.numericas.items():
+            valores = pd.to_numeric(dados[col], errors='coerce').to_numpy(dtype='float64')
+            valores = valores[~np.isnan(valores)]
+            bordas = perfil_col['bordas']
+            parcial['contagens'][col] = np.bincount(_bins(valores, bordas), minlength=len(bordas) + 1)
+        for col in self.perfil.categoricas:
+            if resultado is not None and col in resultado.codigos:
+                codigos = resultado.codigos[col]
+            else:
+                codigos = _codigos(dados[col], OPCOES_ENTRADA[col])
+            parcial['contagens'][col] = np.bincount(codigos[codigos >= 0], minlength=len(OPCOES_ENTRADA[col]))
+        return parcial
+
+    def acumular(self, parcial):
+        self.linhas += parcial['linhas']
+        if 'problemas' in parcial:
+            self.problemas += parcial['problemas']
+        for chave, contagens in parcial['contagens'].items():
+            self.contagens[chave] += contagens
+
+    def adicionar(self, dados, resultado=None):
+        self.acumular(self.contar(dados, resultado))
+
+    # ============================
+    # 📊 Estatísticas
+    # ============================
+    def psi(self, col):
+        """Population Stability Index do fluxo acumulado contra a referência (None sem dados)."""
+        atual = self.contagens[col]
+        if not atual.sum():
+            return None
+        if col in self.perfil.numericas:
+            perfil_col = self.perfil.numericas[col]
+            referencia = np.add.reduceat(perfil_col['contagens'], perfil_col['inicios_decis'])
+            atual = np.add.reduceat(atual, perfil_col['inicios_decis'])
+        else:
+            referencia = self.perfil.categoricas[col]['contagens']
+        p = np.maximum(referencia / referencia.sum(), _PISO_PROPORCAO)
+        q = np.maximum(atual / atual.sum(), _PISO_PROPORCAO)
+        return float(np.sum((q - p) * np.log(q / p)))
+
+    def ks(self, col):
+        """Maior distância entre as CDFs nas bordas dos percentis (só numéricas)."""
+        atual = self.contagens[col]
+        if col not in self.perfil.numericas or not atual.sum():
+            return None
+        referencia = self.perfil.numericas[col]['contagens']
+        return float(np.abs(np.cumsum(atual) / atual.sum() - np.cumsum(referencia) / referencia.sum()).max())
+
+    def relatorio(self):
+        """Dicionário serializável: PSI/KS e problemas por coluna, mais o total de linhas."""
+        colunas = {}
+        for j, col in enumerate(COLUNAS_ENTRADA):
+            psi = self.psi(col)
+            nivel = None
+            if psi is not None:
+                nivel = 'significativa' if psi > PSI_SIGNIFICATIVO else 'moderada' if psi > PSI_MODERADO else 'estável'
+            colunas[col] = {
+                'psi': psi,
+                'ks': self.ks(col),
+                'deriva': nivel,
+                'problemas': {
+                    NOMES_PROBLEMAS[tipo]: int(self.problemas[j, tipo])
+                    for tipo in (AUSENTE, DESCONHECIDA, FORA_DA_FAIXA) if self.problemas[j, tipo]
+                }
+            }
+        return {'linhas': self.linhas, 'referencia_linhas': self.perfil.linhas, 'colunas': colunas}
+
+
+def resumo_relatorio(relatorio):
+    """Linhas de texto com as colunas que derivaram ou tiveram problemas."""
+    linhas = []
+    for col, info in relatorio['colunas'].items():
+        if info['deriva'] not in (None, 'estável') or info['problemas']:
+            ks = f', KS {info["ks"]:.3f}' if info['ks'] is not None else ''
+            problemas = ', '.join(f'{n} {tipo}' for tipo, n in info['problemas'].items())
+            linhas.append(f'  {col}: PSI {info["psi"] or 0:.3f} ({info["deriva"]}){ks}'
+                          + (f' — {problemas}' if problemas else ''))
+    return linhas or ['  nenhuma deriva ou problema de entrada']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Valida um lote bruto e mede a deriva contra a referência')
+    parser.add_argument('lote', nargs='?', help='CSV no formato do Obesity.csv')
+    parser.add_argument('--referencia', default=CAMINHO_REFERENCIA, help='CSV bruto ou perfil .json')
+    parser.add_argument('--saida', help='grava o relatório de deriva em JSON')
+    parser.add_argument('--salvar-perfil', help='grava o perfil da referência em JSON e sai')
+    args = parser.parse_args()
+
+    perfil = PerfilReferencia.carregar(args.referencia)
+    if args.salvar_perfil:
+        perfil.salvar(args.salvar_perfil)
+        print(f'Perfil de {perfil.linhas:,} linhas gravado em {args.salvar_perfil}')
+        return
+    if not args.lote:
+        parser.error('informe o lote ou --salvar-perfil')
+
+    dados = traduzir_codigos_brutos(pd.read_csv(args.lote))
+    monitor = MonitorEntrada(perfil)
+    monitor.adicionar(dados, ValidadorEntrada(perfil, 'substituir').validar(dados))
+    relatorio = monitor.relatorio()
+    print(f'{relatorio["linhas"]:,} linhas contra {perfil.linhas:,} da referência:')
+    print('\n'.join(resumo_relatorio(relatorio)))
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()